@@ -1,24 +1,57 @@
 """The TryFi integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
 
 from .coordinator import TryFiDataUpdateCoordinator
 
 from .const import (
+    CONF_EVENT_DWELL_TIME,
     CONF_PASSWORD,
     CONF_POLLING_RATE,
+    CONF_ROLLING_WINDOWS,
+    CONF_TELEMETRY_RETENTION,
+    CONF_TELEMETRY_STORE,
     CONF_USERNAME,
+    DEFAULT_BACKFILL_DAYS,
+    DEFAULT_EVENT_DWELL_TIME,
+    DEFAULT_EXPORT_DAYS,
     DEFAULT_POLLING_RATE,
+    DEFAULT_ROLLING_WINDOWS,
+    DEFAULT_TELEMETRY_RETENTION,
+    DEFAULT_TELEMETRY_STORE,
     DOMAIN,
+    EXPORT_DIR,
+    PRIORITY_INTERACTIVE,
+)
+from .executor import TryFiExecutor
+from .export import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    feed_chunks,
+    statistics_chunks,
+    telemetry_chunks,
+    write_export,
 )
 from .pytryfi import PyTryFi
+from .pytryfi.fiTelemetryStore import FiTelemetryStore
+from .rolling import TryFiRollingStats, parse_rolling_windows
+from .statistics import TryFiStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,9 +72,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.data[CONF_PASSWORD]
     polling_interval = int(entry.data.get(CONF_POLLING_RATE, DEFAULT_POLLING_RATE))
     
+    # All blocking TryFi calls for this entry run on its own executor
+    executor = TryFiExecutor(f"{DOMAIN}_{entry.entry_id}")
+
     # Initialize the TryFi API client
     try:
-        tryfi = await hass.async_add_executor_job(PyTryFi, username, password)
+        tryfi = await executor.async_submit(
+            PRIORITY_INTERACTIVE, PyTryFi, username, password
+        )
         _LOGGER.info(
             "TryFi API initialized: %d pets, %d bases, %d wifi networks",
             len(tryfi.pets),
@@ -50,10 +88,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     except Exception as err:
         _LOGGER.error("Failed to initialize TryFi API: %s", err, exc_info=True)
+        await hass.async_add_executor_job(executor.shutdown)
         raise ConfigEntryNotReady from err
     
     # Verify successful login
     if not hasattr(tryfi, "currentUser") or tryfi.currentUser is None:
+        await hass.async_add_executor_job(executor.shutdown)
         raise ConfigEntryNotReady("Failed to authenticate with TryFi API")
     
     # Create the data update coordinator
@@ -61,10 +101,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass,
         tryfi,
         polling_interval,
+        executor,
+        entry.data.get(CONF_EVENT_DWELL_TIME, DEFAULT_EVENT_DWELL_TIME),
+    )
+
+    async def _async_stop_executor(event: Event) -> None:
+        """Stop the executor and write the rolling averages on shutdown."""
+        await coordinator.async_shutdown()
+        if coordinator.rolling_stats is not None:
+            await coordinator.rolling_stats.async_save()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_executor)
+    )
+    entry.async_on_unload(coordinator.async_track_zones())
+    entry.async_on_unload(coordinator.async_track_period_rollover())
+
+    # Import activity totals into long-term statistics from the stored cursors
+    coordinator.statistics = TryFiStatisticsImporter(hass, entry.entry_id)
+    await coordinator.statistics.async_load()
+    entry.async_on_unload(coordinator.statistics.async_save)
+
+    # Rolling averages of daily steps and sleep, rebuilt from the stored days
+    coordinator.rolling_stats = TryFiRollingStats(
+        hass,
+        entry.entry_id,
+        tryfi,
+        parse_rolling_windows(
+            entry.data.get(CONF_ROLLING_WINDOWS, DEFAULT_ROLLING_WINDOWS)
+        ),
     )
+    await coordinator.rolling_stats.async_load()
+    entry.async_on_unload(coordinator.rolling_stats.async_save)
     
+    if entry.data.get(CONF_TELEMETRY_STORE, DEFAULT_TELEMETRY_STORE):
+        store = await executor.async_submit(
+            PRIORITY_INTERACTIVE,
+            FiTelemetryStore,
+            hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.telemetry.db"),
+        )
+        # Closed by the coordinator's shutdown, after the last update
+        entry.async_on_unload(
+            coordinator.async_track_telemetry(
+                store,
+                entry.data.get(CONF_TELEMETRY_RETENTION, DEFAULT_TELEMETRY_RETENTION),
+            )
+        )
+
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
+    # Pets refresh on their own coordinators; a failing pet starts unavailable
+    # instead of failing the whole entry
+    await coordinator.async_refresh_pets()
     
     # Store coordinator for platforms to access
     hass.data.setdefault(DOMAIN, {})
@@ -128,6 +216,9 @@ async def async_remove_config_entry_device(
         for identifier in device_entry.identifiers:
             if identifier[0] == DOMAIN:
                 device_id = identifier[1]
+                # The account device owns the integration's diagnostic sensors
+                if device_id == entry.entry_id:
+                    return False
                 # Remove "base_" prefix if present (old format)
                 if device_id.startswith("base_"):
                     _LOGGER.info("Allowing removal of old format base device with base_ prefix: %s", device_id)
@@ -176,12 +267,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 # Extract pet ID from entity_id (format: light.pet_name_collar_light)
                 for pet in coordinator.data.pets:
                     if entity_id == f"light.{pet.name.lower().replace(' ', '_')}_collar_light":
-                        await hass.async_add_executor_job(
+                        pet_coordinator = coordinator.pet_coordinator(pet.petId)
+                        await pet_coordinator.async_add_command_job(
                             pet.setLedColorCode,
                             coordinator.data.session,
                             color_code
                         )
-                        await coordinator.async_request_refresh()
+                        await pet_coordinator.async_request_refresh()
                         return
         
         raise HomeAssistantError(f"Pet not found for entity {entity_id}")
@@ -196,12 +288,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             if isinstance(coordinator, TryFiDataUpdateCoordinator):
                 for pet in coordinator.data.pets:
                     if entity_id == f"light.{pet.name.lower().replace(' ', '_')}_collar_light":
-                        await hass.async_add_executor_job(
+                        pet_coordinator = coordinator.pet_coordinator(pet.petId)
+                        await pet_coordinator.async_add_command_job(
                             pet.turnOnOffLed,
                             coordinator.data.session,
                             True
                         )
-                        await coordinator.async_request_refresh()
+                        await pet_coordinator.async_request_refresh()
                         return
         
         raise HomeAssistantError(f"Pet not found for entity {entity_id}")
@@ -216,12 +309,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             if isinstance(coordinator, TryFiDataUpdateCoordinator):
                 for pet in coordinator.data.pets:
                     if entity_id == f"light.{pet.name.lower().replace(' ', '_')}_collar_light":
-                        await hass.async_add_executor_job(
+                        pet_coordinator = coordinator.pet_coordinator(pet.petId)
+                        await pet_coordinator.async_add_command_job(
                             pet.turnOnOffLed,
                             coordinator.data.session,
                             False
                         )
-                        await coordinator.async_request_refresh()
+                        await pet_coordinator.async_request_refresh()
                         return
         
         raise HomeAssistantError(f"Pet not found for entity {entity_id}")
@@ -239,12 +333,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             if isinstance(coordinator, TryFiDataUpdateCoordinator):
                 for pet in coordinator.data.pets:
                     if entity_id == f"select.{pet.name.lower().replace(' ', '_')}_lost_mode":
-                        await hass.async_add_executor_job(
+                        pet_coordinator = coordinator.pet_coordinator(pet.petId)
+                        await pet_coordinator.async_add_command_job(
                             pet.setLostDogMode,
                             coordinator.data.session,
                             is_lost
                         )
-                        await coordinator.async_request_refresh()
+                        await pet_coordinator.async_request_refresh()
                         return
         
         raise HomeAssistantError(f"Pet not found for entity {entity_id}")
@@ -264,7 +359,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             if isinstance(coordinator, TryFiDataUpdateCoordinator):
                 network = coordinator.data.getWifiNetwork(ssid)
                 if network:
-                    await hass.async_add_executor_job(
+                    await coordinator.async_add_command_job(
                         coordinator.data.setWifiNetworkLocation,
                         ssid,
                         float(latitude),
@@ -275,9 +370,104 @@ async def async_setup_services(hass: HomeAssistant) -> None:
 
         raise HomeAssistantError(f"WiFi network not found: {ssid}")
 
+    async def handle_backfill_history(call: ServiceCall) -> None:
+        """Handle backfill history service."""
+        days = int(call.data.get("days", DEFAULT_BACKFILL_DAYS))
+
+        for entry_id, coordinator in hass.data[DOMAIN].items():
+            if isinstance(coordinator, TryFiDataUpdateCoordinator):
+                if coordinator.statistics is None:
+                    continue
+                # Months of history take a while, so import in the background
+                for pet in coordinator.data.pets:
+                    coordinator.config_entry.async_create_background_task(
+                        hass,
+                        coordinator.statistics.async_backfill(coordinator, pet, days),
+                        f"{DOMAIN}_backfill_{pet.petId}",
+                    )
+
+    async def handle_export_history(call: ServiceCall) -> ServiceResponse:
+        """Handle export history service."""
+        pet_ref = call.data.get("pet")
+        source = call.data.get("source", "telemetry")
+        file_format = call.data.get("format", "csv")
+        days = int(call.data.get("days", DEFAULT_EXPORT_DAYS))
+
+        if source not in EXPORT_COLUMNS:
+            raise HomeAssistantError(f"Unknown export source: {source}")
+        if file_format not in EXPORT_FORMATS:
+            raise HomeAssistantError(f"Unknown export format: {file_format}")
+
+        for entry_id, coordinator in hass.data[DOMAIN].items():
+            if isinstance(coordinator, TryFiDataUpdateCoordinator):
+                pet = next(
+                    (
+                        pet
+                        for pet in coordinator.data.pets
+                        if pet_ref in (pet.petId, pet.name)
+                    ),
+                    None,
+                )
+                if pet is not None:
+                    break
+        else:
+            raise HomeAssistantError(f"Pet not found: {pet_ref}")
+
+        end = dt_util.utcnow()
+        start = end - timedelta(days=days)
+        path = call.data.get("path")
+        if not path:
+            # The integration's own export directory needs no allowlisting
+            path = hass.config.path(
+                EXPORT_DIR,
+                f"{pet.petId}_{source}_{end.strftime('%Y%m%d%H%M%S')}.{file_format}",
+            )
+        elif not await hass.async_add_executor_job(hass.config.is_allowed_path, path):
+            raise HomeAssistantError(f"Not allowed to write to {path}")
+
+        def _progress(rows: int) -> None:
+            # Called from the export's thread; fire is thread-safe
+            hass.bus.fire(
+                f"{DOMAIN}_export_progress",
+                {"pet_id": pet.petId, "source": source, "path": path, "rows": rows},
+            )
+
+        export_args = (EXPORT_COLUMNS[source], path, file_format, _progress)
+        if source == "statistics":
+            # Statistics are read on the recorder's own executor
+            from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+
+            rows = await get_instance(hass).async_add_executor_job(
+                write_export,
+                statistics_chunks(hass, pet.petId, start, end),
+                *export_args,
+            )
+        elif source == "telemetry":
+            rows = await hass.async_add_executor_job(
+                write_export,
+                telemetry_chunks(coordinator.tryfi, pet.petId, start, end),
+                *export_args,
+            )
+        else:
+            # Feed pages come from the API, so queue behind the polls
+            rows = await coordinator.async_add_poll_job(
+                write_export,
+                feed_chunks(coordinator.tryfi, source, pet.petId, start),
+                *export_args,
+            )
+        _LOGGER.info("Exported %d %s rows of %s to %s", rows, source, pet.name, path)
+        return {"path": path, "rows": rows}
+
     # Register services
     hass.services.async_register(DOMAIN, "set_led_color", handle_set_led_color)
     hass.services.async_register(DOMAIN, "turn_on_led", handle_turn_on_led)
     hass.services.async_register(DOMAIN, "turn_off_led", handle_turn_off_led)
     hass.services.async_register(DOMAIN, "set_lost_mode", handle_set_lost_mode)
-    hass.services.async_register(DOMAIN, "set_wifi_location", handle_set_wifi_location)
\ No newline at end of file
+    hass.services.async_register(DOMAIN, "set_wifi_location", handle_set_wifi_location)
+    hass.services.async_register(DOMAIN, "backfill_history", handle_backfill_history)
+    hass.services.async_register(
+        DOMAIN,
+        "export_history",
+        handle_export_history,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -15,6 +15,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER, MODEL
+from .coordinator import wifi_network_context
 from .pytryfi import PyTryFi
 from .pytryfi.fiWifiNetwork import FiWifiNetwork
 
@@ -36,7 +37,7 @@ async def async_setup_entry(
     
     # Add battery charging sensors for pets
     entities.extend([
-        TryFiBatteryChargingBinarySensor(coordinator, pet)
+        TryFiBatteryChargingBinarySensor(coordinator.pet_coordinator(pet.petId), pet)
         for pet in tryfi.pets
     ])
     
@@ -48,7 +49,7 @@ async def async_setup_entry(
     
     # Add firmware update sensors for pets with devices
     entities.extend([
-        TryFiFirmwareUpdateBinarySensor(coordinator, pet)
+        TryFiFirmwareUpdateBinarySensor(coordinator.pet_coordinator(pet.petId), pet)
         for pet in tryfi.pets
         if hasattr(pet, "device") and pet.device
     ])
@@ -82,7 +83,7 @@ class TryFiBatteryChargingBinarySensor(CoordinatorEntity, BinarySensorEntity):
     
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-battery-charging"
         self._attr_name = f"{pet.name} Collar Battery Charging"
@@ -138,7 +139,7 @@ class TryFiBaseHealthBinarySensor(CoordinatorEntity, BinarySensorEntity):
     
     def __init__(self, coordinator: Any, base: Any) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=base.baseId)
         self._base_id = base.baseId
         self._attr_unique_id = f"{base.baseId}-health"
         self._attr_name = f"{base.name} Connection Health"
@@ -198,7 +199,7 @@ class TryFiFirmwareUpdateBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-firmware-update"
         self._attr_name = f"{pet.name} Firmware Update Available"
@@ -268,7 +269,7 @@ class TryFiWifiNetworkHiddenBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator: Any, network: FiWifiNetwork) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=wifi_network_context(network.ssid))
         self._ssid = network.ssid
         self._attr_unique_id = f"wifi-{network.ssid}-hidden"
         self._attr_name = "Hidden"
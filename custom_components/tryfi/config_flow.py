@@ -13,8 +13,18 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
+    CONF_EVENT_DWELL_TIME,
     CONF_POLLING_RATE,
+    CONF_ROLLING_WINDOWS,
+    CONF_TELEMETRY_RETENTION,
+    CONF_TELEMETRY_STORE,
+    CONF_WALK_PATH_TOLERANCE,
+    DEFAULT_EVENT_DWELL_TIME,
     DEFAULT_POLLING_RATE,
+    DEFAULT_ROLLING_WINDOWS,
+    DEFAULT_TELEMETRY_RETENTION,
+    DEFAULT_TELEMETRY_STORE,
+    DEFAULT_WALK_PATH_TOLERANCE,
     DOMAIN,
 )
 from .pytryfi import PyTryFi
@@ -148,6 +158,36 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_POLLING_RATE,
                     default=self.config_entry.data.get(CONF_POLLING_RATE, DEFAULT_POLLING_RATE),
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_EVENT_DWELL_TIME,
+                    default=self.config_entry.data.get(
+                        CONF_EVENT_DWELL_TIME, DEFAULT_EVENT_DWELL_TIME
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_WALK_PATH_TOLERANCE,
+                    default=self.config_entry.data.get(
+                        CONF_WALK_PATH_TOLERANCE, DEFAULT_WALK_PATH_TOLERANCE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_TELEMETRY_STORE,
+                    default=self.config_entry.data.get(
+                        CONF_TELEMETRY_STORE, DEFAULT_TELEMETRY_STORE
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_TELEMETRY_RETENTION,
+                    default=self.config_entry.data.get(
+                        CONF_TELEMETRY_RETENTION, DEFAULT_TELEMETRY_RETENTION
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3650)),
+                vol.Optional(
+                    CONF_ROLLING_WINDOWS,
+                    default=self.config_entry.data.get(
+                        CONF_ROLLING_WINDOWS, DEFAULT_ROLLING_WINDOWS
+                    ),
+                ): vol.All(str, vol.Match(r"^\s*[1-9]\d{0,2}\s*(,\s*[1-9]\d{0,2}\s*)*$")),
             }
         )
 
@@ -10,6 +10,20 @@ CONF_USERNAME: Final = "username"
 CONF_PASSWORD: Final = "password"
 CONF_POLLING_RATE: Final = "polling"
 DEFAULT_POLLING_RATE: Final = 60
+CONF_EVENT_DWELL_TIME: Final = "event_dwell_time"
+# Seconds a new location or connection state must hold before its event fires
+DEFAULT_EVENT_DWELL_TIME: Final = 60
+CONF_WALK_PATH_TOLERANCE: Final = "walk_path_tolerance"
+# Metres a walk position may be from the simplified walk path
+DEFAULT_WALK_PATH_TOLERANCE: Final = 5
+CONF_TELEMETRY_STORE: Final = "telemetry_store"
+DEFAULT_TELEMETRY_STORE: Final = False
+CONF_TELEMETRY_RETENTION: Final = "telemetry_retention"
+# Days of telemetry kept in the telemetry store
+DEFAULT_TELEMETRY_RETENTION: Final = 30
+CONF_ROLLING_WINDOWS: Final = "rolling_windows"
+# Comma separated days the rolling step and sleep averages cover
+DEFAULT_ROLLING_WINDOWS: Final = "7, 30"
 
 # Sensor constants
 SENSOR_STATS_BY_TIME: Final = ["DAILY", "WEEKLY", "MONTHLY"]
@@ -18,3 +32,48 @@ SENSOR_STATS_BY_TYPE: Final = ["STEPS", "DISTANCE", "SLEEP", "NAP", "GOAL"]
 # Device info
 MANUFACTURER: Final = "TryFi"
 MODEL: Final = "Smart Dog Collar"
+
+# Executor
+DEFAULT_EXECUTOR_WORKERS: Final = 2
+PRIORITY_INTERACTIVE: Final = 0
+PRIORITY_BACKGROUND: Final = 10
+
+# Update backpressure
+OVERRUN_STRETCH_THRESHOLD: Final = 3
+MAX_INTERVAL_STRETCH: Final = 8
+
+# Share of the polling interval a single update may spend before deferring
+# the remaining work to the next cycle
+UPDATE_BUDGET_FRACTION: Final = 0.8
+
+# Battery percentage below which the low battery event fires
+LOW_BATTERY_THRESHOLD: Final = 20
+
+# Battery-aware polling: a resting pet is polled this many times less often
+# while its collar has at least the given charge and time to empty left
+RESTING_INTERVAL_STRETCH: Final = 4
+RESTING_MIN_BATTERY: Final = 50
+RESTING_MIN_TIME_TO_EMPTY: Final = 2 * 86400
+
+# Seconds before and after local midnight at which the pets' step and sleep
+# totals are refreshed, to catch the day's final ones and the new periods'
+STATS_ROLLOVER_OFFSET: Final = 30
+
+# Long-term statistics
+STATISTICS_STORAGE_VERSION: Final = 1
+# Seconds to batch statistics cursor changes before writing them to disk
+STATISTICS_SAVE_DELAY: Final = 60
+# Days of history the backfill_history service imports unless told otherwise
+DEFAULT_BACKFILL_DAYS: Final = 90
+ROLLING_STORAGE_VERSION: Final = 1
+
+# Telemetry store maintenance: how often it runs, and how old samples must be
+# before they are thinned out to one per bucket
+TELEMETRY_MAINTENANCE_INTERVAL: Final = 3600
+TELEMETRY_DOWNSAMPLE_AFTER: Final = 86400
+TELEMETRY_DOWNSAMPLE_BUCKET: Final = 300
+
+# Days of history the export_history service writes unless told otherwise,
+# and the directory under the config directory exports go to by default
+DEFAULT_EXPORT_DAYS: Final = 30
+EXPORT_DIR: Final = "tryfi_exports"
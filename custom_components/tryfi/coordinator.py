@@ -1,16 +1,63 @@
-from datetime import timedelta
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
 import logging
-from homeassistant.core import HomeAssistant
+from time import monotonic, time
+from typing import Any, TypeVar
+
+from homeassistant.components.zone.const import ATTR_RADIUS, DOMAIN as ZONE_DOMAIN
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_track_state_change_filtered,
+    async_track_time_change,
+    async_track_time_interval,
+)
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .const import DOMAIN
+from .const import (
+    DEFAULT_EVENT_DWELL_TIME,
+    DOMAIN,
+    MAX_INTERVAL_STRETCH,
+    OVERRUN_STRETCH_THRESHOLD,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RESTING_INTERVAL_STRETCH,
+    RESTING_MIN_BATTERY,
+    RESTING_MIN_TIME_TO_EMPTY,
+    STATS_ROLLOVER_OFFSET,
+    TELEMETRY_DOWNSAMPLE_AFTER,
+    TELEMETRY_DOWNSAMPLE_BUCKET,
+    TELEMETRY_MAINTENANCE_INTERVAL,
+    UPDATE_BUDGET_FRACTION,
+)
+from .events import pet_event_engine
+from .executor import TryFiExecutor
 from .pytryfi import PyTryFi
+from .pytryfi.common.geo import GeoPlace
+from .pytryfi.const import PET_ACTIVITY_ONGOINGREST
+from .pytryfi.exceptions import RequestCancelledError
+from .pytryfi.fiPet import FiPet
+from .pytryfi.fiTelemetryStore import FiTelemetryStore
+from .rolling import TryFiRollingStats
+from .statistics import TryFiStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+def wifi_network_context(ssid: str) -> str:
+    """Return the listener context for entities of a wifi network."""
+    return f"wifi-{ssid}"
+
+
 class TryFiDataUpdateCoordinator(DataUpdateCoordinator[PyTryFi]):
     """Class to manage fetching TryFi data from the API."""
     
@@ -19,106 +66,532 @@ class TryFiDataUpdateCoordinator(DataUpdateCoordinator[PyTryFi]):
         hass: HomeAssistant,
         tryfi: PyTryFi,
         polling_interval: int,
+        executor: TryFiExecutor | None = None,
+        event_dwell_time: float = DEFAULT_EVENT_DWELL_TIME,
     ) -> None:
         """Initialize the coordinator."""
         self.tryfi = tryfi
-        self._previous_states = {}
+        self.pet_events = pet_event_engine(event_dwell_time, self._pet_places_inside)
+        # Set up by the config entry to import activity into long-term statistics
+        self.statistics: TryFiStatisticsImporter | None = None
+        # Set up by the config entry to keep rolling averages of daily totals
+        self.rolling_stats: TryFiRollingStats | None = None
+        self._polling_interval = polling_interval
+        self._base_interval = timedelta(seconds=polling_interval)
+        self._update_lock = asyncio.Lock()
+        self._last_update_ok = True
+        self._last_update_finished: float | None = None
+        self._consecutive_overruns = 0
+        self.last_update_duration: float | None = None
+        self.overrun_count = 0
+        self.skipped_update_count = 0
+        # Pets are refreshed by their own coordinators, see pet_coordinator()
+        self.pet_coordinators: dict[str, TryFiPetCoordinator] = {}
+        # Duration of each pet coordinator's last update, see async_record_pet_update()
+        self.pet_update_durations: dict[str, float] = {}
+        # Closed on shutdown, once no update can record to it anymore
+        self._telemetry_store: FiTelemetryStore | None = None
+        self._data_changed = False
+        self._command_since_refresh = False
+        # Contexts to notify on the next listener update, None for everyone
+        self._changed_contexts: set[str] | None = None
+        self._last_refresh_success: bool | None = None
+        # Values shown by the account diagnostic sensors at the last refresh
+        self._last_diagnostics: tuple[Any, ...] | None = None
         
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=polling_interval),
+            # PyTryFi updates in place, so listeners are only notified when the
+            # library reports changes (see _async_refresh_finished)
+            always_update=False,
         )
-    
+
+        if executor is None:
+            entry_id = self.config_entry.entry_id if self.config_entry else "default"
+            executor = TryFiExecutor(f"{DOMAIN}_{entry_id}")
+        self.executor = executor
+
+    async def async_add_command_job(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a user-triggered API call ahead of any queued polls."""
+        # Commands update the pet in place, so the next refresh must notify
+        self._command_since_refresh = True
+        return await self.executor.async_submit(PRIORITY_INTERACTIVE, target, *args)
+
+    async def async_add_poll_job(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a background API call on the integration's executor."""
+        return await self.executor.async_submit(PRIORITY_BACKGROUND, target, *args)
+
+    def pet_coordinator(self, pet_id: str) -> TryFiPetCoordinator:
+        """Return the coordinator refreshing a single pet, creating it if needed."""
+        coordinator = self.pet_coordinators.get(pet_id)
+        if coordinator is None:
+            coordinator = TryFiPetCoordinator(
+                self.hass, self, pet_id, self._polling_interval
+            )
+            self.pet_coordinators[pet_id] = coordinator
+        return coordinator
+
+    async def async_refresh_pets(self) -> None:
+        """Refresh every pet coordinator in parallel.
+
+        Each pet fails on its own, so one unreachable collar does not hold up
+        the others.
+        """
+        for pet in self.tryfi.pets:
+            self.pet_coordinator(pet.petId)
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in self.pet_coordinators.values())
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes, stop the executor and close the store."""
+        await super().async_shutdown()
+        for coordinator in self.pet_coordinators.values():
+            await coordinator.async_shutdown()
+        await self.hass.async_add_executor_job(self.executor.shutdown)
+        if self._telemetry_store is not None:
+            # Every update has finished, so the last samples are written
+            store, self._telemetry_store = self._telemetry_store, None
+            self.tryfi.setTelemetryStore(None)
+            await self.hass.async_add_executor_job(store.close)
+
     async def _async_update_data(self) -> PyTryFi:
-        """Fetch data from TryFi API."""
+        """Fetch data from TryFi API, merging or skipping overlapping refreshes."""
+        if self._update_lock.locked():
+            # A refresh is already running, so share its result instead of
+            # queueing a second full update right behind it.
+            _LOGGER.debug("TryFi update already in progress, merging refresh request")
+            async with self._update_lock:
+                pass
+            if not self._last_update_ok:
+                raise UpdateFailed("Error communicating with TryFi API")
+            return self.tryfi
+
+        if self._should_skip_update():
+            self.skipped_update_count += 1
+            _LOGGER.debug(
+                "Skipping TryFi update, previous cycle took %.1fs", self.last_update_duration
+            )
+            return self.tryfi
+
+        async with self._update_lock:
+            start = monotonic()
+            self._last_update_ok = False
+            try:
+                await self._async_fetch()
+                self._last_update_ok = True
+            finally:
+                self._last_update_finished = monotonic()
+                self._record_update_duration(self._last_update_finished - start)
+
+        return self.tryfi
+
+    def _should_skip_update(self) -> bool:
+        """Return True when the API should get a breather after an overrun."""
+        if self._consecutive_overruns == 0 or self._last_update_finished is None:
+            return False
+        return monotonic() - self._last_update_finished < self.last_update_duration
+
+    def _record_update_duration(self, duration: float) -> None:
+        """Track update duration and stretch the interval under sustained overrun."""
+        self.last_update_duration = duration
+        base_seconds = self._base_interval.total_seconds()
+
+        if duration > base_seconds:
+            self.overrun_count += 1
+            self._consecutive_overruns += 1
+            _LOGGER.debug(
+                "TryFi update took %.1fs, longer than the %ds polling interval",
+                duration,
+                base_seconds,
+            )
+            if self._consecutive_overruns >= OVERRUN_STRETCH_THRESHOLD:
+                stretched = min(duration * 1.5, base_seconds * MAX_INTERVAL_STRETCH)
+                if stretched > self.update_interval.total_seconds():
+                    _LOGGER.warning(
+                        "TryFi updates keep taking longer than the polling interval, "
+                        "polling every %ds instead of %ds",
+                        stretched,
+                        base_seconds,
+                    )
+                    self.update_interval = timedelta(seconds=stretched)
+            return
+
+        self._consecutive_overruns = 0
+        if self.update_interval > self._base_interval:
+            # Step back towards the configured interval once updates keep up again
+            self.update_interval = max(self._base_interval, self.update_interval / 2)
+
+    @callback
+    def async_record_pet_update(self, pet_id: str, duration: float) -> None:
+        """Fold a pet coordinator's update into the account diagnostics.
+
+        Pet polls make up most of the API traffic, so their overruns count
+        towards the account's overrun count.
+        """
+        self.pet_update_durations[pet_id] = duration
+        if duration > self._base_interval.total_seconds():
+            self.overrun_count += 1
+            _LOGGER.debug(
+                "TryFi update of pet %s took %.1fs, longer than the %ds polling interval",
+                pet_id,
+                duration,
+                self._base_interval.total_seconds(),
+            )
+
+    def _update_budget(self) -> float:
+        """Return the seconds a single update may spend talking to the API."""
+        return self._base_interval.total_seconds() * UPDATE_BUDGET_FRACTION
+
+    async def _async_fetch(self) -> None:
+        """Refresh bases and wifi networks; pets have their own coordinators."""
         try:
-            await self.hass.async_add_executor_job(self.tryfi.update)
+            places = self._pets_places()
+            await self.async_add_poll_job(self.tryfi.update, self._update_budget(), False)
             _LOGGER.info(
-                "TryFi data updated: %d pets, %d bases, %d wifi networks",
+                "TryFi data updated: %d pets, %d bases, %d wifi networks (executor queue depth: %d)",
                 len(self.tryfi.pets),
                 len(self.tryfi.bases),
                 len(self.tryfi.wifiNetworks),
+                self.executor.queue_depth,
             )
             
-            # Check for state changes and fire events
-            await self._check_state_changes()
-            
+            self._data_changed = self.tryfi.hasChanges
+            if not self._data_changed:
+                _LOGGER.debug("TryFi data unchanged, skipping entity updates")
+            if self.tryfi.changedBaseIds or self.tryfi.changedWifiSsids:
+                self._async_notify_relocated_pets(places)
+
         except Exception as err:
             raise UpdateFailed(f"Error communicating with TryFi API: {err}") from err
-        
-        return self.tryfi
-    
-    async def _check_state_changes(self) -> None:
-        """Check for state changes and fire events."""
-        for pet in self.tryfi.pets:
-            pet_id = pet.petId
-            prev_state = self._previous_states.get(pet_id, {})
-            
-            # Check location changes
-            current_location = getattr(pet, "currPlaceName", None)
-            prev_location = prev_state.get("location")
-            if current_location != prev_location and prev_location is not None:
-                self.hass.bus.async_fire(
-                    f"{DOMAIN}_pet_location_changed",
-                    {
-                        "pet_id": pet_id,
-                        "pet_name": pet.name,
-                        "old_location": prev_location,
-                        "new_location": current_location,
-                    }
-                )
-            
-            # Check battery level
-            if hasattr(pet, "device") and pet.device:
-                current_battery = getattr(pet.device, "batteryPercent", None)
-                prev_battery = prev_state.get("battery")
-                
-                # Fire event if battery drops below 20%
-                if (current_battery is not None and prev_battery is not None and 
-                    current_battery < 20 and prev_battery >= 20):
-                    self.hass.bus.async_fire(
-                        f"{DOMAIN}_low_battery",
-                        {
-                            "pet_id": pet_id,
-                            "pet_name": pet.name,
-                            "battery_level": current_battery,
-                        }
-                    )
-                
-                # Check lost mode changes
-                current_lost = getattr(pet, "isLost", False)
-                prev_lost = prev_state.get("is_lost", False)
-                if current_lost != prev_lost:
-                    self.hass.bus.async_fire(
-                        f"{DOMAIN}_lost_mode_changed",
-                        {
-                            "pet_id": pet_id,
-                            "pet_name": pet.name,
-                            "is_lost": current_lost,
-                        }
-                    )
-                
-                # Check connection state
-                current_connected = getattr(pet.device, "connectionStateType", None)
-                prev_connected = prev_state.get("connection_state")
-                if current_connected != prev_connected and prev_connected is not None:
-                    self.hass.bus.async_fire(
-                        f"{DOMAIN}_connection_state_changed",
-                        {
-                            "pet_id": pet_id,
-                            "pet_name": pet.name,
-                            "old_state": prev_connected,
-                            "new_state": current_connected,
-                            "is_connected": current_connected == "ConnectedToCellular" or current_connected == "ConnectedToBase",
-                        }
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Only notify listeners when the refresh changed something."""
+        success_changed = self.last_update_success != self._last_refresh_success
+        self._last_refresh_success = self.last_update_success
+        if success_changed or self._command_since_refresh:
+            # Availability or command results may affect any entity
+            self._changed_contexts = None
+        else:
+            self._changed_contexts = self._contexts_changed_by_update()
+        # Account diagnostics change on most cycles even when no data did
+        diagnostics = self._diagnostics_snapshot()
+        diagnostics_changed = diagnostics != self._last_diagnostics
+        self._last_diagnostics = diagnostics
+        self.always_update = (
+            self._data_changed or self._command_since_refresh or diagnostics_changed
+        )
+        self._data_changed = False
+        self._command_since_refresh = False
+
+    def _diagnostics_snapshot(self) -> tuple[Any, ...]:
+        """Return the values shown by the account diagnostic sensors."""
+        duration = self.last_update_duration
+        return (
+            round(duration, 2) if duration is not None else None,
+            self.overrun_count,
+            self.skipped_update_count,
+            self.executor.queue_depth,
+            self.update_interval,
+            tuple(sorted(self.pet_events.suppressed_counts.items())),
+            tuple(
+                (pet_id, round(pet_duration, 2))
+                for pet_id, pet_duration in sorted(self.pet_update_durations.items())
+            ),
+        )
+
+    def _contexts_changed_by_update(self) -> set[str]:
+        """Return the listener contexts of everything the last update changed."""
+        return {
+            *self.tryfi.changedPetIds,
+            *self.tryfi.changedBaseIds,
+            *(wifi_network_context(ssid) for ssid in self.tryfi.changedWifiSsids),
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, limited to changed pets, bases and networks.
+
+        Listeners registered without a context (platform bookkeeping and
+        account-wide entities) are always notified.
+        """
+        contexts = self._changed_contexts
+        self._changed_contexts = None
+        if contexts is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in contexts:
+                update_callback()
+
+    def _pets_places(self) -> dict[str, Any]:
+        """Return the places each pet with a coordinator is located at."""
+        return {pet_id: self.tryfi.petPlaces(pet_id) for pet_id in self.pet_coordinators}
+
+    @callback
+    def _async_notify_relocated_pets(self, before: dict[str, Any]) -> None:
+        """Notify the pets whose nearest or containing places changed.
+
+        Called after the known places changed (zones, bases or wifi
+        networks), as the pets' own coordinators only notify when the pet
+        itself changes.
+        """
+        for pet_id, coordinator in self.pet_coordinators.items():
+            if self.tryfi.petPlaces(pet_id) != before.get(pet_id):
+                coordinator.async_update_listeners()
+
+    def _pet_places_inside(self, pet: Any) -> frozenset[GeoPlace] | None:
+        """Return the known places a pet is inside, None if it is not located."""
+        places = self.tryfi.petPlaces(pet.petId)
+        return frozenset(places.inside) if places is not None else None
+
+    @callback
+    def async_track_zones(self) -> CALLBACK_TYPE:
+        """Locate pets against Home Assistant zones, following zone changes."""
+
+        @callback
+        def _async_update_zones(*_: Any) -> None:
+            places = self._pets_places()
+            self.tryfi.setExtraPlaces(
+                [
+                    GeoPlace(
+                        state.entity_id,
+                        state.name,
+                        ZONE_DOMAIN,
+                        state.attributes[ATTR_LATITUDE],
+                        state.attributes[ATTR_LONGITUDE],
+                        state.attributes.get(ATTR_RADIUS, 0),
                     )
-                
-                # Update previous state
-                self._previous_states[pet_id] = {
-                    "location": current_location,
-                    "battery": current_battery,
-                    "is_lost": current_lost,
-                    "connection_state": current_connected,
-                }
+                    for state in self.hass.states.async_all(ZONE_DOMAIN)
+                    if ATTR_LATITUDE in state.attributes
+                    and ATTR_LONGITUDE in state.attributes
+                ]
+            )
+            self._async_notify_relocated_pets(places)
+
+        _async_update_zones()
+        tracker = async_track_state_change_filtered(
+            self.hass, TrackStates(False, set(), {ZONE_DOMAIN}), _async_update_zones
+        )
+        return tracker.async_remove
+
+    @callback
+    def async_track_period_rollover(self) -> CALLBACK_TYPE:
+        """Refresh the pets' step and sleep totals around local midnight.
+
+        Daily, weekly and monthly totals only roll over at midnight, so
+        between boundaries the library refreshes them at a low rate or when a
+        pet's activity changes. Just before midnight the day's final totals
+        are fetched, and just after it those of the new periods.
+        """
+
+        @callback
+        def _async_refresh_stats(now: datetime) -> None:
+            _LOGGER.debug("Refreshing pet totals around midnight")
+            self.tryfi.requestStatsRefresh()
+            for coordinator in self.pet_coordinators.values():
+                self.hass.async_create_task(coordinator.async_request_refresh())
+
+        before = 60 - STATS_ROLLOVER_OFFSET
+        remove_before = async_track_time_change(
+            self.hass, _async_refresh_stats, hour=23, minute=59, second=before
+        )
+        remove_after = async_track_time_change(
+            self.hass, _async_refresh_stats, hour=0, minute=0, second=STATS_ROLLOVER_OFFSET
+        )
+
+        @callback
+        def _async_remove() -> None:
+            remove_before()
+            remove_after()
+
+        return _async_remove
+
+    @callback
+    def async_track_telemetry(
+        self, store: FiTelemetryStore, retention_days: int
+    ) -> CALLBACK_TYPE:
+        """Record pet telemetry to a store and keep it trimmed.
+
+        Samples are written once per account update. Every maintenance
+        interval, samples past the retention are deleted and those older
+        than a day are thinned out to one per bucket. The store is closed
+        when the coordinator shuts down.
+        """
+        self.tryfi.setTelemetryStore(store)
+        self._telemetry_store = store
+
+        async def _async_maintain(*_: Any) -> None:
+            now = time()
+            purged = await self.async_add_poll_job(
+                store.purge, now - retention_days * 86400
+            )
+            thinned = await self.async_add_poll_job(
+                store.downsample,
+                now - TELEMETRY_DOWNSAMPLE_AFTER,
+                TELEMETRY_DOWNSAMPLE_BUCKET,
+            )
+            _LOGGER.debug(
+                "Telemetry maintenance purged %d and thinned out %d samples",
+                purged,
+                thinned,
+            )
+
+        remove_interval = async_track_time_interval(
+            self.hass,
+            _async_maintain,
+            timedelta(seconds=TELEMETRY_MAINTENANCE_INTERVAL),
+            name=f"{DOMAIN} telemetry maintenance",
+        )
+
+        return remove_interval
+
+    @callback
+    def check_pet_state_changes(self, pet: Any) -> None:
+        """Check a pet for state changes and fire events."""
+        self.pet_events.evaluate(pet.petId, pet.name, pet)
+        self.pet_events.async_fire(self.hass)
+
+
+class TryFiPetCoordinator(DataUpdateCoordinator[PyTryFi]):
+    """Class to manage fetching the data of a single pet.
+
+    Shares the account's PyTryFi session and executor, but polls on its own
+    interval so a failing collar only takes down its own entities and backs
+    off without delaying the rest of the household.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        account: TryFiDataUpdateCoordinator,
+        pet_id: str,
+        polling_interval: int,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.account = account
+        self.tryfi = account.tryfi
+        self.executor = account.executor
+        self.pet_id = pet_id
+        self._base_interval = timedelta(seconds=polling_interval)
+        self._update_lock = asyncio.Lock()
+        self._last_update_ok = True
+        self._data_changed = False
+        self._command_since_refresh = False
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_pet_{pet_id}",
+            update_interval=self._base_interval,
+            always_update=False,
+        )
+        # The pet is updated in place on the shared client, so entities can
+        # be set up (as unavailable) even when the first poll fails
+        self.data = self.tryfi
+
+    async def async_add_command_job(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a user-triggered API call ahead of any queued polls."""
+        self._command_since_refresh = True
+        return await self.account.async_add_command_job(target, *args)
+
+    async def async_add_poll_job(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a background API call on the account's executor."""
+        return await self.account.async_add_poll_job(target, *args)
+
+    def _update_budget(self) -> float:
+        """Return the seconds a single pet update may spend talking to the API."""
+        return self._base_interval.total_seconds() * UPDATE_BUDGET_FRACTION
+
+    def _poll_interval(self, pet: FiPet | None) -> timedelta:
+        """Return the interval to poll the pet at, given its activity and battery.
+
+        A resting pet whose collar has ample battery is polled less often. A
+        walking or lost pet, or a collar low on battery or expected to run out
+        soon, keeps the configured interval so its last positions are caught.
+        """
+        device = pet.device if pet is not None else None
+        if (
+            device is None
+            or pet.activityType != PET_ACTIVITY_ONGOINGREST
+            or pet.isLost
+            or device.batteryPercent is None
+            or device.batteryPercent < RESTING_MIN_BATTERY
+        ):
+            return self._base_interval
+        time_to_empty = device.batteryTimeToEmpty
+        if time_to_empty is not None and time_to_empty < RESTING_MIN_TIME_TO_EMPTY:
+            return self._base_interval
+        return self._base_interval * RESTING_INTERVAL_STRETCH
+
+    async def _async_update_data(self) -> PyTryFi:
+        """Fetch this pet from the TryFi API, merging overlapping refreshes."""
+        if self._update_lock.locked():
+            # Share the running refresh, e.g. a midnight request landing on a poll
+            _LOGGER.debug("Update of pet %s already in progress, merging refresh request", self.pet_id)
+            async with self._update_lock:
+                pass
+            if not self._last_update_ok:
+                raise UpdateFailed(f"Error updating pet {self.pet_id}")
+            return self.tryfi
+
+        async with self._update_lock:
+            start = monotonic()
+            self._last_update_ok = False
+            try:
+                await self._async_fetch()
+                self._last_update_ok = True
+            finally:
+                self.account.async_record_pet_update(self.pet_id, monotonic() - start)
+        return self.tryfi
+
+    async def _async_fetch(self) -> None:
+        """Fetch this pet and fire state change events."""
+        try:
+            self._data_changed = await self.async_add_poll_job(
+                self.tryfi.updatePet, self.pet_id, self._update_budget()
+            )
+        except RequestCancelledError:
+            # A command cancelled the poll; whatever was fetched before it
+            # is already applied, and the rest follows on the next poll
+            _LOGGER.debug("Update of pet %s cancelled by a command", self.pet_id)
+            self._data_changed = True
+            return
+        except Exception as err:
+            # Back off this pet only; the library tracks its retry delay
+            retry_in = self.tryfi.petRetryIn(self.pet_id)
+            if retry_in is not None:
+                self.update_interval = timedelta(seconds=max(retry_in, 1))
+            raise UpdateFailed(f"Error updating pet {self.pet_id}: {err}") from err
+
+        pet = self.tryfi.getPet(self.pet_id)
+        interval = self._poll_interval(pet)
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                "Polling pet %s every %ds", self.pet_id, interval.total_seconds()
+            )
+        self.update_interval = interval
+        if pet is not None and self.account.statistics is not None:
+            # Every poll, so hours are closed even when the totals are unchanged
+            self.account.statistics.async_record(pet)
+        if pet is not None and self.account.rolling_stats is not None:
+            # A completed day changes the rolling averages of an unchanged pet
+            self._data_changed |= self.account.rolling_stats.async_record(self.pet_id)
+        if pet is not None and (
+            self._data_changed
+            or self._command_since_refresh
+            or self.account.pet_events.has_pending(self.pet_id)
+            or not self.account.pet_events.tracks(self.pet_id)
+        ):
+            self.account.check_pet_state_changes(pet)
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Only notify listeners when the pet changed or a command ran."""
+        self.always_update = self._data_changed or self._command_since_refresh
+        self._data_changed = False
+        self._command_since_refresh = False
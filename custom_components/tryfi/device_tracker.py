@@ -7,13 +7,21 @@ from typing import Any
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER, MODEL
+from .const import (
+    CONF_WALK_PATH_TOLERANCE,
+    DEFAULT_WALK_PATH_TOLERANCE,
+    DOMAIN,
+    MANUFACTURER,
+    MODEL,
+)
 from .pytryfi import PyTryFi, FiPet, FiBase, FiWifiNetwork
+from .pytryfi.common.geo import PathSimplifier, encodePolyline
 from . import TryFiDataUpdateCoordinator
+from .coordinator import wifi_network_context
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,10 +36,15 @@ async def async_setup_entry(
     tryfi: PyTryFi = coordinator.data
 
     entities = []
+    walk_path_tolerance = config_entry.data.get(
+        CONF_WALK_PATH_TOLERANCE, DEFAULT_WALK_PATH_TOLERANCE
+    )
     
     # Add pet trackers
     entities.extend([
-        TryFiPetTracker(coordinator, pet)
+        TryFiPetTracker(
+            coordinator.pet_coordinator(pet.petId), pet, walk_path_tolerance
+        )
         for pet in tryfi.pets
     ])
     
@@ -66,13 +79,73 @@ class TryFiPetTracker(CoordinatorEntity, TrackerEntity):
     """Representation of a TryFi pet tracker."""
     
     _attr_has_entity_name = False
+    # The walk path changes on every walking update and is rebuilt from the
+    # collar anyway, and the refresh time changes on every poll, so keep
+    # both out of the recorder
+    _unrecorded_attributes = frozenset({"walk_path", "location_last_updated"})
     
-    def __init__(self, coordinator: TryFiDataUpdateCoordinator, pet: FiPet) -> None:
+    def __init__(
+        self,
+        coordinator: TryFiDataUpdateCoordinator,
+        pet: FiPet,
+        walk_path_tolerance: float = DEFAULT_WALK_PATH_TOLERANCE,
+    ) -> None:
         """Initialize the pet tracker."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-tracker"
         self._attr_name = f"{pet.name} Tracker"
+        self._walk_path = PathSimplifier(walk_path_tolerance)
+        self._walk_start = None
+        self._walk_revision = 0
+        self._walk_path_encoded: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Pick up a walk that is already in progress."""
+        await super().async_added_to_hass()
+        self._update_walk_path()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Add new walk positions to the simplified path before writing state."""
+        self._update_walk_path()
+        super()._handle_coordinator_update()
+
+    def _update_walk_path(self) -> None:
+        """Simplify the positions added to the pet's walk since the last update."""
+        pet = self.pet
+        track = pet.walkTrack if pet else None
+        if track is None:
+            if self._walk_start is not None:
+                self._walk_path.clear()
+                self._walk_start = None
+                self._walk_revision = 0
+                self._walk_path_encoded = None
+            return
+        if track.walkStart != self._walk_start:
+            self._walk_path.clear()
+            self._walk_start = track.walkStart
+            self._walk_revision = 0
+        if track.revision == self._walk_revision and self._walk_path_encoded is not None:
+            return
+        self._walk_path.extend(
+            (point.latitude, point.longitude)
+            for point in track.pointsSince(self._walk_revision)
+        )
+        self._walk_revision = track.revision
+        self._walk_path_encoded = encodePolyline(self._walk_path.path)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the location was refreshed and the ongoing walk's path."""
+        pet = self.pet
+        attrs: dict[str, Any] = {}
+        if pet:
+            attrs["location_last_updated"] = pet.fieldLastUpdated("location")
+        if self._walk_path_encoded is not None:
+            attrs["walk_path"] = self._walk_path_encoded
+            attrs["walk_path_points"] = len(self._walk_path.path)
+        return attrs or None
     
     @property
     def pet(self) -> FiPet:
@@ -154,7 +227,7 @@ class TryFiBaseTracker(CoordinatorEntity, TrackerEntity):
     
     def __init__(self, coordinator: Any, base: FiBase) -> None:
         """Initialize the base tracker."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=base.baseId)
         self._base_id = base.baseId
         self._attr_unique_id = f"{base.baseId}-tracker"
         self._attr_name = f"{base.name} Tracker"
@@ -207,7 +280,7 @@ class TryFiWifiNetworkTracker(CoordinatorEntity, TrackerEntity):
 
     def __init__(self, coordinator: Any, network: FiWifiNetwork) -> None:
         """Initialize the WiFi network tracker."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=wifi_network_context(network.ssid))
         self._ssid = network.ssid
         self._attr_unique_id = f"wifi-{network.ssid}-tracker"
         self._attr_icon = "mdi:wifi-marker"
@@ -0,0 +1,358 @@
+"""Declarative state change events for TryFi pets."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field as dataclass_field
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DEFAULT_EVENT_DWELL_TIME, DOMAIN, LOW_BATTERY_THRESHOLD
+from .pytryfi.common.geo import GeoPlace
+
+# (subject id, subject name, old value, new value) -> event data
+PayloadFactory = Callable[[str, str, Any, Any], dict[str, Any]]
+# The (old, new) values an event reports, or None if nothing fires
+Change = tuple[Any, Any] | None
+
+
+@dataclass(frozen=True, slots=True)
+class WatchedField:
+    """A value read from every evaluated subject.
+
+    Until a subject has been seen, its previous value is ``initial``.
+    """
+
+    name: str
+    getter: Callable[[Any], Any]
+    initial: Any = None
+
+
+@dataclass(eq=False, slots=True)
+class ChangeRule:
+    """Fire whenever a field changes from a known value.
+
+    With a dwell time, a new value must hold that long before the event
+    fires, reporting the change from the last value that did fire. A value
+    that flips back within the dwell time fires nothing and is counted as
+    suppressed, so a collar flapping between two states stays quiet.
+    """
+
+    field: str
+    event_type: str
+    payload: PayloadFactory
+    dwell: float = 0
+    suppressed: int = 0
+    _reported: dict[str, Any] = dataclass_field(default_factory=dict, repr=False)
+    _candidates: dict[str, tuple[Any, float]] = dataclass_field(
+        default_factory=dict, repr=False
+    )
+
+    def is_pending(self, key: str) -> bool:
+        """Return True if a change of the subject is waiting out its dwell time."""
+        return key in self._candidates
+
+    def changed(self, key: str, old: Any, new: Any, now: float) -> Change:
+        """Handle a changed value and return the change to report, if any."""
+        reported = self._reported.setdefault(key, old)
+        change: Change = None
+        if (candidate := self._candidates.pop(key, None)) is not None:
+            if now - candidate[1] >= self.dwell:
+                # Held long enough, it just was not evaluated in time
+                change = self._report(key, candidate[0])
+                reported = candidate[0]
+            else:
+                self.suppressed += 1
+        if new == reported:
+            return change
+        if reported is None:
+            self._reported[key] = new
+        elif self.dwell <= 0:
+            change = self._report(key, new)
+        else:
+            self._candidates[key] = (new, now)
+        return change
+
+    def unchanged(self, key: str, value: Any, now: float) -> Change:
+        """Report a pending change once it has held for the dwell time."""
+        candidate = self._candidates.get(key)
+        if candidate is None or now - candidate[1] < self.dwell:
+            return None
+        del self._candidates[key]
+        return self._report(key, candidate[0])
+
+    def events(self, key: str, name: str, old: Any, new: Any) -> list[dict[str, Any]]:
+        """Return the data of the events fired by a reported change."""
+        return [self.payload(key, name, old, new)]
+
+    def _report(self, key: str, new: Any) -> tuple[Any, Any]:
+        old = self._reported[key]
+        self._reported[key] = new
+        return old, new
+
+
+@dataclass(eq=False, slots=True)
+class ThresholdRule:
+    """Fire once when a field drops below a threshold.
+
+    The rule re-arms only after the value climbs back to ``rearm_at``, so a
+    reading hovering around the threshold fires a single event.
+    """
+
+    field: str
+    event_type: str
+    payload: PayloadFactory
+    threshold: float
+    rearm_at: float | None = None
+    _armed: dict[str, bool] = dataclass_field(default_factory=dict, repr=False)
+
+    suppressed: int = 0
+
+    def is_pending(self, key: str) -> bool:
+        """Threshold crossings fire immediately."""
+        return False
+
+    def changed(self, key: str, old: Any, new: Any, now: float) -> Change:
+        """Handle a changed value and return the change to report, if any."""
+        if new is None:
+            return None
+        rearm_at = self.threshold if self.rearm_at is None else self.rearm_at
+        armed = self._armed.get(key)
+        if armed is None:
+            if old is None:
+                self._armed[key] = new >= self.threshold
+                return None
+            armed = old >= self.threshold
+        if armed and new < self.threshold:
+            self._armed[key] = False
+            return old, new
+        self._armed[key] = armed or new >= rearm_at
+        return None
+
+    def unchanged(self, key: str, value: Any, now: float) -> Change:
+        """Threshold crossings never wait."""
+        return None
+
+    def events(self, key: str, name: str, old: Any, new: Any) -> list[dict[str, Any]]:
+        """Return the data of the events fired by a reported change."""
+        return [self.payload(key, name, old, new)]
+
+
+@dataclass(eq=False, slots=True)
+class MembershipRule:
+    """Fire one event per member added to (or removed from) a set field.
+
+    The payload factory is called with the member in place of the old and
+    new values.
+    """
+
+    field: str
+    event_type: str
+    payload: Callable[[str, str, Any], dict[str, Any]]
+    added: bool = True
+    suppressed: int = 0
+
+    def is_pending(self, key: str) -> bool:
+        """Membership changes fire immediately."""
+        return False
+
+    def changed(self, key: str, old: Any, new: Any, now: float) -> Change:
+        """Report the change if members were added (or removed)."""
+        if old is None or new is None:
+            return None
+        members = new - old if self.added else old - new
+        return (old, new) if members else None
+
+    def unchanged(self, key: str, value: Any, now: float) -> Change:
+        """Membership changes never wait."""
+        return None
+
+    def events(self, key: str, name: str, old: Any, new: Any) -> list[dict[str, Any]]:
+        """Return the data of one event per added (or removed) member."""
+        members = new - old if self.added else old - new
+        return [self.payload(key, name, member) for member in members]
+
+
+EventRule = ChangeRule | ThresholdRule | MembershipRule
+
+
+class StateChangeEngine:
+    """Evaluate event rules against the fields that changed since last time.
+
+    Rules are indexed by the field they watch, so a subject whose values are
+    unchanged costs one tuple comparison however many rules are registered,
+    unless one of its changes is still waiting out a dwell time. Events are
+    queued until async_fire() sends them as one batch.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[WatchedField],
+        rules: Iterable[EventRule],
+    ) -> None:
+        """Initialize the engine."""
+        self._fields = tuple(fields)
+        self._initial = tuple(watched.initial for watched in self._fields)
+        self._rules: dict[str, list[EventRule]] = {}
+        for rule in rules:
+            self._rules.setdefault(rule.field, []).append(rule)
+        self._rule_list = [rule for rules in self._rules.values() for rule in rules]
+        self._previous: dict[str, tuple[Any, ...]] = {}
+        self._waiting: dict[str, set[EventRule]] = {}
+        self._pending: list[tuple[str, dict[str, Any]]] = []
+
+    def tracks(self, key: str) -> bool:
+        """Return True if the subject has been evaluated before."""
+        return key in self._previous
+
+    def has_pending(self, key: str) -> bool:
+        """Return True if a change of the subject is waiting out a dwell time."""
+        return key in self._waiting
+
+    @property
+    def suppressed_counts(self) -> dict[str, int]:
+        """Return the number of suppressed changes per event type."""
+        counts: dict[str, int] = {}
+        for rule in self._rule_list:
+            counts[rule.event_type] = counts.get(rule.event_type, 0) + rule.suppressed
+        return counts
+
+    def evaluate(
+        self, key: str, name: str, subject: Any, now: float | None = None
+    ) -> None:
+        """Compare a subject with its previous values and queue fired events."""
+        values = tuple(watched.getter(subject) for watched in self._fields)
+        previous = self._previous.get(key, self._initial)
+        self._previous[key] = values
+        waiting = self._waiting.pop(key, set())
+        if values == previous and not waiting:
+            return
+        if now is None:
+            now = monotonic()
+        for watched, old, new in zip(self._fields, previous, values):
+            for rule in self._rules.get(watched.name, ()):
+                if old != new:
+                    change = rule.changed(key, old, new, now)
+                elif rule in waiting:
+                    change = rule.unchanged(key, new, now)
+                else:
+                    continue
+                if change is not None:
+                    self._pending.extend(
+                        (rule.event_type, data)
+                        for data in rule.events(key, name, *change)
+                    )
+                if rule.is_pending(key):
+                    self._waiting.setdefault(key, set()).add(rule)
+
+    @callback
+    def async_fire(self, hass: HomeAssistant) -> int:
+        """Fire the queued events and return how many were fired."""
+        events, self._pending = self._pending, []
+        for event_type, data in events:
+            hass.bus.async_fire(f"{DOMAIN}_{event_type}", data)
+        return len(events)
+
+
+def _device_value(attribute: str) -> Callable[[Any], Any]:
+    """Return a getter for a collar attribute, None for pets without a collar."""
+
+    def _get(pet: Any) -> Any:
+        device = pet.device
+        return getattr(device, attribute, None) if device else None
+
+    return _get
+
+
+PET_FIELDS: tuple[WatchedField, ...] = (
+    WatchedField("location", lambda pet: pet.currPlaceName),
+    WatchedField("battery", _device_value("batteryPercent")),
+    WatchedField("is_lost", lambda pet: bool(pet.isLost), initial=False),
+    WatchedField("connection_state", _device_value("connectionStateType")),
+)
+
+
+def pet_event_rules(
+    dwell_time: float = DEFAULT_EVENT_DWELL_TIME,
+) -> list[EventRule]:
+    """Return fresh instances of the pet event rules.
+
+    Location and connection changes must hold for dwell_time seconds, as
+    collars at the edge of a place or a base flip back and forth.
+    """
+    return [
+        ChangeRule(
+            "location",
+            "pet_location_changed",
+            lambda pet_id, name, old, new: {
+                "pet_id": pet_id,
+                "pet_name": name,
+                "old_location": old,
+                "new_location": new,
+            },
+            dwell=dwell_time,
+        ),
+        ThresholdRule(
+            "battery",
+            "low_battery",
+            lambda pet_id, name, old, new: {
+                "pet_id": pet_id,
+                "pet_name": name,
+                "battery_level": new,
+            },
+            threshold=LOW_BATTERY_THRESHOLD,
+        ),
+        ChangeRule(
+            "is_lost",
+            "lost_mode_changed",
+            lambda pet_id, name, old, new: {
+                "pet_id": pet_id,
+                "pet_name": name,
+                "is_lost": new,
+            },
+        ),
+        ChangeRule(
+            "connection_state",
+            "connection_state_changed",
+            lambda pet_id, name, old, new: {
+                "pet_id": pet_id,
+                "pet_name": name,
+                "old_state": old,
+                "new_state": new,
+                "is_connected": new in ("ConnectedToCellular", "ConnectedToBase"),
+            },
+            dwell=dwell_time,
+        ),
+    ]
+
+
+def _place_payload(pet_id: str, name: str, place: GeoPlace) -> dict[str, Any]:
+    """Return the event data for a pet entering or leaving a place."""
+    return {
+        "pet_id": pet_id,
+        "pet_name": name,
+        "place_id": place.placeId,
+        "place_name": place.name,
+        "place_type": place.kind,
+    }
+
+
+def pet_event_engine(
+    dwell_time: float = DEFAULT_EVENT_DWELL_TIME,
+    places: Callable[[Any], frozenset[GeoPlace] | None] | None = None,
+) -> StateChangeEngine:
+    """Return an engine firing the pet state change events.
+
+    When given, places returns the known places (bases, wifi networks and
+    zones) a pet is inside, and entering or leaving each fires an event.
+    """
+    fields = list(PET_FIELDS)
+    rules = pet_event_rules(dwell_time)
+    if places is not None:
+        fields.append(WatchedField("places", places))
+        rules.append(MembershipRule("places", "place_entered", _place_payload))
+        rules.append(
+            MembershipRule("places", "place_left", _place_payload, added=False)
+        )
+    return StateChangeEngine(fields, rules)
@@ -0,0 +1,114 @@
+"""Dedicated executor for blocking TryFi API calls."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future
+import itertools
+import queue
+import sys
+import threading
+from typing import Any, TypeVar
+
+from .const import DEFAULT_EXECUTOR_WORKERS
+
+_T = TypeVar("_T")
+
+# Sorts after every real job so workers drain the queue before exiting
+_SHUTDOWN_PRIORITY = sys.maxsize
+
+
+class TryFiExecutor:
+    """Small priority thread pool owned by a single config entry.
+
+    TryFi calls are slow and blocking, so running them on Home Assistant's
+    shared executor lets a sluggish API hold threads that other integrations
+    need. Jobs are started lowest priority value first and FIFO within a
+    priority, so a user command queued behind a poll runs on the next free
+    worker.
+    """
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_EXECUTOR_WORKERS) -> None:
+        """Initialize the executor."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._name = name
+        self._max_workers = max_workers
+        self._queue: queue.PriorityQueue[
+            tuple[int, int, Future | None, Callable[..., Any] | None, tuple]
+        ] = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    @property
+    def name(self) -> str:
+        """Return the name used for worker threads."""
+        return self._name
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def submit(
+        self, priority: int, target: Callable[..., _T], *args: Any
+    ) -> Future[_T]:
+        """Queue a blocking call and return a future for its result."""
+        future: Future[_T] = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"Executor {self._name} has been shut down")
+            self._queue.put((priority, next(self._sequence), future, target, args))
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"{self._name}_{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    async def async_submit(
+        self, priority: int, target: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a blocking call on the executor and await its result."""
+        return await asyncio.wrap_future(self.submit(priority, target, *args))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued jobs and stop the worker threads."""
+        with self._lock:
+            if self._shutdown:
+                threads = []
+            else:
+                self._shutdown = True
+                threads = list(self._threads)
+            while True:
+                try:
+                    _, _, future, _, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if future is not None:
+                    future.cancel()
+            for _ in threads:
+                self._queue.put((_SHUTDOWN_PRIORITY, next(self._sequence), None, None, ()))
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _worker(self) -> None:
+        """Run queued jobs until a shutdown marker is received."""
+        while True:
+            _, _, future, target, args = self._queue.get()
+            if future is None or target is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = target(*args)
+            except BaseException as err:  # noqa: BLE001 - relayed to the caller
+                future.set_exception(err)
+            else:
+                future.set_result(result)
@@ -0,0 +1,220 @@
+"""Streaming export of TryFi pet history to CSV or Parquet files."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+import csv
+from datetime import datetime, timedelta
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .pytryfi import PyTryFi
+from .statistics import PET_STATISTICS, statistic_id
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parquet export is optional, like the vectorised geofencing
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_SOURCES = ("telemetry", "activity", "rest", "statistics")
+
+# Recorder statistics are read one window at a time
+STATISTICS_EXPORT_WINDOW = timedelta(days=30)
+
+# (column name, kind) per source; kind is "time", "float", "int" or "str"
+Column = tuple[str, str]
+Row = tuple[Any, ...]
+
+EXPORT_COLUMNS: dict[str, tuple[Column, ...]] = {
+    "telemetry": (
+        ("timestamp", "time"),
+        ("latitude", "float"),
+        ("longitude", "float"),
+        ("battery_percent", "int"),
+        ("connection_state", "str"),
+        ("activity_type", "str"),
+    ),
+    "activity": (
+        ("start", "time"),
+        ("end", "time"),
+        ("steps", "int"),
+        ("distance", "float"),
+        ("step_goal", "int"),
+    ),
+    "rest": (
+        ("start", "time"),
+        ("end", "time"),
+        ("sleep", "int"),
+        ("nap", "int"),
+    ),
+    "statistics": (
+        ("statistic_id", "str"),
+        ("start", "time"),
+        ("state", "float"),
+        ("sum", "float"),
+    ),
+}
+
+
+def telemetry_chunks(
+    tryfi: PyTryFi, pet_id: str, start: datetime, end: datetime
+) -> Iterator[list[Row]]:
+    """Yield a pet's stored telemetry, oldest first."""
+    store = tryfi.telemetryStore
+    if store is None:
+        raise HomeAssistantError("The telemetry store is not enabled")
+    for chunk in store.iterQuery(pet_id, start.timestamp(), end.timestamp()):
+        yield [
+            (
+                dt_util.utc_from_timestamp(sample.timestamp),
+                sample.latitude,
+                sample.longitude,
+                sample.batteryPercent,
+                sample.connectionState,
+                sample.activityType,
+            )
+            for sample in chunk
+        ]
+
+
+def feed_chunks(
+    tryfi: PyTryFi, source: str, pet_id: str, start: datetime
+) -> Iterator[list[Row]]:
+    """Yield a pet's daily summaries from a history feed, newest first."""
+    history = tryfi.activityHistory if source == "activity" else tryfi.restHistory
+    for page in history(pet_id).pages():
+        rows = [
+            tuple(summary) for summary in page.records if summary.start >= start
+        ]
+        if rows:
+            yield rows
+        if len(rows) < len(page.records):
+            # The feed is newest first, so the rest is older still
+            return
+
+
+def statistics_chunks(
+    hass: HomeAssistant, pet_id: str, start: datetime, end: datetime
+) -> Iterator[list[Row]]:
+    """Yield a pet's hourly long-term statistics, oldest first."""
+    # Imported here as the recorder is only an after dependency
+    from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+        statistics_during_period,
+    )
+
+    statistic_ids = {statistic_id(pet_id, statistic) for statistic in PET_STATISTICS}
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + STATISTICS_EXPORT_WINDOW, end)
+        result = statistics_during_period(
+            hass, window_start, window_end, statistic_ids, "hour", None, {"state", "sum"}
+        )
+        rows = [
+            (
+                stat_id,
+                dt_util.utc_from_timestamp(row["start"]),
+                row.get("state"),
+                row.get("sum"),
+            )
+            for stat_id in sorted(result)
+            for row in result[stat_id]
+        ]
+        if rows:
+            yield rows
+        window_start = window_end
+
+
+class _CsvWriter:
+    """Write rows to a CSV file with a header."""
+
+    def __init__(self, path: str, columns: tuple[Column, ...]) -> None:
+        self._file = open(path, "w", newline="", encoding="utf-8")  # noqa: SIM115
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(name for name, _ in columns)
+        self._times = [i for i, (_, kind) in enumerate(columns) if kind == "time"]
+
+    def write(self, rows: list[Row]) -> None:
+        if self._times:
+            rows = [
+                tuple(
+                    value.isoformat() if i in self._times and value is not None else value
+                    for i, value in enumerate(row)
+                )
+                for row in rows
+            ]
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Write rows to a Parquet file, one row group per chunk."""
+
+    def __init__(self, path: str, columns: tuple[Column, ...]) -> None:
+        types = {
+            "time": pyarrow.timestamp("us", tz="UTC"),
+            "float": pyarrow.float64(),
+            "int": pyarrow.int64(),
+            "str": pyarrow.string(),
+        }
+        self._schema = pyarrow.schema(
+            [(name, types[kind]) for name, kind in columns]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list[Row]) -> None:
+        columns = [list(column) for column in zip(*rows)]
+        self._writer.write_table(
+            pyarrow.Table.from_arrays(columns, schema=self._schema)
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def write_export(
+    chunks: Iterable[list[Row]],
+    columns: tuple[Column, ...],
+    path: str,
+    file_format: str,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Write chunks of rows to a file and return the number of rows written.
+
+    Blocking: run it in an executor. Only one chunk is held at a time. The
+    file is written under a temporary name and only moved into place once
+    complete, so a failed export leaves no partial file behind.
+    """
+    if file_format == "parquet" and pyarrow is None:
+        raise HomeAssistantError("Exporting to Parquet requires pyarrow")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    partial = f"{path}.part"
+    writer = (_ParquetWriter if file_format == "parquet" else _CsvWriter)(
+        partial, columns
+    )
+    rows = 0
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    except BaseException:
+        writer.close()
+        os.remove(partial)
+        raise
+    writer.close()
+    os.replace(partial, path)
+    _LOGGER.debug("Exported %d rows to %s", rows, path)
+    return rows
@@ -86,7 +86,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = [
-        TryFiPetLight(coordinator, pet)
+        TryFiPetLight(coordinator.pet_coordinator(pet.petId), pet)
         for pet in coordinator.data.pets
         if hasattr(pet, "device") and pet.device
     ]
@@ -103,7 +103,7 @@ class TryFiPetLight(CoordinatorEntity, LightEntity):
     
     def __init__(self, coordinator: TryFiDataUpdateCoordinator, pet: FiPet) -> None:
         """Initialize the light entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-light"
         self._attr_name = f"{pet.name} Collar Light"
@@ -184,7 +184,7 @@ class TryFiPetLight(CoordinatorEntity, LightEntity):
             return
         
         # Turn on the LED
-        await self.hass.async_add_executor_job(
+        await self.coordinator.async_add_command_job(
             self.pet.turnOnOffLed,
             self.coordinator.data.session,
             True
@@ -195,7 +195,7 @@ class TryFiPetLight(CoordinatorEntity, LightEntity):
             requested_color = kwargs[ATTR_RGB_COLOR]
             closest_color_code = find_closest_color_code(requested_color, self._color_map)
             
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_add_command_job(
                 self.pet.setLedColorCode,
                 self.coordinator.data.session,
                 closest_color_code
@@ -210,7 +210,7 @@ class TryFiPetLight(CoordinatorEntity, LightEntity):
             _LOGGER.error("Cannot turn off light - pet not found")
             return
         
-        await self.hass.async_add_executor_job(
+        await self.coordinator.async_add_command_job(
             self.pet.turnOnOffLed,
             self.coordinator.data.session,
             False
@@ -25,7 +25,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = [
-        TryFiPetWeightNumber(coordinator, pet)
+        TryFiPetWeightNumber(coordinator.pet_coordinator(pet.petId), pet)
         for pet in coordinator.data.pets
     ]
     
@@ -44,7 +44,7 @@ class TryFiPetWeightNumber(CoordinatorEntity, NumberEntity):
     
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-weight-setting"
         self._attr_name = f"{pet.name} Weight Setting"
@@ -65,7 +65,7 @@ class TryFiPetWeightNumber(CoordinatorEntity, NumberEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.pet is not None
+        return super().available and self.pet is not None
     
     @property
     def device_info(self) -> dict[str, Any]:
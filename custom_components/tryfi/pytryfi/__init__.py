@@ -1,6 +1,10 @@
 """Library dedicated for interacting with tryfi.com"""
 
+import datetime
+import functools
 import logging
+import threading
+import time
 import requests
 
 from .fiUser import FiUser
@@ -8,7 +12,15 @@ from .fiPet import FiPet
 from .fiBase import FiBase
 from .fiDevice import FiDevice
 from .fiWifiNetwork import FiWifiNetwork
-from .common.query import API_HOST_URL_BASE, API_LOGIN, getHouseHolds, getBaseList, getWifiNetworks, updateWifiNetwork
+from .fiHistory import FiFeedPaginator, parseActivitySummary, parseRestSummary
+from .fiRollingStats import FiDailyTotals, FiRollingStats
+from .fiTelemetryStore import FiTelemetryStore
+from .common.query import API_HOST_URL_BASE, API_LOGIN, API_REQUEST_TIMEOUT, getActivitySummaryFeed, getHouseHolds, getBaseList, getRestSummaryFeed, getWifiNetworks, updateWifiNetwork
+from .common.decoding import loads
+from .common.geo import GeoIndex, GeoPlace, PlaceMatch
+from .common.scheduler import BackgroundBatch, schedulerFor
+from .const import HISTORY_PAGE_SIZE, PET_RETRY_BASE_DELAY, PET_RETRY_MAX_DELAY, PLACE_RADIUS_BASE, PLACE_RADIUS_WIFI, ROLLING_WINDOWS, UPDATE_ITEM_BASES, UPDATE_ITEM_BEHAVIOR, UPDATE_ITEM_PET, UPDATE_ITEM_WIFI
+from .exceptions import RequestCancelledError, TryFiError
 
 __all__ = [
     'FiDevice',
@@ -28,6 +40,30 @@ class PyTryFi(object):
         self._session = requests.Session()
         self._user_agent = "pyTryFi"
         self._username = username
+        self._scheduler = schedulerFor(self._session)
+        self._pendingUpdateItems = []
+        # petId -> time.monotonic() at which a failed pet may be retried
+        self._petRetryAt = {}
+        # pets whose behavior trends were skipped by updatePet's budget
+        self._deferredBehavior = set()
+        # pets whose step and sleep totals the caller wants on their next update,
+        # requested from the caller's thread while updates run on others
+        self._statsRequested = set()
+        self._statsLock = threading.Lock()
+        # ids of the objects whose data changed during the last update
+        self._changedPetIds = set()
+        self._changedBaseIds = set()
+        self._changedWifiSsids = set()
+        # places pets are located against; rebuilt lazily after bases, wifi
+        # networks or the caller's extra places (e.g. zones) change
+        self._extraPlaces = ()
+        self._placeIndex = None
+        self._petPlaces = {}
+        # optional store that every successful pet update is recorded to
+        self._telemetry = None
+        # petId -> rolling aggregates of the pet's daily totals
+        self._rollingWindows = ROLLING_WINDOWS
+        self._rollingStats = {}
         self.login(username, password)
 
         self._currentUser = FiUser(self._userId)
@@ -82,9 +118,126 @@ class PyTryFi(object):
         return f"TryFi Instance - {instString}\n Pets in Home:\n {petString}\n Bases In Home:\n {baseString}"
 
     #refresh pet details for all pets
-    def updatePets(self):
+    # a pet that fails is logged and backs off (see petRetryIn), the remaining pets still update
+    def updatePets(self, batch: BackgroundBatch | None = None):
         for pet in self._pets:
-            pet.updateAllDetails(self._session)
+            if batch is not None:
+                self._scheduler.checkpoint(batch)
+            if self._updatePet(pet, pet.updateAllDetails):
+                self._changedPetIds.add(pet.petId)
+
+    # update one pet in its own failure domain. Returns whether its data changed,
+    # or None if the update failed (and re-raises the error when asked to).
+    def _updatePet(self, pet: FiPet, updater, reraise: bool = False) -> bool | None:
+        try:
+            changed = updater(self._session)
+        except RequestCancelledError:
+            raise
+        except Exception as e:
+            pet.recordUpdateFailure(e)
+            delay = min(PET_RETRY_BASE_DELAY * 2 ** (pet.consecutiveUpdateFailures - 1), PET_RETRY_MAX_DELAY)
+            self._petRetryAt[pet.petId] = time.monotonic() + delay
+            LOGGER.warning("failed to update pet %s, retrying in %ds: %s", pet.name, delay, e, exc_info=not reraise)
+            if reraise:
+                raise
+            return None
+        pet.recordUpdateSuccess()
+        self._petRetryAt.pop(pet.petId, None)
+        # read once, the store may be detached from another thread
+        telemetry = self._telemetry
+        if telemetry is not None:
+            telemetry.record(pet)
+        return bool(changed)
+
+    # refresh a single pet: location and device, stats and sleep when due (see
+    # FiPet.statsDue and requestStatsRefresh), then behavior trends for collars
+    # that support them. Errors are raised to the caller.
+    # Behavior trends skipped because the budget ran out, or cancelled by an
+    # interactive request, are fetched first on the pet's next update.
+    # The update runs as one background batch (a new one unless given) that
+    # is checked before every request. Returns whether the pet's data changed.
+    def updatePet(self, petId: str, budget: float | None = None, batch: BackgroundBatch | None = None) -> bool:
+        pet = self.getPet(petId)
+        if pet is None:
+            raise TryFiError(f"Unknown pet: {petId}")
+        deadline = time.monotonic() + budget if budget is not None else None
+        if batch is None:
+            batch = self._scheduler.startBatch()
+        checkpoint = functools.partial(self._scheduler.checkpoint, batch)
+
+        # take the stats request now, so one made during the update is kept
+        # for the next; it is put back if this update fails
+        with self._statsLock:
+            statsRequested = petId in self._statsRequested
+            self._statsRequested.discard(petId)
+        try:
+            return self._updatePetDetails(pet, statsRequested or pet.statsDue(), deadline, checkpoint)
+        except BaseException:
+            if statsRequested:
+                self.requestStatsRefresh(petId)
+            raise
+
+    # the requests of one updatePet, with the stats decision already taken
+    def _updatePetDetails(self, pet: FiPet, includeStats: bool, deadline: float | None, checkpoint) -> bool:
+        petId = pet.petId
+        behaviorDeferred = petId in self._deferredBehavior
+        updateCore = pet.updateCoreDetails if includeStats else functools.partial(pet.updateCoreDetails, includeStats=False)
+        changed = False
+        if not behaviorDeferred:
+            checkpoint()
+            changed = self._updatePet(pet, updateCore, reraise=True)
+        if pet.device is not None and pet.device.supportsAdvancedBehaviorStats():
+            if deadline is not None and time.monotonic() >= deadline and not behaviorDeferred:
+                LOGGER.debug("update budget spent, deferring behavior stats for %s", pet.name)
+                self._deferredBehavior.add(petId)
+                return changed
+            self._deferredBehavior.discard(petId)
+            try:
+                changed |= pet.updateBehaviorStats(self._session, checkpoint)
+            except RequestCancelledError:
+                self._deferredBehavior.add(petId)
+                if behaviorDeferred:
+                    raise
+                LOGGER.debug("update cancelled by an interactive request, deferring behavior stats for %s", pet.name)
+                return changed
+            except Exception as e:
+                LOGGER.warning(f"Could not update behavior stats for Pet {pet.name}.\n{e}")
+        if behaviorDeferred:
+            checkpoint()
+            changed |= self._updatePet(pet, updateCore, reraise=True)
+        return changed
+
+    # fetch the step and sleep totals of a pet (or every pet) on its next
+    # updatePet, e.g. right after local midnight when the periods roll over
+    def requestStatsRefresh(self, petId: str | None = None):
+        with self._statsLock:
+            if petId is None:
+                self._statsRequested.update(pet.petId for pet in self._pets)
+            else:
+                self._statsRequested.add(petId)
+
+    # a pet's past activity (steps and distance) per period, newest first,
+    # fetched a page at a time as it is iterated. Resumes from cursor if given.
+    def activityHistory(self, petId: str, period: str = 'DAILY', cursor: str | None = None,
+            pageSize: int = HISTORY_PAGE_SIZE) -> FiFeedPaginator:
+        return FiFeedPaginator(
+            lambda pageCursor, limit: getActivitySummaryFeed(self._session, petId, period, pageCursor, limit),
+            parseActivitySummary, 'activitySummaries', cursor, pageSize)
+
+    # a pet's past rest (sleep and nap) per period, newest first, fetched a
+    # page at a time as it is iterated. Resumes from cursor if given.
+    def restHistory(self, petId: str, period: str = 'DAILY', cursor: str | None = None,
+            pageSize: int = HISTORY_PAGE_SIZE) -> FiFeedPaginator:
+        return FiFeedPaginator(
+            lambda pageCursor, limit: getRestSummaryFeed(self._session, petId, period, pageCursor, limit),
+            parseRestSummary, 'restSummaries', cursor, pageSize)
+
+    # seconds until a failed pet may be retried, or None if its last update succeeded
+    def petRetryIn(self, petId: str) -> float | None:
+        retryAt = self._petRetryAt.get(petId)
+        if retryAt is None:
+            return None
+        return max(0.0, retryAt - time.monotonic())
 
     # return the pet object based on petId
     def getPet(self, petId):
@@ -95,8 +248,10 @@ class PyTryFi(object):
         return None
 
     #refresh base details
+    # known bases are updated in place rather than rebuilt on every poll
     def updateBases(self):
         updatedBases = []
+        knownBases = {b.baseId: b for b in self._bases}
         baseListJSON = getBaseList(self._session)
         for house in baseListJSON:
             for base in house['household']['bases']:
@@ -104,12 +259,16 @@ class PyTryFi(object):
                     LOGGER.warning("Skipping null base entry in API response")
                     continue
                 try:
-                    b = FiBase(base['baseId'])
-                    b.setBaseDetailsJSON(base)
+                    b = knownBases.get(base['baseId']) or FiBase(base['baseId'])
+                    if b.setBaseDetailsJSON(base):
+                        self._changedBaseIds.add(b.baseId)
                     updatedBases.append(b)
                 except (KeyError, TypeError, ValueError) as e:
                     LOGGER.warning("Skipping base with invalid data: %s", e)
+        self._changedBaseIds.update(knownBases.keys() - {b.baseId for b in updatedBases})
         self._bases = updatedBases
+        if self._changedBaseIds:
+            self._placeIndex = None
 
     # return the pet object based on petId
     def getBase(self, baseId):
@@ -119,21 +278,29 @@ class PyTryFi(object):
         LOGGER.error(f"Cannot find Base: {baseId}")
         return None
 
-    def updateWifiNetworks(self):
+    # known networks are updated in place rather than rebuilt on every poll
+    def updateWifiNetworks(self, batch: BackgroundBatch | None = None):
         updatedNetworks = []
+        knownNetworks = {(w.householdId, w.ssid): w for w in self._wifiNetworks}
         for householdId in self._householdIds:
+            if batch is not None:
+                self._scheduler.checkpoint(batch)
             try:
                 wifiData = getWifiNetworks(self._session, householdId)
                 for network in wifiData.get('networks', []):
                     ssid = network.get('ssid')
                     if ssid:
-                        w = FiWifiNetwork(ssid, householdId)
-                        w.setDetailsJSON(network)
+                        w = knownNetworks.get((householdId, ssid)) or FiWifiNetwork(ssid, householdId)
+                        if w.setDetailsJSON(network):
+                            self._changedWifiSsids.add(ssid)
                         LOGGER.debug(f"Adding WiFi Network: {w.ssid} State: {w.state}")
                         updatedNetworks.append(w)
             except Exception as e:
                 LOGGER.warning("failed to fetch WiFi networks for household %s: %s", householdId, e, exc_info=True)
+        self._changedWifiSsids.update(ssid for _, ssid in knownNetworks.keys() - {(w.householdId, w.ssid) for w in updatedNetworks})
         self._wifiNetworks = updatedNetworks
+        if self._changedWifiSsids:
+            self._placeIndex = None
 
     def getWifiNetwork(self, ssid):
         for w in self._wifiNetworks:
@@ -146,21 +313,170 @@ class PyTryFi(object):
         network = self.getWifiNetwork(ssid)
         if not network:
             raise Exception(f"WiFi network not found: {ssid}")
-        return updateWifiNetwork(self._session, network.householdId, ssid, latitude, longitude)
+        with self._scheduler.interactive():
+            return updateWifiNetwork(self._session, network.householdId, ssid, latitude, longitude)
 
-    def update(self):
-        try:
-            self.updateBases()
-        except Exception as e:
-            LOGGER.warning("failed to update base: %s", e, exc_info=True)
-        try:
-            self.updatePets()
-        except Exception as e:
-            LOGGER.warning("failed to update pets: %s", e, exc_info=True)
+    # record pet telemetry to store after every successful pet update, or stop
+    # recording with None. Samples are written by each update().
+    def setTelemetryStore(self, store: FiTelemetryStore | None):
+        self._telemetry = store
+
+    # keep rolling aggregates of every pet's daily totals over the given
+    # windows (in days), rebuilt from a previous rollingStatsState()
+    def setRollingWindows(self, windows: tuple[int, ...], state: dict | None = None):
+        self._rollingWindows = tuple(windows)
+        self._rollingStats = {
+            petId: FiRollingStats.fromDict(petState, self._rollingWindows)
+            for petId, petState in (state or {}).items()
+        }
+
+    # observe a pet's current daily totals as those of day, the caller's local
+    # date. Returns whether the previous day was completed.
+    def recordDailyTotals(self, petId: str, day: datetime.date) -> bool:
+        pet = self.getPet(petId)
+        if pet is None:
+            return False
+        stats = self._rollingStats.get(petId)
+        if stats is None:
+            stats = self._rollingStats[petId] = FiRollingStats(self._rollingWindows)
+        return stats.observe(FiDailyTotals(day, pet.dailySteps, pet.dailyGoal, pet.dailySleep))
+
+    def rollingStats(self, petId: str) -> FiRollingStats | None:
+        return self._rollingStats.get(petId)
+
+    # every pet's rolling aggregates, for setRollingWindows() to restore
+    def rollingStatsState(self) -> dict:
+        return {petId: stats.asDict() for petId, stats in self._rollingStats.items()}
+
+    # set places known only to the caller, such as Home Assistant zones, to
+    # locate pets against alongside bases and wifi networks
+    def setExtraPlaces(self, places: list[GeoPlace]):
+        places = tuple(places)
+        if places != self._extraPlaces:
+            self._extraPlaces = places
+            self._placeIndex = None
+
+    def _buildPlaceIndex(self) -> GeoIndex:
+        places = [
+            GeoPlace(b.baseId, b.name, 'base', b.latitude, b.longitude, PLACE_RADIUS_BASE)
+            for b in self._bases if b.latitude is not None and b.longitude is not None
+        ]
+        places.extend(
+            GeoPlace(w.ssid, w.addressLabel or w.ssid, 'wifi', w.latitude, w.longitude, PLACE_RADIUS_WIFI)
+            for w in self._wifiNetworks if w.latitude is not None and w.longitude is not None
+        )
+        places.extend(self._extraPlaces)
+        return GeoIndex(places)
+
+    # the nearest known place to a pet and the places it is inside, or None
+    # while its position is unknown. Cached until the pet moves or places change.
+    def petPlaces(self, petId: str) -> PlaceMatch | None:
+        pet = self.getPet(petId)
+        if pet is None or pet.currLatitude is None or pet.currLongitude is None:
+            return None
+        index = self.placeIndex
+        cached = self._petPlaces.get(petId)
+        if cached is None or cached[0] is not index or cached[1] != (pet.currLatitude, pet.currLongitude):
+            # when the places change every pet goes stale at once, so
+            # locate them all in one batch rather than one by one
+            self.locatePets()
+            cached = self._petPlaces[petId]
+        return cached[2]
+
+    # locate every pet whose cached places are stale in a single batch
+    def locatePets(self):
+        index = self.placeIndex
+        stale = []
+        for pet in self._pets:
+            if pet.currLatitude is None or pet.currLongitude is None:
+                continue
+            position = (pet.currLatitude, pet.currLongitude)
+            cached = self._petPlaces.get(pet.petId)
+            if cached is None or cached[0] is not index or cached[1] != position:
+                stale.append((pet.petId, position))
+        matches = index.matchMany([position for _, position in stale])
+        for (petId, position), match in zip(stale, matches):
+            self._petPlaces[petId] = (index, position, match)
+
+    # refresh everything as one background batch. Interactive requests made while
+    # this runs pause the batch, or end it early if they cancel background work.
+    #
+    # With a budget (seconds) the most important data is fetched first and the
+    # update stops once the budget is spent. Whatever finished is kept, and the
+    # remaining items are fetched first on the next call.
+    #
+    # includePets=False refreshes only bases and wifi networks, for callers that
+    # update each pet on its own schedule with updatePet().
+    def update(self, budget: float | None = None, includePets: bool = True):
         try:
-            self.updateWifiNetworks()
-        except Exception as e:
-            LOGGER.warning("failed to update wifi networks: %s", e, exc_info=True)
+            self._update(budget, includePets)
+        finally:
+            # one write per update for the pets recorded since the last one
+            telemetry = self._telemetry
+            if telemetry is not None:
+                telemetry.flush()
+
+    def _update(self, budget: float | None, includePets: bool):
+        batch = self._scheduler.startBatch()
+        self._resetChanges()
+        deadline = time.monotonic() + budget if budget is not None else None
+        items = self._planUpdate(includePets)
+        self._pendingUpdateItems = []
+        for index, item in enumerate(items):
+            if deadline is not None and time.monotonic() >= deadline:
+                self._pendingUpdateItems = items[index:]
+                LOGGER.info("update budget of %.1fs spent, %d item(s) carried over to the next update", budget, len(self._pendingUpdateItems))
+                return
+            try:
+                self._scheduler.checkpoint(batch)
+            except RequestCancelledError:
+                self._pendingUpdateItems = items[index:]
+                LOGGER.info("update cancelled by an interactive request, %d item(s) carried over to the next update", len(self._pendingUpdateItems))
+                return
+            self._runUpdateItem(item)
+
+    # order the work for one update: everything left over from the last update,
+    # then pets (location, device, stats), bases, behavior trends and wifi networks
+    def _planUpdate(self, includePets: bool = True) -> list[tuple[str, str | None]]:
+        pets = self._pets if includePets else []
+        items = [(UPDATE_ITEM_PET, p.petId) for p in pets]
+        items.append((UPDATE_ITEM_BASES, None))
+        items.extend((UPDATE_ITEM_BEHAVIOR, p.petId) for p in pets
+                     if p.device is not None and p.device.supportsAdvancedBehaviorStats())
+        items.append((UPDATE_ITEM_WIFI, None))
+        planned = set(items)
+        carried = [i for i in self._pendingUpdateItems if i in planned]
+        carriedSet = set(carried)
+        return carried + [i for i in items if i not in carriedSet]
+
+    def _resetChanges(self):
+        self._changedPetIds = set()
+        self._changedBaseIds = set()
+        self._changedWifiSsids = set()
+
+    def _runUpdateItem(self, item: tuple[str, str | None]):
+        kind, key = item
+        if kind == UPDATE_ITEM_PET:
+            pet = self.getPet(key)
+            if self._updatePet(pet, pet.updateCoreDetails):
+                self._changedPetIds.add(key)
+        elif kind == UPDATE_ITEM_BASES:
+            try:
+                self.updateBases()
+            except Exception as e:
+                LOGGER.warning("failed to update base: %s", e, exc_info=True)
+        elif kind == UPDATE_ITEM_BEHAVIOR:
+            pet = self.getPet(key)
+            try:
+                if pet.updateBehaviorStats(self._session):
+                    self._changedPetIds.add(pet.petId)
+            except Exception as e:
+                LOGGER.warning(f"Could not update behavior stats for Pet {pet.name}.\n{e}")
+        elif kind == UPDATE_ITEM_WIFI:
+            try:
+                self.updateWifiNetworks()
+            except Exception as e:
+                LOGGER.warning("failed to update wifi networks: %s", e, exc_info=True)
 
     @property
     def currentUser(self):
@@ -175,12 +491,40 @@ class PyTryFi(object):
     def wifiNetworks(self) -> list[FiWifiNetwork]:
         return self._wifiNetworks
     @property
+    def scheduler(self):
+        return self._scheduler
+    @property
+    def placeIndex(self) -> GeoIndex:
+        index = self._placeIndex
+        if index is None:
+            index = self._placeIndex = self._buildPlaceIndex()
+        return index
+    @property
+    def pendingUpdateItems(self) -> list[tuple[str, str | None]]:
+        return self._pendingUpdateItems
+    # what changed during the last update() call
+    @property
+    def changedPetIds(self) -> set[str]:
+        return self._changedPetIds
+    @property
+    def changedBaseIds(self) -> set[str]:
+        return self._changedBaseIds
+    @property
+    def changedWifiSsids(self) -> set[str]:
+        return self._changedWifiSsids
+    @property
+    def hasChanges(self) -> bool:
+        return bool(self._changedPetIds or self._changedBaseIds or self._changedWifiSsids)
+    @property
     def householdIds(self):
         return self._householdIds
     @property
     def username(self):
         return self._username
     @property
+    def telemetryStore(self) -> FiTelemetryStore | None:
+        return self._telemetry
+    @property
     def session(self):
         return self._session
     @property
@@ -199,10 +543,10 @@ class PyTryFi(object):
         }
         
         LOGGER.debug("Logging into TryFi")
-        response = self._session.post(url, data=params)
+        response = self._session.post(url, data=params, timeout=API_REQUEST_TIMEOUT)
         response.raise_for_status()
         #validate if the response contains error or not
-        json = response.json()
+        json = loads(response.content)
         #if error set or response is non-200
         if 'error' in json or not response.ok:
             errorMsg = json['error'].get('message', None)
@@ -212,8 +556,8 @@ class PyTryFi(object):
         #storing cookies but don't need them. Handled by session mgmt
         self._cookies = response.cookies
         #store unique userId from login for future use
-        self._userId = response.json()['userId']
-        self._sessionId = response.json()['sessionId']
+        self._userId = json['userId']
+        self._sessionId = json['sessionId']
         LOGGER.debug(f"Successfully logged in. UserId: {self._userId}")
 
         self.session.headers['content-type'] = 'application/json'
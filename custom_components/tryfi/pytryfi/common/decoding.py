@@ -0,0 +1,37 @@
+import json
+
+# Prefer the fastest JSON parser that is installed. orjson ships with Home
+# Assistant; msgspec is optional. Both decode straight from the response bytes.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    _decode = msgspec.json.Decoder().decode
+    _DecodeError = msgspec.DecodeError
+elif orjson is not None:
+    JSON_BACKEND = "orjson"
+    _decode = orjson.loads
+    _DecodeError = orjson.JSONDecodeError
+else:
+    JSON_BACKEND = "json"
+    _decode = json.loads
+    _DecodeError = json.JSONDecodeError
+
+# decode a JSON document from bytes (or str). Invalid input always raises
+# json.JSONDecodeError, whichever backend is in use.
+def loads(data: bytes | str):
+    try:
+        return _decode(data)
+    except json.JSONDecodeError:
+        raise
+    except (_DecodeError, UnicodeDecodeError) as e:
+        doc = data.decode('utf-8', 'replace') if isinstance(data, (bytes, bytearray)) else data
+        raise json.JSONDecodeError(str(e), doc, 0) from e
@@ -0,0 +1,322 @@
+import math
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+# NumPy is optional. When installed, GeoIndex.matchMany() locates a batch of
+# points against every place in one vectorised pass.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GEO_BACKEND = "numpy" if np is not None else "python"
+
+EARTH_RADIUS = 6371008.8 # metres, mean radius
+METRES_PER_DEGREE = math.radians(1) * EARTH_RADIUS
+
+# side of a GeoIndex grid cell in degrees, about 1.1 km of latitude
+GEO_INDEX_CELL_SIZE = 0.01
+# rings of cells searched around a point before nearest() falls back to
+# checking every place; keeps lookups far from all places cheap
+GEO_INDEX_MAX_RINGS = 8
+
+# walk tail length (in points) that is simplified on every extend() before its
+# kept points are frozen; bounds the cost of one extend() to O(n^2) of this size
+SIMPLIFY_CHUNK_SIZE = 64
+
+# most point x place distances matchMany() computes in one array, bounding the
+# memory of a batch to a few tens of megabytes
+GEO_BATCH_MAX_DISTANCES = 1_000_000
+
+LatLon = tuple[float, float]
+
+
+# distance in metres from p to the segment a-b, on a local flat projection.
+# Accurate to well under a percent over the few kilometres of a walk.
+def _segmentDistance(p: LatLon, a: LatLon, b: LatLon) -> float:
+    scale = math.cos(math.radians(a[0]))
+    ax, ay = a[1] * scale, a[0]
+    bx, by = b[1] * scale, b[0]
+    px, py = p[1] * scale, p[0]
+    dx, dy = bx - ax, by - ay
+    lengthSq = dx * dx + dy * dy
+    if lengthSq == 0:
+        t = 0.0
+    else:
+        t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / lengthSq))
+    ex, ey = px - (ax + t * dx), py - (ay + t * dy)
+    return math.radians(math.hypot(ex, ey)) * EARTH_RADIUS
+
+
+# Douglas-Peucker simplification of a path of (latitude, longitude) points,
+# keeping every point further than tolerance metres from the simplified line.
+# Iterative, so long walks cannot hit the recursion limit.
+def simplifyPath(points: Sequence[LatLon], tolerance: float) -> list[LatLon]:
+    if len(points) <= 2:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        maxDistance, index = 0.0, 0
+        for i in range(first + 1, last):
+            distance = _segmentDistance(points[i], points[first], points[last])
+            if distance > maxDistance:
+                maxDistance, index = distance, i
+        if maxDistance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+# Simplifies a path that grows over time. Points are collected in a tail that
+# is re-simplified as it grows; once it passes chunkSize points its simplified
+# points are frozen, with the last one kept as the start of the next tail. A
+# long walk therefore never gets re-simplified from the beginning.
+class PathSimplifier(object):
+    __slots__ = ('_tolerance', '_chunkSize', '_frozen', '_tail', '_path')
+
+    def __init__(self, tolerance: float, chunkSize: int = SIMPLIFY_CHUNK_SIZE):
+        self._tolerance = tolerance
+        self._chunkSize = max(chunkSize, 3)
+        self._frozen: list[LatLon] = []
+        self._tail: list[LatLon] = []
+        self._path: list[LatLon] | None = []
+
+    def extend(self, points: Iterable[LatLon]):
+        for point in points:
+            self._tail.append(point)
+            if len(self._tail) >= self._chunkSize:
+                simplified = simplifyPath(self._tail, self._tolerance)
+                self._frozen.extend(simplified[:-1])
+                self._tail = [simplified[-1]]
+        self._path = None
+
+    def clear(self):
+        self._frozen = []
+        self._tail = []
+        self._path = []
+
+    @property
+    def path(self) -> list[LatLon]:
+        if self._path is None:
+            self._path = self._frozen + simplifyPath(self._tail, self._tolerance)
+        return self._path
+
+
+def _encodeValue(value: int, out: list[str]):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+# encode (latitude, longitude) points in Google's encoded polyline format
+def encodePolyline(points: Iterable[LatLon], precision: int = 5) -> str:
+    factor = 10 ** precision
+    out: list[str] = []
+    prevLat = prevLon = 0
+    for latitude, longitude in points:
+        lat = round(latitude * factor)
+        lon = round(longitude * factor)
+        _encodeValue(lat - prevLat, out)
+        _encodeValue(lon - prevLon, out)
+        prevLat, prevLon = lat, lon
+    return ''.join(out)
+
+
+def decodePolyline(encoded: str, precision: int = 5) -> list[LatLon]:
+    factor = 10 ** precision
+    points: list[LatLon] = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+    return points
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dPhi = phi2 - phi1
+    dLambda = math.radians(lon2 - lon1)
+    a = math.sin(dPhi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dLambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+# a known location a pet can be at: a base, a wifi network or a zone supplied
+# by the caller. radius is in metres.
+class GeoPlace(NamedTuple):
+    placeId: str
+    name: str
+    kind: str
+    latitude: float
+    longitude: float
+    radius: float
+
+
+class PlaceMatch(NamedTuple):
+    nearest: GeoPlace | None
+    distance: float | None # metres to the nearest place's centre
+    inside: tuple[GeoPlace, ...]
+
+
+# Fixed grid of places bucketed by cell, built once per change of the places.
+# nearest() searches rings of cells outwards from the query point and stops as
+# soon as no unvisited cell can hold a closer place, so a lookup touches a
+# handful of places instead of all of them. Longitude does not wrap at the
+# antimeridian.
+class GeoIndex(object):
+    __slots__ = ('_cellSize', '_cells', '_places', '_maxRadius', '_bounds', '_arrays')
+
+    def __init__(self, places: Iterable[GeoPlace], cellSize: float = GEO_INDEX_CELL_SIZE):
+        self._cellSize = cellSize
+        self._cells: dict[tuple[int, int], list[GeoPlace]] = {}
+        self._places = tuple(places)
+        self._maxRadius = max((p.radius for p in self._places), default=0.0)
+        for place in self._places:
+            self._cells.setdefault(self._cell(place.latitude, place.longitude), []).append(place)
+        if self._cells:
+            rows = [cell[0] for cell in self._cells]
+            cols = [cell[1] for cell in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = None
+        # place coordinates and radii as arrays, built on the first matchMany()
+        self._arrays = None
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self._cellSize), math.floor(longitude / self._cellSize)
+
+    def _ring(self, row: int, col: int, r: int) -> Iterable[list[GeoPlace]]:
+        cells = self._cells
+        if r == 0:
+            bucket = cells.get((row, col))
+            if bucket:
+                yield bucket
+            return
+        for c in range(col - r, col + r + 1):
+            for cell in ((row - r, c), (row + r, c)):
+                bucket = cells.get(cell)
+                if bucket:
+                    yield bucket
+        for rr in range(row - r + 1, row + r):
+            for cell in ((rr, col - r), (rr, col + r)):
+                bucket = cells.get(cell)
+                if bucket:
+                    yield bucket
+
+    def nearest(self, latitude: float, longitude: float) -> tuple[GeoPlace | None, float | None]:
+        if self._bounds is None:
+            return None, None
+        row, col = self._cell(latitude, longitude)
+        minRow, maxRow, minCol, maxCol = self._bounds
+        lastRing = max(abs(row - minRow), abs(row - maxRow), abs(col - minCol), abs(col - maxCol))
+        best, bestDistance = None, math.inf
+        for r in range(min(lastRing, GEO_INDEX_MAX_RINGS) + 1):
+            for bucket in self._ring(row, col, r):
+                for place in bucket:
+                    distance = haversine(latitude, longitude, place.latitude, place.longitude)
+                    if distance < bestDistance:
+                        best, bestDistance = place, distance
+            # every place in ring r+1 or beyond is at least r whole cells away
+            edgeLatitude = min(89.9, abs(latitude) + (r + 1) * self._cellSize)
+            cellMetres = self._cellSize * METRES_PER_DEGREE * math.cos(math.radians(edgeLatitude))
+            if bestDistance <= r * cellMetres:
+                return best, bestDistance
+        if lastRing > GEO_INDEX_MAX_RINGS:
+            # far from every place, checking them all beats walking more rings
+            for place in self._places:
+                distance = haversine(latitude, longitude, place.latitude, place.longitude)
+                if distance < bestDistance:
+                    best, bestDistance = place, distance
+        return best, bestDistance
+
+    def containing(self, latitude: float, longitude: float) -> list[GeoPlace]:
+        if self._bounds is None:
+            return []
+        row, col = self._cell(latitude, longitude)
+        rows = math.ceil(self._maxRadius / (self._cellSize * METRES_PER_DEGREE))
+        edgeLatitude = min(89.9, abs(latitude) + (rows + 1) * self._cellSize)
+        cols = math.ceil(self._maxRadius / (self._cellSize * METRES_PER_DEGREE * math.cos(math.radians(edgeLatitude))))
+        if (2 * rows + 1) * (2 * cols + 1) > len(self._places):
+            # a large radius spans more cells than there are places
+            return [
+                place for place in self._places
+                if haversine(latitude, longitude, place.latitude, place.longitude) <= place.radius
+            ]
+        inside = []
+        for r in range(row - rows, row + rows + 1):
+            for c in range(col - cols, col + cols + 1):
+                for place in self._cells.get((r, c), ()):
+                    if haversine(latitude, longitude, place.latitude, place.longitude) <= place.radius:
+                        inside.append(place)
+        return inside
+
+    def match(self, latitude: float, longitude: float) -> PlaceMatch:
+        nearest, distance = self.nearest(latitude, longitude)
+        inside = self.containing(latitude, longitude) if nearest is not None else []
+        inside.sort(key=lambda p: haversine(latitude, longitude, p.latitude, p.longitude))
+        return PlaceMatch(nearest, distance, tuple(inside))
+
+    # match a batch of (latitude, longitude) points, such as every pet of a
+    # household. With NumPy the distances from all points to all places are
+    # computed at once; without it each point is matched through the grid.
+    def matchMany(self, points: Sequence[LatLon]) -> list[PlaceMatch]:
+        if np is None or not self._places:
+            return [self.match(latitude, longitude) for latitude, longitude in points]
+        step = max(1, GEO_BATCH_MAX_DISTANCES // len(self._places))
+        matches: list[PlaceMatch] = []
+        for start in range(0, len(points), step):
+            matches.extend(self._matchArray(points[start:start + step]))
+        return matches
+
+    def _matchArray(self, points: Sequence[LatLon]) -> list[PlaceMatch]:
+        if self._arrays is None:
+            self._arrays = (
+                np.radians([p.latitude for p in self._places]),
+                np.radians([p.longitude for p in self._places]),
+                np.array([p.radius for p in self._places], dtype=float),
+            )
+        placePhi, placeLambda, radii = self._arrays
+        coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+        phi = coords[:, 0:1]
+        a = (np.sin((placePhi - phi) / 2) ** 2
+             + np.cos(phi) * np.cos(placePhi) * np.sin((placeLambda - coords[:, 1:2]) / 2) ** 2)
+        distances = 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        nearest = distances.argmin(axis=1).tolist()
+        # plain floats from here on, indexing an ndarray per element is slow
+        rows = distances.tolist()
+        insideRows, insideCols = np.nonzero(distances <= radii)
+        inside: list[list[int]] = [[] for _ in rows]
+        for row, col in zip(insideRows.tolist(), insideCols.tolist()):
+            inside[row].append(col)
+
+        places = self._places
+        matches = []
+        for col, distance, cols in zip(nearest, rows, inside):
+            cols.sort(key=distance.__getitem__)
+            matches.append(PlaceMatch(places[col], distance[col], tuple(places[c] for c in cols)))
+        return matches
+
+    def __len__(self):
+        return len(self._places)
+
+    @property
+    def places(self) -> tuple[GeoPlace, ...]:
+        return self._places
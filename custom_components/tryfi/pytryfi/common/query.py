@@ -1,5 +1,6 @@
 from ..const import PET_MODE_NORMAL, PET_MODE_LOST
 from ..exceptions import TryFiError, RemoteApiError, ApiNotAuthorizedError
+from .decoding import loads
 from typing import Any, Literal
 import json
 import logging
@@ -10,20 +11,26 @@ LOGGER = logging.getLogger(__name__)
 API_HOST_URL_BASE   = "https://api.tryfi.com"
 API_GRAPHQL         = "/graphql"
 API_LOGIN           = "/auth/login"
+API_REQUEST_TIMEOUT = 30 # seconds, so one stalled request can't hold up an update indefinitely
 
 VAR_PET_ID = "__PET_ID__"
 VAR_HOUSEHOLD_ID = "__HOUSEHOLD_ID__"
+VAR_PERIOD = "__PERIOD__"
 
 QUERY_CURRENT_USER_FULL_DETAIL  = "query {  currentUser {    ...UserFullDetails  }}"
 
 QUERY_GET_BASES = "query { currentUser { userHouseholds { household { bases { __typename ...BaseDetails }}}}}"
 QUERY_PET_ACTIVE_DETAILS = "query {  pet (id: \"" + VAR_PET_ID + "\") { ongoingActivity { __typename ...OngoingActivityDetails } dailyStepStat: currentActivitySummary (period: DAILY) { ...ActivitySummaryDetails } weeklyStepStat: currentActivitySummary (period: WEEKLY) { ...ActivitySummaryDetails } monthlyStepStat: currentActivitySummary (period: MONTHLY) { ...ActivitySummaryDetails } device { __typename moduleId info operationParams {    __typename    ...OperationParamsDetails  }  nextLocationUpdateExpectedBy  lastConnectionState {    __typename    ...ConnectionStateDetails  }  ledColor {    __typename    ...LedColorDetails }} dailySleepStat: restSummaryFeed(cursor: null, period: DAILY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails }} weeklySleepStat: restSummaryFeed(cursor: null, period: WEEKLY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails }} monthlySleepStat: restSummaryFeed(cursor: null, period: MONTHLY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails }} }}"
+QUERY_PET_LIVE_DETAILS = "query {  pet (id: \"" + VAR_PET_ID + "\") { ongoingActivity { __typename ...OngoingActivityDetails } device { __typename moduleId info operationParams {    __typename    ...OperationParamsDetails  }  nextLocationUpdateExpectedBy  lastConnectionState {    __typename    ...ConnectionStateDetails  }  ledColor {    __typename    ...LedColorDetails }} }}"
 QUERY_PET_ACTIVITY = "query {  pet (id: \""+VAR_PET_ID+"\") {       dailyStat: currentActivitySummary (period: DAILY) {      ...ActivitySummaryDetails    }    weeklyStat: currentActivitySummary (period: WEEKLY) {      ...ActivitySummaryDetails    }    monthlyStat: currentActivitySummary (period: MONTHLY) {      ...ActivitySummaryDetails    }  }}"
 QUERY_PET_CURRENT_LOCATION = "query {  pet (id: \""+VAR_PET_ID+"\") {    ongoingActivity {      __typename      ...OngoingActivityDetails    }  }}"
 QUERY_PET_DEVICE_DETAILS = "query {  pet (id: \""+VAR_PET_ID+"\") {    __typename    ...PetProfile  }}"
 QUERY_PET_REST = "query {  pet (id: \""+VAR_PET_ID+"\") {	dailyStat: restSummaryFeed(cursor: null, period: DAILY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails      }    }	weeklyStat: restSummaryFeed(cursor: null, period: WEEKLY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails      }    }	monthlyStat: restSummaryFeed(cursor: null, period: MONTHLY, limit: 1) {      __typename      restSummaries {        __typename        ...RestSummaryDetails      }    }  }}"
+QUERY_PET_REST_FEED = "query PetRestFeed($cursor: String, $limit: Int!) {  pet (id: \""+VAR_PET_ID+"\") {    restSummaryFeed(cursor: $cursor, period: "+VAR_PERIOD+", limit: $limit) {      __typename      cursor      restSummaries {        __typename        ...RestSummaryDetails      }    }  }}"
+QUERY_PET_ACTIVITY_FEED = "query PetActivityFeed($cursor: String, $limit: Int!) {  pet (id: \""+VAR_PET_ID+"\") {    activitySummaryFeed(cursor: $cursor, period: "+VAR_PERIOD+", limit: $limit) {      __typename      cursor      activitySummaries {        __typename        ...ActivitySummaryFeedDetails      }    }  }}"
 
 FRAGMENT_ACTIVITY_SUMMARY_DETAILS = "fragment ActivitySummaryDetails on ActivitySummary {  __typename  totalSteps  stepGoal  totalDistance}"
+FRAGMENT_ACTIVITY_SUMMARY_FEED_DETAILS = "fragment ActivitySummaryFeedDetails on ActivitySummary {  __typename  start  end  totalSteps  stepGoal  totalDistance}"
 FRAGMENT_BASE_DETAILS = "fragment BaseDetails on ChargingBase {  __typename  baseId  name  position {    __typename    ...PositionCoordinates  }  infoLastUpdated  networkName  online  onlineQuality}"
 FRAGMENT_BASE_PET_PROFILE = "fragment BasePetProfile on BasePet {  __typename  id  name  homeCityState  yearOfBirth  monthOfBirth  dayOfBirth  gender  weight  isPurebred  breed {    __typename    ...BreedDetails  }  photos {    __typename    first {      __typename      ...PhotoDetails    }    items {      __typename      ...PhotoDetails    }  }  }"
 FRAGMENT_BREED_DETAILS = "fragment BreedDetails on Breed {  __typename  id  name  }"
@@ -50,6 +57,9 @@ MUTATION_UPDATE_WIFI_NETWORK = "mutation UpdateWifiNetwork($input: UpdateWifiNet
 
 REQUEST_FRAGMENTS_PET_ALL_INFO = FRAGMENT_ACTIVITY_SUMMARY_DETAILS + FRAGMENT_ONGOING_ACTIVITY_DETAILS + FRAGMENT_OPERATIONAL_DETAILS + FRAGMENT_CONNECTION_STATE_DETAILS + FRAGMENT_LED_DETAILS \
         + FRAGMENT_REST_SUMMARY_DETAILS + FRAGMENT_POSITION_COORDINATES + FRAGMENT_LOCATION_POINT + FRAGMENT_USER_DETAILS + FRAGMENT_PLACE_DETAILS
+# the pet query without the period totals, so without their summary fragments
+REQUEST_FRAGMENTS_PET_LIVE_INFO = FRAGMENT_ONGOING_ACTIVITY_DETAILS + FRAGMENT_OPERATIONAL_DETAILS + FRAGMENT_CONNECTION_STATE_DETAILS + FRAGMENT_LED_DETAILS \
+        + FRAGMENT_POSITION_COORDINATES + FRAGMENT_LOCATION_POINT + FRAGMENT_USER_DETAILS + FRAGMENT_PLACE_DETAILS
 
 REQUEST_GET_HOUSEHOLDS = QUERY_CURRENT_USER_FULL_DETAIL + FRAGMENT_USER_FULL_DETAILS \
     + FRAGMENT_USER_DETAILS + FRAGMENT_PET_PROFILE + FRAGMENT_BASE_PET_PROFILE \
@@ -84,6 +94,13 @@ def getPetAllInfo(session: requests.Session, petId: str):
     LOGGER.debug(f"getPetAllInfo: {response}")
     return response['data']['pet']
 
+# the pet's location and device, without its step and sleep totals
+def getPetLiveInfo(session: requests.Session, petId: str):
+    qString = QUERY_PET_LIVE_DETAILS.replace(VAR_PET_ID, petId) + REQUEST_FRAGMENTS_PET_LIVE_INFO
+    response = query(session, qString)
+    LOGGER.debug(f"getPetLiveInfo: {response}")
+    return response['data']['pet']
+
 def getCurrentPetStats(session: requests.Session, petId: str):
     qString = QUERY_PET_ACTIVITY.replace(VAR_PET_ID, petId) + FRAGMENT_ACTIVITY_SUMMARY_DETAILS
     response = query(session, qString)
@@ -96,6 +113,20 @@ def getCurrentPetRestStats(session: requests.Session, petId: str):
     LOGGER.debug(f"getCurrentPetStats: {response}")
     return response['data']['pet']
 
+# one page of a pet's rest summaries, newest first, with the cursor of the next page
+def getRestSummaryFeed(session: requests.Session, petId: str, period: str, cursor: str | None, limit: int):
+    qString = QUERY_PET_REST_FEED.replace(VAR_PET_ID, petId).replace(VAR_PERIOD, period) + FRAGMENT_REST_SUMMARY_DETAILS
+    response = mutation(session, qString, {"cursor": cursor, "limit": limit})
+    LOGGER.debug(f"getRestSummaryFeed: {response}")
+    return response['data']['pet']['restSummaryFeed']
+
+# one page of a pet's activity summaries, newest first, with the cursor of the next page
+def getActivitySummaryFeed(session: requests.Session, petId: str, period: str, cursor: str | None, limit: int):
+    qString = QUERY_PET_ACTIVITY_FEED.replace(VAR_PET_ID, petId).replace(VAR_PERIOD, period) + FRAGMENT_ACTIVITY_SUMMARY_FEED_DETAILS
+    response = mutation(session, qString, {"cursor": cursor, "limit": limit})
+    LOGGER.debug(f"getActivitySummaryFeed: {response}")
+    return response['data']['pet']['activitySummaryFeed']
+
 def getDevicedetails(session: requests.Session, petId: str):
     qString = QUERY_PET_DEVICE_DETAILS.replace(VAR_PET_ID, petId) + FRAGMENT_PET_PROFILE + FRAGMENT_BASE_PET_PROFILE + \
         FRAGMENT_DEVICE_DETAILS + FRAGMENT_LED_DETAILS + FRAGMENT_OPERATIONAL_DETAILS + FRAGMENT_CONNECTION_STATE_DETAILS + \
@@ -195,7 +226,7 @@ def mutation(session: requests.Session, qString: str, qVariables: dict[str, Any]
     url = getGraphqlURL()
 
     params = {"query": qString, "variables": qVariables}
-    return _execute(url, session, params=params, method='POST').json()
+    return loads(_execute(url, session, params=params, method='POST').content)
 
 def query(session: requests.Session, qString):
     url = getGraphqlURL()
@@ -209,7 +240,7 @@ def query(session: requests.Session, qString):
         raise RemoteApiError("Empty response payload from tryfi.com")
 
     try:
-        json_object = resp.json()
+        json_object = loads(resp.content)
     except json.JSONDecodeError as e:
         LOGGER.error(f"Failed to parse JSON response: {resp.text}")
         raise RemoteApiError(f"Invalid JSON response from API: {e}. First few bytes: '{resp.text[:10]}'") from e
@@ -225,8 +256,8 @@ def query(session: requests.Session, qString):
 
 def _execute(url: str, session : requests.Session, method: Literal['GET', 'POST'] = 'GET', params=None) -> requests.Response:
     if method == 'GET':
-        return session.get(url, params=params)
+        return session.get(url, params=params, timeout=API_REQUEST_TIMEOUT)
     elif method == 'POST':
-        return session.post(url, json=params)
+        return session.post(url, json=params, timeout=API_REQUEST_TIMEOUT)
     else:
         raise TryFiError(f"Method Passed was invalid: {method}. Only GET and POST are supported")
@@ -1,4 +1,12 @@
 import datetime
+from functools import lru_cache
 
+# Timestamps such as an activity's start or ledOffAt rarely change between
+# polls, so parsed values are cached by their raw string. datetimes are
+# immutable, which makes sharing them safe.
+FI_DATE_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=FI_DATE_CACHE_SIZE)
 def parse_fi_date(input: str) -> datetime.datetime:
-    return datetime.datetime.fromisoformat(input.replace('Z', '+00:00'))
\ No newline at end of file
+    # fromisoformat accepts the 'Z' suffix directly on Python 3.11+
+    return datetime.datetime.fromisoformat(input)
@@ -0,0 +1,76 @@
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+
+import requests
+
+from ..exceptions import RequestCancelledError
+
+LOGGER = logging.getLogger(__name__)
+
+_schedulers: "weakref.WeakKeyDictionary[requests.Session, RequestScheduler]" = weakref.WeakKeyDictionary()
+_schedulersLock = threading.Lock()
+
+# return the scheduler shared by every request made with this session
+def schedulerFor(session: requests.Session) -> "RequestScheduler":
+    with _schedulersLock:
+        scheduler = _schedulers.get(session)
+        if scheduler is None:
+            scheduler = RequestScheduler()
+            _schedulers[session] = scheduler
+        return scheduler
+
+
+class BackgroundBatch(object):
+    def __init__(self, generation: int):
+        self._generation = generation
+
+    @property
+    def generation(self):
+        return self._generation
+
+
+class RequestScheduler(object):
+    """Gives interactive requests (user commands) priority over background polling.
+
+    Background work runs as a batch and calls checkpoint() before each request.
+    While an interactive request is in flight the batch pauses at its next
+    checkpoint, and an interactive request that cancels background work makes
+    the batch raise RequestCancelledError instead of resuming.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._interactiveCount = 0
+        self._generation = 0
+
+    @contextmanager
+    def interactive(self, cancelBackground: bool = False):
+        with self._condition:
+            self._interactiveCount += 1
+            if cancelBackground:
+                self._generation += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._interactiveCount -= 1
+                self._condition.notify_all()
+
+    def startBatch(self) -> BackgroundBatch:
+        with self._condition:
+            return BackgroundBatch(self._generation)
+
+    # wait for interactive requests to finish before the next background request
+    def checkpoint(self, batch: BackgroundBatch):
+        with self._condition:
+            if self._interactiveCount > 0:
+                LOGGER.debug("Pausing background batch for %d interactive request(s)", self._interactiveCount)
+                self._condition.wait_for(lambda: self._interactiveCount == 0)
+            if batch.generation != self._generation:
+                raise RequestCancelledError("Background batch cancelled by an interactive request")
+
+    @property
+    def interactivePending(self) -> bool:
+        return self._interactiveCount > 0
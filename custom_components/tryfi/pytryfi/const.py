@@ -7,3 +7,42 @@ PET_ACTIVITY_ONGOINGREST = "OngoingRest"
 PET_ACTIVITY_WALK = "Walk"
 PET_ACTIVITY_REST = "Rest"
 
+
+# Units of work in PyTryFi.update, in the order they are fetched when time is short
+UPDATE_ITEM_PET = "pet" # location, device and period stats come back in one request
+UPDATE_ITEM_BASES = "bases"
+UPDATE_ITEM_BEHAVIOR = "behavior"
+UPDATE_ITEM_WIFI = "wifi"
+
+# Backoff for re-fetching a pet whose update failed, doubling per consecutive failure
+PET_RETRY_BASE_DELAY = 5 # seconds
+PET_RETRY_MAX_DELAY = 300 # seconds
+
+# Positions kept for a pet's ongoing walk, about 2 hours at one fix every 4 seconds
+WALK_TRACK_MAX_POINTS = 2048
+
+# Radius in metres within which a pet counts as at a base or wifi network,
+# which the API only gives as a point
+PLACE_RADIUS_BASE = 50
+PLACE_RADIUS_WIFI = 50
+
+# Summaries requested per page when walking a pet's history feeds
+HISTORY_PAGE_SIZE = 30
+
+# Samples read per query when iterating over a range of stored telemetry
+TELEMETRY_QUERY_CHUNK_SIZE = 1000
+
+# Battery trend: the readings the discharge rate is fitted over, the span they
+# must cover before a time to empty is estimated, and the jump in percent that
+# marks an unreported charge (or unplugging) on collars without isCharging
+BATTERY_TREND_WINDOW = 2 * 86400 # seconds
+BATTERY_TREND_MIN_SPAN = 3 * 3600 # seconds
+BATTERY_TREND_JUMP = 2 # percent
+
+# Days the rolling aggregates of a pet's daily steps and sleep cover by default
+ROLLING_WINDOWS = (7, 30)
+
+# Longest a pet's step and sleep totals go without a refresh while its
+# activity does not change. They are also refreshed whenever the pet's
+# activity type changes (a walk ends or a rest starts)
+STATS_REFRESH_INTERVAL = 900 # seconds
@@ -8,4 +8,7 @@ class RemoteApiError(TryFiError):
     """tryfi.com returned an unexpected result"""
 
 class ApiNotAuthorizedError(TryFiError):
-    """tryfi.com reports not authorized"""
\ No newline at end of file
+    """tryfi.com reports not authorized"""
+
+class RequestCancelledError(TryFiError):
+    """a background batch was cancelled in favour of an interactive request"""
@@ -1,12 +1,30 @@
 import datetime
 
 class FiBase(object):
+    __slots__ = (
+        '_baseId', '_name', '_latitude', '_longitude',
+        '_online', '_onlineQuality', '_networkName', '_lastUpdated',
+        '_rawDetails',
+    )
+
     def __init__(self, baseId):
         self._baseId = baseId
+        self._name = None
+        self._latitude = None
+        self._longitude = None
+        self._online = None
+        self._onlineQuality = None
+        self._networkName = None
+        self._lastUpdated = None
+        self._rawDetails = None
     
-    def setBaseDetailsJSON(self, baseJSON):
+    # Returns False, without re-parsing, when the details are unchanged
+    def setBaseDetailsJSON(self, baseJSON) -> bool:
         if baseJSON is None:
             raise ValueError("baseJSON is None")
+        if baseJSON == self._rawDetails:
+            self._lastUpdated = datetime.datetime.now()
+            return False
         self._name = baseJSON['name']
         if baseJSON['position'] is not None:
             self._latitude = baseJSON['position']['latitude']
@@ -19,6 +37,8 @@ class FiBase(object):
         self._lastUpdated = baseJSON['infoLastUpdated']
         self._networkName = baseJSON['networkName']
         self._lastUpdated = datetime.datetime.now()
+        self._rawDetails = baseJSON
+        return True
 
     def __str__(self):
         return f"Last Updated - {self.lastUpdated} - Base ID: {self.baseId} Name: {self.name} Online Status: {self.online} Wifi Network: {self.networkname} Located: {self.latitude},{self.longitude}"
@@ -0,0 +1,105 @@
+import time
+from collections import deque
+
+from .const import BATTERY_TREND_JUMP, BATTERY_TREND_MIN_SPAN, BATTERY_TREND_WINDOW
+
+
+# Least squares fit of a collar's battery percentage over time, across the
+# readings of the last BATTERY_TREND_WINDOW seconds. The fit keeps running
+# sums, so adding a reading and dropping the ones that left the window costs
+# O(1) (amortised) however many readings the window holds.
+#
+# Readings are split into charge and discharge segments: a change of
+# isCharging, or a jump of BATTERY_TREND_JUMP percent against the segment's
+# direction, starts a new fit. Only a discharge segment gives a time to empty.
+class FiBatteryTrend(object):
+    __slots__ = ('_window', '_minSpan', '_readings', '_origin', '_charging',
+        '_n', '_sumX', '_sumY', '_sumXX', '_sumXY')
+
+    def __init__(self, window: float = BATTERY_TREND_WINDOW, minSpan: float = BATTERY_TREND_MIN_SPAN):
+        self._window = window / 3600
+        self._minSpan = minSpan / 3600
+        # (hours since the segment started, percent), oldest first
+        self._readings: deque[tuple[float, float]] = deque()
+        self._origin = 0.0
+        self._charging = False
+        self._reset()
+
+    def _reset(self):
+        self._readings.clear()
+        self._n = 0
+        self._sumX = self._sumY = self._sumXX = self._sumXY = 0.0
+
+    # add a reading. Readings older than the last one are ignored.
+    def add(self, percent: float | None, isCharging: bool | None = None, timestamp: float | None = None):
+        if percent is None:
+            return
+        timestamp = timestamp if timestamp is not None else time.time()
+        charging = bool(isCharging)
+        if self._readings:
+            lastX, lastY = self._readings[-1]
+            if (timestamp - self._origin) / 3600 < lastX:
+                return
+            jump = percent - lastY if not self._charging else lastY - percent
+            if charging != self._charging or jump >= BATTERY_TREND_JUMP:
+                self._reset()
+        if not self._readings:
+            self._origin = timestamp
+            self._charging = charging
+
+        # hours since the segment started keep the sums small and well conditioned
+        x = (timestamp - self._origin) / 3600
+        self._readings.append((x, percent))
+        self._n += 1
+        self._sumX += x
+        self._sumY += percent
+        self._sumXX += x * x
+        self._sumXY += x * percent
+        while self._readings[0][0] < x - self._window:
+            oldX, oldY = self._readings.popleft()
+            self._n -= 1
+            self._sumX -= oldX
+            self._sumY -= oldY
+            self._sumXX -= oldX * oldX
+            self._sumXY -= oldX * oldY
+
+    # percent per hour, negative while discharging. None until two readings
+    # at different times are in the window.
+    @property
+    def slope(self) -> float | None:
+        if self._n < 2:
+            return None
+        denominator = self._n * self._sumXX - self._sumX * self._sumX
+        # guards against readings that only differ by rounding error
+        if denominator <= 1e-9 * self._n * self._sumXX:
+            return None
+        return (self._n * self._sumXY - self._sumX * self._sumY) / denominator
+
+    # seconds covered by the readings in the window
+    @property
+    def span(self) -> float:
+        if not self._readings:
+            return 0.0
+        return (self._readings[-1][0] - self._readings[0][0]) * 3600
+
+    # estimated seconds until the battery is empty, or None while charging,
+    # before the readings span long enough or when it is not draining
+    @property
+    def timeToEmpty(self) -> float | None:
+        if self._charging or self.span < self._minSpan * 3600:
+            return None
+        slope = self.slope
+        if slope is None or slope >= 0:
+            return None
+        # the fitted level at the latest reading, rather than the raw percentage
+        meanX = self._sumX / self._n
+        level = self._sumY / self._n + slope * (self._readings[-1][0] - meanX)
+        return max(level, 0.0) / -slope * 3600
+
+    @property
+    def charging(self) -> bool:
+        return self._charging
+
+    @property
+    def sampleCount(self) -> int:
+        return self._n
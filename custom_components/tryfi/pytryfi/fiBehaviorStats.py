@@ -0,0 +1,69 @@
+from enum import IntEnum
+
+
+class BehaviorPeriod(IntEnum):
+    DAILY = 0
+    WEEKLY = 1
+    MONTHLY = 2
+
+class BehaviorType(IntEnum):
+    BARKING = 0
+    LICKING = 1
+    SCRATCHING = 2
+    EATING = 3
+    DRINKING = 4
+
+class BehaviorMetric(IntEnum):
+    COUNT = 0
+    DURATION = 1
+
+
+# health trends API period / behavior id -> table index
+BEHAVIOR_PERIOD_BY_API = {
+    'DAY': BehaviorPeriod.DAILY,
+    'WEEK': BehaviorPeriod.WEEKLY,
+    'MONTH': BehaviorPeriod.MONTHLY,
+}
+BEHAVIOR_TYPE_BY_API = {
+    'barking': BehaviorType.BARKING,
+    'cleaning_self': BehaviorType.LICKING,
+    'scratching': BehaviorType.SCRATCHING,
+    'eating': BehaviorType.EATING,
+    'drinking': BehaviorType.DRINKING,
+}
+
+_TYPES = len(BehaviorType)
+_METRICS = len(BehaviorMetric)
+_PERIOD_SIZE = _TYPES * _METRICS
+
+
+# Behavior counts (events) and durations (minutes) for every period, stored in
+# one flat period x behavior x metric list.
+class FiBehaviorStats(object):
+    __slots__ = ('_values',)
+
+    def __init__(self):
+        self._values = [0] * (len(BehaviorPeriod) * _PERIOD_SIZE)
+
+    @staticmethod
+    def index(period: BehaviorPeriod, behavior: BehaviorType, metric: BehaviorMetric) -> int:
+        return (period * _TYPES + behavior) * _METRICS + metric
+
+    def get(self, period: BehaviorPeriod, behavior: BehaviorType, metric: BehaviorMetric) -> int:
+        return self._values[(period * _TYPES + behavior) * _METRICS + metric]
+
+    def getAt(self, index: int) -> int:
+        return self._values[index]
+
+    # set the count and duration of one behavior for a period
+    def set(self, period: BehaviorPeriod, behavior: BehaviorType, count: int, duration: int):
+        start = (period * _TYPES + behavior) * _METRICS
+        self._values[start + BehaviorMetric.COUNT] = count
+        self._values[start + BehaviorMetric.DURATION] = duration
+
+    def resetPeriod(self, period: BehaviorPeriod):
+        start = period * _PERIOD_SIZE
+        self._values[start:start + _PERIOD_SIZE] = [0] * _PERIOD_SIZE
+
+    def __str__(self):
+        return f"Behavior Stats: {self._values}"
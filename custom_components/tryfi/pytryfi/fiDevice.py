@@ -1,5 +1,6 @@
 import logging
 import datetime
+from .fiBatteryTrend import FiBatteryTrend
 from .ledColors import ledColors
 from .const import PET_MODE_LOST
 from .common.response_handlers import parse_fi_date
@@ -7,6 +8,15 @@ from .common.response_handlers import parse_fi_date
 LOGGER = logging.getLogger(__name__)
 
 class FiDevice(object):
+    __slots__ = (
+        '_deviceId', '_availableLedColors', '_moduleId', '_buildId',
+        '_batteryPercent', '_isCharging', '_connectedTo', '_connectionSignalStrength',
+        '_temperature', '_nextLocationUpdatedExpectedBy', '_lastUpdated', '_ledOffAt',
+        '_ledOn', '_mode', '_ledColor', '_ledColorHex',
+        '_connectionStateDate', '_connectionStateType', '_batteryHealth',
+        '_ledEnabled', '_rawDetails', '_batteryTrend',
+    )
+
     def __init__(self, deviceId):
         self._deviceId = deviceId
         self._availableLedColors = None
@@ -18,25 +28,42 @@ class FiDevice(object):
         self._connectionSignalStrength = None
         self._temperature = None
         self._nextLocationUpdatedExpectedBy = None
+        self._lastUpdated = None
+        self._ledEnabled = None
+        self._rawDetails = None
+        self._batteryTrend = FiBatteryTrend()
     
-    def setDeviceDetailsJSON(self, deviceJSON: dict):
+    # Returns False, without re-parsing, when the details are identical to the
+    # last ones. The LED state is still re-evaluated as it depends on the time.
+    # Every call adds a battery reading to the battery trend, unchanged or not.
+    def setDeviceDetailsJSON(self, deviceJSON: dict) -> bool:
+        if deviceJSON == self._rawDetails:
+            self._batteryTrend.add(self._batteryPercent, self._isCharging)
+            ledOn = self.getAccurateLEDStatus(self._ledEnabled)
+            changed = ledOn != self._ledOn
+            self._ledOn = ledOn
+            self._lastUpdated = datetime.datetime.now(datetime.timezone.utc)
+            return changed
         self._moduleId = deviceJSON['moduleId']
-        self._buildId = deviceJSON['info']['buildId']
+        info = deviceJSON['info']
+        self._buildId = info['buildId']
         try:
-            self._batteryPercent = int(deviceJSON['info']['batteryPercent'])
+            self._batteryPercent = int(info['batteryPercent'])
         except (ValueError, TypeError):
-            LOGGER.warning("Non-numeric batteryPercent: %s", deviceJSON['info'].get('batteryPercent'))
+            LOGGER.warning("Non-numeric batteryPercent: %s", info.get('batteryPercent'))
             self._batteryPercent = None
         
         #V1 of the collar has this parameter but V2 it is missing
-        if 'isCharging' in deviceJSON['info']:
-            self._isCharging = bool(deviceJSON['info']['isCharging'])
+        if 'isCharging' in info:
+            self._isCharging = bool(info['isCharging'])
         else:
             self._isCharging = None
+        self._batteryTrend.add(self._batteryPercent, self._isCharging)
 
         #self._batteryHealth = deviceJSON['info']['batteryHealth']  
         self._ledOffAt = self.setLedOffAtDate(deviceJSON['operationParams']['ledOffAt'])
-        self._ledOn = self.getAccurateLEDStatus( bool(deviceJSON['operationParams']['ledEnabled']))
+        self._ledEnabled = bool(deviceJSON['operationParams']['ledEnabled'])
+        self._ledOn = self.getAccurateLEDStatus(self._ledEnabled)
         self._mode = deviceJSON['operationParams']['mode']
         self._ledColor = deviceJSON['ledColor']['name']
         self._ledColorHex = deviceJSON['ledColor']['hexCode']
@@ -44,14 +71,16 @@ class FiDevice(object):
         self._connectionStateType = deviceJSON['lastConnectionState']['__typename']
         self._connectedTo = self.setConnectedTo(deviceJSON['lastConnectionState'])
         self._nextLocationUpdatedExpectedBy = parse_fi_date(deviceJSON['nextLocationUpdateExpectedBy'])
-        self._lastUpdated = datetime.datetime.now()
-        if 'temperature' in deviceJSON['info']:
-            self._temperature = float(deviceJSON['info']['temperature']) / 100 # celcius
+        self._lastUpdated = datetime.datetime.now(datetime.timezone.utc)
+        if 'temperature' in info:
+            self._temperature = float(info['temperature']) / 100 # celcius
         if 'availableLedColors' in deviceJSON:
             self._availableLedColors = []
             for cString in deviceJSON['availableLedColors']:
                 c = ledColors(int(cString['ledColorCode']),cString['hexCode'], cString['name'] )
                 self._availableLedColors.append(c)
+        self._rawDetails = deviceJSON
+        return True
 
     def __str__(self):
         return f"Last Updated - {self.lastUpdated} - Device ID: {self.deviceId} Device Mode: {self.mode} Battery Left: {self.batteryPercent}% LED State: {self.ledOn} Last Connected: {self.connectionStateDate} by: {self.connectionStateType}"
@@ -100,6 +129,13 @@ class FiDevice(object):
     def batteryPercent(self) -> int | None:
         return self._batteryPercent
     @property
+    def batteryTrend(self) -> FiBatteryTrend:
+        return self._batteryTrend
+    # estimated seconds until the battery is empty, None while unknown
+    @property
+    def batteryTimeToEmpty(self) -> float | None:
+        return self._batteryTrend.timeToEmpty
+    @property
     def temperature(self):
         return self._temperature
     #This was deprecated in the newer collars
@@ -167,4 +203,4 @@ class FiDevice(object):
             return datetime.datetime.now(datetime.timezone.utc)
         else:
             LOGGER.debug(f"LedOffAt has date/time of {ledOffAt}. Returning this in ISO Format.")
-            return datetime.datetime.fromisoformat(str(ledOffAt).replace('Z', '+00:00'))
\ No newline at end of file
+            return parse_fi_date(str(ledOffAt))
\ No newline at end of file
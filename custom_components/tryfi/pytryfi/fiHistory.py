@@ -0,0 +1,110 @@
+import datetime
+from collections.abc import Callable, Iterator
+from typing import Any, NamedTuple
+
+from .const import HISTORY_PAGE_SIZE
+
+
+class FiActivitySummary(NamedTuple):
+    start: datetime.datetime
+    end: datetime.datetime
+    steps: int | None
+    distance: float | None # metres
+    stepGoal: int | None
+
+
+# one page of a feed: its parsed records, the cursor to resume from once
+# they are consumed and whether it is the last page
+class FiFeedPage(NamedTuple):
+    records: list
+    cursor: str | None
+    last: bool
+
+
+class FiRestSummary(NamedTuple):
+    start: datetime.datetime
+    end: datetime.datetime
+    sleep: int | None # seconds
+    nap: int | None # seconds
+
+
+# Each summary's dates are parsed only once, so they bypass the parse_fi_date
+# cache: a backfill of hundreds of one-off dates would evict the timestamps
+# that repeat on every poll.
+def parseActivitySummary(summaryJSON: dict) -> FiActivitySummary:
+    return FiActivitySummary(
+        datetime.datetime.fromisoformat(summaryJSON['start']),
+        datetime.datetime.fromisoformat(summaryJSON['end']),
+        summaryJSON.get('totalSteps'),
+        summaryJSON.get('totalDistance'),
+        summaryJSON.get('stepGoal'),
+    )
+
+
+def parseRestSummary(summaryJSON: dict) -> FiRestSummary:
+    sleep = nap = None
+    sleepAmounts = (summaryJSON.get('data') or {}).get('sleepAmounts')
+    if sleepAmounts is not None:
+        sleep = nap = 0
+        for sleepAmount in sleepAmounts:
+            if sleepAmount['type'] == 'SLEEP':
+                sleep = int(sleepAmount['duration'])
+            if sleepAmount['type'] == 'NAP':
+                nap = int(sleepAmount['duration'])
+    return FiRestSummary(
+        datetime.datetime.fromisoformat(summaryJSON['start']),
+        datetime.datetime.fromisoformat(summaryJSON['end']),
+        sleep,
+        nap,
+    )
+
+
+# Walks a cursor paginated summary feed one page at a time, so only a single
+# page of records is ever held in memory. fetchPage(cursor, limit) returns the
+# feed object (the records under recordsKey and the next page's cursor).
+#
+# cursor is where to resume: it only moves on once every record of a page has
+# been consumed, so a stored cursor never skips records. Restarting from it
+# may repeat records of a partly consumed page.
+class FiFeedPaginator(object):
+    __slots__ = ('_fetchPage', '_parse', '_recordsKey', '_cursor', '_pageSize', '_exhausted', '_pages')
+
+    def __init__(self, fetchPage: Callable[[str | None, int], dict], parse: Callable[[dict], Any],
+            recordsKey: str, cursor: str | None = None, pageSize: int = HISTORY_PAGE_SIZE):
+        self._fetchPage = fetchPage
+        self._parse = parse
+        self._recordsKey = recordsKey
+        self._cursor = cursor
+        self._pageSize = pageSize
+        self._exhausted = False
+        self._pages = 0
+
+    # each page in turn. Consumers that store their progress should store the
+    # page's cursor once they are done with its records.
+    def pages(self) -> Iterator[FiFeedPage]:
+        while not self._exhausted:
+            feed = self._fetchPage(self._cursor, self._pageSize) or {}
+            records = feed.get(self._recordsKey) or []
+            nextCursor = feed.get('cursor')
+            # an empty page or a cursor that does not move marks the end
+            last = not records or not nextCursor or nextCursor == self._cursor
+            yield FiFeedPage([self._parse(recordJSON) for recordJSON in records], nextCursor, last)
+            self._pages += 1
+            self._exhausted = last
+            self._cursor = nextCursor
+
+    def __iter__(self) -> Iterator:
+        for page in self.pages():
+            yield from page.records
+
+    @property
+    def cursor(self) -> str | None:
+        return self._cursor
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    @property
+    def pageCount(self) -> int:
+        return self._pages
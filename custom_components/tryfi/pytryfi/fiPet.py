@@ -1,14 +1,35 @@
 import datetime
+from collections.abc import Callable
 import logging
 import requests
 from .common import query
-from .const import PET_ACTIVITY_ONGOINGWALK
+from .const import PET_ACTIVITY_ONGOINGWALK, STATS_REFRESH_INTERVAL
+from .fiBehaviorStats import BEHAVIOR_PERIOD_BY_API, BEHAVIOR_TYPE_BY_API, BehaviorMetric, BehaviorPeriod, BehaviorType, FiBehaviorStats
 from .fiDevice import FiDevice
+from .fiWalkTrack import FiWalkTrack
 from .common.response_handlers import parse_fi_date
+from .common.scheduler import schedulerFor
 
 LOGGER = logging.getLogger(__name__)
 
 class FiPet(object):
+    __slots__ = (
+        '_petId', '_name', '_homeCityState', '_yearOfBirth',
+        '_monthOfBirth', '_dayOfBirth', '_gender', '_weight',
+        '_breed', '_photoLink', '_device', '_currPlaceName',
+        '_currPlaceAddress', '_currLatitude', '_currLongitude', '_currStartTime',
+        '_activityType', '_areaName', '_posAccuracy', '_locationLastUpdate',
+        '_lastUpdated', '_fieldLastUpdated', '_dailySteps', '_dailyGoal',
+        '_dailyTotalDistance', '_weeklySteps', '_weeklyGoal', '_weeklyTotalDistance',
+        '_monthlySteps', '_monthlyGoal', '_monthlyTotalDistance', '_dailySleep',
+        '_dailyNap', '_weeklySleep', '_weeklyNap', '_monthlySleep',
+        '_monthlyNap', '_updateSuccessCount', '_updateFailureCount', '_consecutiveUpdateFailures',
+        '_lastUpdateError',
+        '_behaviorStats', '_walkTrack', '_statsActivityType',
+        # raw API sub-documents from the last parse, to skip unchanged ones
+        '_rawActivity', '_rawStats', '_rawSleep', '_rawBehavior',
+    )
+
     def __init__(self, petId):
         self._petId = petId
         self._name = None
@@ -23,42 +44,24 @@ class FiPet(object):
         self._lastUpdated = None
         self._locationLastUpdate = None
         self._posAccuracy = None
+        self._activityType = None
+        # the activity type when the step and sleep totals were last fetched
+        self._statsActivityType = None
+        # when each group of fields was last refreshed, so stale values can be spotted
+        self._fieldLastUpdated = {}
+        self._updateSuccessCount = 0
+        self._updateFailureCount = 0
+        self._consecutiveUpdateFailures = 0
+        self._lastUpdateError = None
         
-        # Initialize behavior metrics (Series 3+ only)
-        self._dailyBarkingCount = 0
-        self._dailyBarkingDuration = 0
-        self._weeklyBarkingCount = 0
-        self._weeklyBarkingDuration = 0
-        self._monthlyBarkingCount = 0
-        self._monthlyBarkingDuration = 0
-        
-        self._dailyLickingCount = 0
-        self._dailyLickingDuration = 0
-        self._weeklyLickingCount = 0
-        self._weeklyLickingDuration = 0
-        self._monthlyLickingCount = 0
-        self._monthlyLickingDuration = 0
-        
-        self._dailyScratchingCount = 0
-        self._dailyScratchingDuration = 0
-        self._weeklyScratchingCount = 0
-        self._weeklyScratchingDuration = 0
-        self._monthlyScratchingCount = 0
-        self._monthlyScratchingDuration = 0
-        
-        self._dailyEatingCount = 0
-        self._dailyEatingDuration = 0
-        self._weeklyEatingCount = 0
-        self._weeklyEatingDuration = 0
-        self._monthlyEatingCount = 0
-        self._monthlyEatingDuration = 0
-        
-        self._dailyDrinkingCount = 0
-        self._dailyDrinkingDuration = 0
-        self._weeklyDrinkingCount = 0
-        self._weeklyDrinkingDuration = 0
-        self._monthlyDrinkingCount = 0
-        self._monthlyDrinkingDuration = 0
+        # behavior metrics (Series 3+ only)
+        self._behaviorStats = FiBehaviorStats()
+        self._walkTrack = FiWalkTrack()
+
+        self._rawActivity = None
+        self._rawStats = None
+        self._rawSleep = None
+        self._rawBehavior = {}
 
     def setPetDetailsJSON(self, petJSON: dict):
         self._name = petJSON.get('name')
@@ -74,21 +77,29 @@ class FiPet(object):
         except Exception:
             LOGGER.warning("Cannot find photo of your pet. Defaulting to empty string.")
             self._photoLink = ""
-        self._device = FiDevice(petJSON['device']['id'])
+        # keep the same device object across refreshes unless the collar changed
+        if self._device is None or self._device.deviceId != petJSON['device']['id']:
+            self._device = FiDevice(petJSON['device']['id'])
         self._device.setDeviceDetailsJSON(petJSON['device'])
-        self._lastUpdated = datetime.datetime.now()
+        self._lastUpdated = datetime.datetime.now(datetime.timezone.utc)
 
     def __str__(self):
         return f"Last Updated - {self.lastUpdated} - Pet ID: {self.petId} Name: {self.name} Is Lost: {self.isLost} From: {self.homeCityState} ActivityType: {self.activityType} Located: {self.currLatitude},{self.currLongitude} Last Updated: {self.currStartTime}\n \
             using Device/Collar: {self._device}"
     
-    # set the Pet's current location details
-    def setCurrentLocation(self, activityJSON):
+    # set the Pet's current location details. Returns False, without re-parsing,
+    # when the activity is identical to the last one.
+    def setCurrentLocation(self, activityJSON) -> bool:
+        if activityJSON == self._rawActivity:
+            self._fieldLastUpdated['location'] = datetime.datetime.now(datetime.timezone.utc)
+            return False
         activityType = activityJSON['__typename']
         self._activityType = activityType
         self._areaName = activityJSON['areaName']
         self._locationLastUpdate = parse_fi_date(activityJSON['lastReportTimestamp'])
+        self._currStartTime = parse_fi_date(activityJSON['start'])
         if activityType == PET_ACTIVITY_ONGOINGWALK:
+            self._walkTrack.merge(self._currStartTime, activityJSON['positions'])
             currentLocation = activityJSON['positions'][-1]
             self._posAccuracy = currentLocation['errorRadius'] if 'errorRadius' in currentLocation else None
             currentPosition = currentLocation['position']
@@ -101,7 +112,6 @@ class FiPet(object):
 
         self._currLongitude = currentPosition['longitude']
         self._currLatitude = currentPosition['latitude']
-        self._currStartTime = datetime.datetime.fromisoformat(activityJSON['start'].replace('Z', '+00:00'))
 
         if 'place' in activityJSON and activityJSON['place'] is not None:
             self._currPlaceName = activityJSON['place']['name']
@@ -109,11 +119,18 @@ class FiPet(object):
         else:
             self._currPlaceName = None
             self._currPlaceAddress = None
-        self._lastUpdated = datetime.datetime.now()
+        self._lastUpdated = datetime.datetime.now(datetime.timezone.utc)
+        self._fieldLastUpdated['location'] = self._lastUpdated
+        self._rawActivity = activityJSON
+        return True
 
     # set the Pet's current steps, goals and distance details for daily, weekly and monthly
-    def setStats(self, activityJSONDaily, activityJSONWeekly, activityJSONMonthly):
-            #distance is in metres
+    def setStats(self, activityJSONDaily, activityJSONWeekly, activityJSONMonthly) -> bool:
+        raw = (activityJSONDaily, activityJSONWeekly, activityJSONMonthly)
+        if raw == self._rawStats:
+            self._fieldLastUpdated['stats'] = datetime.datetime.now(datetime.timezone.utc)
+            return False
+        #distance is in metres
         self._dailyGoal = int(activityJSONDaily['stepGoal'])
         self._dailySteps = int(activityJSONDaily['totalSteps'])
         self._dailyTotalDistance = float(activityJSONDaily['totalDistance'])
@@ -126,7 +143,10 @@ class FiPet(object):
             self._monthlySteps = int(activityJSONMonthly['totalSteps'])
             self._monthlyTotalDistance = float(activityJSONMonthly['totalDistance'])
 
-        self._lastUpdated = datetime.datetime.now()
+        self._lastUpdated = datetime.datetime.now(datetime.timezone.utc)
+        self._fieldLastUpdated['stats'] = self._lastUpdated
+        self._rawStats = raw
+        return True
 
     # Update the Stats of the pet
     def updateStats(self, sessionId: requests.Session):
@@ -155,9 +175,7 @@ class FiPet(object):
     def updateRestStats(self, sessionId: requests.Session):
         try:
             pRestStatsJSON = query.getCurrentPetRestStats(sessionId,self.petId)
-            self._dailySleep, self._dailyNap = self._extractSleep(pRestStatsJSON['dailyStat'])
-            self._weeklySleep, self._weeklyNap = self._extractSleep(pRestStatsJSON['weeklyStat'])
-            self._monthlySleep, self._monthlyNap = self._extractSleep(pRestStatsJSON['monthlyStat'])
+            self.setSleep(pRestStatsJSON['dailyStat'], pRestStatsJSON['weeklyStat'], pRestStatsJSON['monthlyStat'])
             return True
         except Exception as e:
             LOGGER.error(f"Could not update rest stats for Pet {self.name}\n{pRestStatsJSON}.\n{e}", exc_info=True)
@@ -183,35 +201,73 @@ class FiPet(object):
             LOGGER.error(f"Could not update Device/Collar information for Pet: {self.name}\n{e}")
             return False
 
-    # Update all details regarding this pet
-    def updateAllDetails(self, session: requests.Session):
+    # set daily, weekly and monthly sleep and nap totals. Returns False when unchanged.
+    def setSleep(self, sleepJSONDaily, sleepJSONWeekly, sleepJSONMonthly) -> bool:
+        raw = (sleepJSONDaily, sleepJSONWeekly, sleepJSONMonthly)
+        self._fieldLastUpdated['sleep'] = datetime.datetime.now(datetime.timezone.utc)
+        if raw == self._rawSleep:
+            return False
+        self._dailySleep, self._dailyNap = self._extractSleep(sleepJSONDaily)
+        self._weeklySleep, self._weeklyNap = self._extractSleep(sleepJSONWeekly)
+        self._monthlySleep, self._monthlyNap = self._extractSleep(sleepJSONMonthly)
+        self._rawSleep = raw
+        return True
+
+    # Update location, device, step and sleep details in a single request.
+    # Without includeStats the step and sleep totals are left out of the
+    # request. Returns whether anything changed since the last update.
+    def updateCoreDetails(self, session: requests.Session, includeStats: bool = True) -> bool:
+        if not includeStats:
+            petJson = query.getPetLiveInfo(session, self.petId)
+            changed = self.device.setDeviceDetailsJSON(petJson['device'])
+            changed |= self.setCurrentLocation(petJson['ongoingActivity'])
+            return changed
         petJson = query.getPetAllInfo(session, self.petId)
-        self.device.setDeviceDetailsJSON(petJson['device'])
-        self.setCurrentLocation(petJson['ongoingActivity'])
-        self.setStats(petJson['dailyStepStat'], petJson['weeklyStepStat'], petJson['monthlyStepStat'])
-        self._dailySleep, self._dailyNap = self._extractSleep(petJson['dailySleepStat'])
-        self._weeklySleep, self._weeklyNap = self._extractSleep(petJson['weeklySleepStat'])
-        self._monthlySleep, self._monthlyNap = self._extractSleep(petJson['monthlySleepStat'])
+        changed = self.device.setDeviceDetailsJSON(petJson['device'])
+        changed |= self.setCurrentLocation(petJson['ongoingActivity'])
+        changed |= self.setStats(petJson['dailyStepStat'], petJson['weeklyStepStat'], petJson['monthlyStepStat'])
+        changed |= self.setSleep(petJson['dailySleepStat'], petJson['weeklySleepStat'], petJson['monthlySleepStat'])
+        self._statsActivityType = self._activityType
+        return changed
+
+    # whether the step and sleep totals should be fetched again: they never
+    # were, are older than maxAge seconds or the pet's activity type changed
+    # since. Period boundaries (midnight) are for the caller to request, as
+    # only it knows the local time zone.
+    def statsDue(self, maxAge: float = STATS_REFRESH_INTERVAL) -> bool:
+        age = self.fieldAge('stats')
+        return age is None or age >= maxAge or self._activityType != self._statsActivityType
+
+    # Update all details regarding this pet. Returns whether anything changed.
+    def updateAllDetails(self, session: requests.Session) -> bool:
+        changed = self.updateCoreDetails(session)
 
         if self.device.supportsAdvancedBehaviorStats():
             # Try to fetch behavior data for Series 3+ collars
             try:
-                self.updateBehaviorStats(session)
+                changed |= self.updateBehaviorStats(session)
             except Exception as e:
                 LOGGER.warning(f"Could not update behavior stats for Pet {self.name}.\n{e}")
                 # Behavior stats may not be available for older collars
                 pass
+        return changed
 
-    # Update behavior stats for Series 3+ collars
-    def updateBehaviorStats(self, sessionId: requests.Session):
+    # Update behavior stats for Series 3+ collars. checkpoint, if given, is
+    # called before each request and may raise to stop the update.
+    def updateBehaviorStats(self, sessionId: requests.Session, checkpoint: Callable[[], None] | None = None) -> bool:
         """Update behavior statistics for Series 3+ collars."""
+        changed = False
         for period in ['DAY', 'WEEK', 'MONTH']:
+            if checkpoint is not None:
+                checkpoint()
             try:
                 healthTrendsJSON = query.getPetHealthTrends(sessionId, self.petId, period)
                 behavior_trends = healthTrendsJSON.get('behaviorTrends', [])
-                self.setBehaviorStatsFromTrends(behavior_trends, period)
+                changed |= self.setBehaviorStatsFromTrends(behavior_trends, period)
+                self._fieldLastUpdated['behavior'] = datetime.datetime.now(datetime.timezone.utc)
             except Exception as e:
                 LOGGER.warning(f"Could not fetch {period} behavior trends for {self.name}: {e}")
+        return changed
 
     def _parseBehaviorDuration(self, input: str) -> int:
         # examples: '1hr 5min', '46min', '1.5hr', '<1min', '10.1'
@@ -234,28 +290,13 @@ class FiPet(object):
         else:
             return round(float(input))
 
-    def setBehaviorStatsFromTrends(self, behaviorTrends, period: str = 'DAY'):
-        """Parse behavior data from health trends API."""
-        PERIOD_PREFIX_MAP = {
-            'DAY': 'daily',
-            'WEEK': 'weekly',
-            'MONTH': 'monthly',
-        }
-        prefix = PERIOD_PREFIX_MAP.get(period, 'daily')
-
-        # Map from API behavior id prefix to our attribute name fragment
-        BEHAVIOR_MAP = {
-            'barking': 'Barking',
-            'cleaning_self': 'Licking',
-            'scratching': 'Scratching',
-            'eating': 'Eating',
-            'drinking': 'Drinking',
-        }
-
-        # Reset metrics for this period
-        for attr_suffix in BEHAVIOR_MAP.values():
-            setattr(self, f'_{prefix}{attr_suffix}Count', 0)
-            setattr(self, f'_{prefix}{attr_suffix}Duration', 0)
+    def setBehaviorStatsFromTrends(self, behaviorTrends, period: str = 'DAY') -> bool:
+        """Parse behavior data from health trends API. Returns False when unchanged."""
+        periodIndex = BEHAVIOR_PERIOD_BY_API.get(period, BehaviorPeriod.DAILY)
+        if behaviorTrends == self._rawBehavior.get(periodIndex):
+            return False
+        self._rawBehavior[periodIndex] = behaviorTrends
+        self._behaviorStats.resetPeriod(periodIndex)
 
         for trend in behaviorTrends:
             if not isinstance(trend, dict):
@@ -282,17 +323,18 @@ class FiPet(object):
 
             # Parse the behavior type from the trend_id (e.g., "barking:DAY" -> "barking")
             behavior_key = trend_id.split(':')[0] if ':' in trend_id else trend_id
-            attr_suffix = BEHAVIOR_MAP.get(behavior_key)
-            if attr_suffix:
-                setattr(self, f'_{prefix}{attr_suffix}Count', events_count)
-                setattr(self, f'_{prefix}{attr_suffix}Duration', duration_minutes)
+            behavior = BEHAVIOR_TYPE_BY_API.get(behavior_key)
+            if behavior is not None:
+                self._behaviorStats.set(periodIndex, behavior, events_count, duration_minutes)
+        return True
 
     # set the color code of the led light on the pet collar
     def setLedColorCode(self, session: requests.Session, colorCode):
         try:
             moduleId = self.device.moduleId
             ledColorCode = int(colorCode)
-            setColorJSON = query.setLedColor(session, moduleId, ledColorCode)
+            with schedulerFor(session).interactive():
+                setColorJSON = query.setLedColor(session, moduleId, ledColorCode)
             try:
                 self.device.setDeviceDetailsJSON(setColorJSON['setDeviceLed'])
             except Exception as e:
@@ -306,7 +348,8 @@ class FiPet(object):
     def turnOnOffLed(self, sessionId, action):
         try:
             moduleId = self.device.moduleId
-            onOffResponse = query.turnOnOffLed(sessionId, moduleId, action)
+            with schedulerFor(sessionId).interactive():
+                onOffResponse = query.turnOnOffLed(sessionId, moduleId, action)
             try:
                 self.device.setDeviceDetailsJSON(onOffResponse['updateDeviceOperationParams'])
             except Exception:
@@ -320,7 +363,9 @@ class FiPet(object):
     def setLostDogMode(self, sessionId, action):
         try:
             moduleId = self.device.moduleId
-            petModeResponse = query.setLostDogMode(sessionId, moduleId, action)
+            # finding a lost dog matters more than finishing the current poll
+            with schedulerFor(sessionId).interactive(cancelBackground=True):
+                petModeResponse = query.setLostDogMode(sessionId, moduleId, action)
             try:
                 self.device.setDeviceDetailsJSON(petModeResponse['updateDeviceOperationParams'])
             except Exception:
@@ -375,6 +420,10 @@ class FiPet(object):
     @property
     def currStartTime(self):
         return self._currStartTime
+    # the positions of the ongoing walk, or None while the pet is resting
+    @property
+    def walkTrack(self) -> FiWalkTrack | None:
+        return self._walkTrack if self._activityType == PET_ACTIVITY_ONGOINGWALK else None
     @property
     def currPlaceName(self):
         return self._currPlaceName
@@ -438,6 +487,44 @@ class FiPet(object):
     @property
     def lastUpdated(self):
         return self._lastUpdated
+
+    # when a group of fields ('location', 'device', 'stats', 'sleep' or 'behavior')
+    # was last refreshed, or None if it never has been
+    def fieldLastUpdated(self, field: str) -> datetime.datetime | None:
+        if field == 'device':
+            return self._device.lastUpdated if self._device is not None else None
+        return self._fieldLastUpdated.get(field)
+
+    # seconds since a group of fields was last refreshed
+    def fieldAge(self, field: str) -> float | None:
+        updated = self.fieldLastUpdated(field)
+        if updated is None:
+            return None
+        return (datetime.datetime.now(datetime.timezone.utc) - updated).total_seconds()
+
+    def recordUpdateSuccess(self):
+        self._updateSuccessCount += 1
+        self._consecutiveUpdateFailures = 0
+        self._lastUpdateError = None
+
+    def recordUpdateFailure(self, error: Exception):
+        self._updateFailureCount += 1
+        self._consecutiveUpdateFailures += 1
+        self._lastUpdateError = f"{type(error).__name__}: {error}"
+
+    @property
+    def updateSuccessCount(self) -> int:
+        return self._updateSuccessCount
+    @property
+    def updateFailureCount(self) -> int:
+        return self._updateFailureCount
+    @property
+    def consecutiveUpdateFailures(self) -> int:
+        return self._consecutiveUpdateFailures
+    @property
+    def lastUpdateError(self) -> str | None:
+        return self._lastUpdateError
+
     @property
     def isLost(self):
         return self.device.isLost
@@ -492,98 +579,102 @@ class FiPet(object):
         return self.monthlyTotalDistance
     
     # Behavior properties (Series 3+ only)
+    @property
+    def behaviorStats(self) -> FiBehaviorStats:
+        return self._behaviorStats
+
     @property
     def dailyBarkingCount(self):
-        return self._dailyBarkingCount
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.BARKING, BehaviorMetric.COUNT)
     @property
     def dailyBarkingDuration(self):
-        return self._dailyBarkingDuration
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.BARKING, BehaviorMetric.DURATION)
     @property
     def weeklyBarkingCount(self):
-        return self._weeklyBarkingCount
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.BARKING, BehaviorMetric.COUNT)
     @property
     def weeklyBarkingDuration(self):
-        return self._weeklyBarkingDuration
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.BARKING, BehaviorMetric.DURATION)
     @property
     def monthlyBarkingCount(self):
-        return self._monthlyBarkingCount
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.BARKING, BehaviorMetric.COUNT)
     @property
     def monthlyBarkingDuration(self):
-        return self._monthlyBarkingDuration
-    
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.BARKING, BehaviorMetric.DURATION)
+
     @property
     def dailyLickingCount(self):
-        return self._dailyLickingCount
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.LICKING, BehaviorMetric.COUNT)
     @property
     def dailyLickingDuration(self):
-        return self._dailyLickingDuration
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.LICKING, BehaviorMetric.DURATION)
     @property
     def weeklyLickingCount(self):
-        return self._weeklyLickingCount
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.LICKING, BehaviorMetric.COUNT)
     @property
     def weeklyLickingDuration(self):
-        return self._weeklyLickingDuration
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.LICKING, BehaviorMetric.DURATION)
     @property
     def monthlyLickingCount(self):
-        return self._monthlyLickingCount
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.LICKING, BehaviorMetric.COUNT)
     @property
     def monthlyLickingDuration(self):
-        return self._monthlyLickingDuration
-    
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.LICKING, BehaviorMetric.DURATION)
+
     @property
     def dailyScratchingCount(self):
-        return self._dailyScratchingCount
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.SCRATCHING, BehaviorMetric.COUNT)
     @property
     def dailyScratchingDuration(self):
-        return self._dailyScratchingDuration
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.SCRATCHING, BehaviorMetric.DURATION)
     @property
     def weeklyScratchingCount(self):
-        return self._weeklyScratchingCount
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.SCRATCHING, BehaviorMetric.COUNT)
     @property
     def weeklyScratchingDuration(self):
-        return self._weeklyScratchingDuration
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.SCRATCHING, BehaviorMetric.DURATION)
     @property
     def monthlyScratchingCount(self):
-        return self._monthlyScratchingCount
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.SCRATCHING, BehaviorMetric.COUNT)
     @property
     def monthlyScratchingDuration(self):
-        return self._monthlyScratchingDuration
-    
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.SCRATCHING, BehaviorMetric.DURATION)
+
     @property
     def dailyEatingCount(self):
-        return self._dailyEatingCount
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.EATING, BehaviorMetric.COUNT)
     @property
     def dailyEatingDuration(self):
-        return self._dailyEatingDuration
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.EATING, BehaviorMetric.DURATION)
     @property
     def weeklyEatingCount(self):
-        return self._weeklyEatingCount
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.EATING, BehaviorMetric.COUNT)
     @property
     def weeklyEatingDuration(self):
-        return self._weeklyEatingDuration
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.EATING, BehaviorMetric.DURATION)
     @property
     def monthlyEatingCount(self):
-        return self._monthlyEatingCount
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.EATING, BehaviorMetric.COUNT)
     @property
     def monthlyEatingDuration(self):
-        return self._monthlyEatingDuration
-    
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.EATING, BehaviorMetric.DURATION)
+
     @property
     def dailyDrinkingCount(self):
-        return self._dailyDrinkingCount
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.DRINKING, BehaviorMetric.COUNT)
     @property
     def dailyDrinkingDuration(self):
-        return self._dailyDrinkingDuration
+        return self._behaviorStats.get(BehaviorPeriod.DAILY, BehaviorType.DRINKING, BehaviorMetric.DURATION)
     @property
     def weeklyDrinkingCount(self):
-        return self._weeklyDrinkingCount
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.DRINKING, BehaviorMetric.COUNT)
     @property
     def weeklyDrinkingDuration(self):
-        return self._weeklyDrinkingDuration
+        return self._behaviorStats.get(BehaviorPeriod.WEEKLY, BehaviorType.DRINKING, BehaviorMetric.DURATION)
     @property
     def monthlyDrinkingCount(self):
-        return self._monthlyDrinkingCount
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.DRINKING, BehaviorMetric.COUNT)
     @property
     def monthlyDrinkingDuration(self):
-        return self._monthlyDrinkingDuration
+        return self._behaviorStats.get(BehaviorPeriod.MONTHLY, BehaviorType.DRINKING, BehaviorMetric.DURATION)
         
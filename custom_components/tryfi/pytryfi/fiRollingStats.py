@@ -0,0 +1,176 @@
+import datetime
+import math
+from collections import deque
+from typing import NamedTuple
+
+from .const import ROLLING_WINDOWS
+
+ROLLING_METRIC_STEPS = 'steps'
+ROLLING_METRIC_SLEEP = 'sleep'
+ROLLING_METRICS = (ROLLING_METRIC_STEPS, ROLLING_METRIC_SLEEP)
+
+
+# a pet's totals for one day, as last seen before it rolled over
+class FiDailyTotals(NamedTuple):
+    day: datetime.date
+    steps: int | None
+    stepGoal: int | None
+    sleep: int | None # seconds
+
+
+# Mean, standard deviation, minimum, maximum and goal completion of one metric
+# over the last `days` days. The mean and variance are kept with Welford's
+# method, which also allows removing the day that leaves the window; the
+# minimum and maximum are kept in monotonic queues. Adding a day costs O(1)
+# (amortised) whatever the window's length.
+class FiRollingWindow(object):
+    __slots__ = ('_days', '_values', '_mean', '_m2', '_minQueue', '_maxQueue', '_goalDays', '_goalMet')
+
+    def __init__(self, days: int):
+        self._days = days
+        # (day ordinal, value, goal met) oldest first
+        self._values: deque[tuple[int, float, bool | None]] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        # (day ordinal, value) with increasing (min) and decreasing (max) values
+        self._minQueue: deque[tuple[int, float]] = deque()
+        self._maxQueue: deque[tuple[int, float]] = deque()
+        self._goalDays = 0
+        self._goalMet = 0
+
+    # add a day's value. Days must be added in order; an earlier or repeated
+    # day, or a missing value, is ignored.
+    def add(self, day: datetime.date, value: float | None, goalMet: bool | None = None):
+        ordinal = day.toordinal()
+        if value is None or (self._values and ordinal <= self._values[-1][0]):
+            return
+        cutoff = ordinal - self._days
+        while self._values and self._values[0][0] <= cutoff:
+            self._remove(*self._values.popleft())
+        while self._minQueue and self._minQueue[0][0] <= cutoff:
+            self._minQueue.popleft()
+        while self._maxQueue and self._maxQueue[0][0] <= cutoff:
+            self._maxQueue.popleft()
+
+        self._values.append((ordinal, value, goalMet))
+        delta = value - self._mean
+        self._mean += delta / len(self._values)
+        self._m2 += delta * (value - self._mean)
+        while self._minQueue and self._minQueue[-1][1] >= value:
+            self._minQueue.pop()
+        self._minQueue.append((ordinal, value))
+        while self._maxQueue and self._maxQueue[-1][1] <= value:
+            self._maxQueue.pop()
+        self._maxQueue.append((ordinal, value))
+        if goalMet is not None:
+            self._goalDays += 1
+            self._goalMet += goalMet
+
+    def _remove(self, ordinal: int, value: float, goalMet: bool | None):
+        count = len(self._values)
+        if count == 0:
+            self._mean = self._m2 = 0.0
+        else:
+            delta = value - self._mean
+            self._mean -= delta / count
+            # rounding can leave a tiny negative remainder
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+        if goalMet is not None:
+            self._goalDays -= 1
+            self._goalMet -= goalMet
+
+    @property
+    def days(self) -> int:
+        return self._days
+    @property
+    def count(self) -> int:
+        return len(self._values)
+    @property
+    def mean(self) -> float | None:
+        return self._mean if self._values else None
+    # sample standard deviation, None until two days are in the window
+    @property
+    def stddev(self) -> float | None:
+        if len(self._values) < 2:
+            return None
+        return math.sqrt(self._m2 / (len(self._values) - 1))
+    @property
+    def min(self) -> float | None:
+        return self._minQueue[0][1] if self._minQueue else None
+    @property
+    def max(self) -> float | None:
+        return self._maxQueue[0][1] if self._maxQueue else None
+    # share of the days with a goal on which it was met
+    @property
+    def goalRate(self) -> float | None:
+        return self._goalMet / self._goalDays if self._goalDays else None
+
+
+# Rolling aggregates of a pet's daily steps and sleep over several windows.
+# The caller observes the pet's running daily totals on every update; when the
+# day rolls over, the last totals seen for the previous day are added to every
+# window. The completed days of the longest window are kept so the aggregates
+# can be saved with asDict() and rebuilt with fromDict().
+class FiRollingStats(object):
+    __slots__ = ('_windows', '_history', '_current')
+
+    def __init__(self, windows: tuple[int, ...] = ROLLING_WINDOWS):
+        self._windows = {
+            metric: {days: FiRollingWindow(days) for days in windows}
+            for metric in ROLLING_METRICS
+        }
+        self._history: deque[FiDailyTotals] = deque()
+        self._current: FiDailyTotals | None = None
+
+    # record the running totals of a day. Returns whether a previous day was
+    # completed and added to the windows.
+    def observe(self, totals: FiDailyTotals) -> bool:
+        current = self._current
+        if current is not None and totals.day < current.day:
+            return False
+        self._current = totals
+        if current is None or totals.day == current.day:
+            return False
+        self._complete(current)
+        return True
+
+    def _complete(self, totals: FiDailyTotals):
+        self._history.append(totals)
+        longest = max(self.windowDays, default=0)
+        while self._history and self._history[0].day.toordinal() <= totals.day.toordinal() - longest:
+            self._history.popleft()
+        goalMet = None
+        if totals.steps is not None and totals.stepGoal:
+            goalMet = totals.steps >= totals.stepGoal
+        for window in self._windows[ROLLING_METRIC_STEPS].values():
+            window.add(totals.day, totals.steps, goalMet)
+        for window in self._windows[ROLLING_METRIC_SLEEP].values():
+            window.add(totals.day, totals.sleep)
+
+    def window(self, metric: str, days: int) -> FiRollingWindow:
+        return self._windows[metric][days]
+
+    @property
+    def windowDays(self) -> tuple[int, ...]:
+        return tuple(self._windows[ROLLING_METRIC_STEPS])
+
+    def asDict(self) -> dict:
+        def totalsList(totals: FiDailyTotals) -> list:
+            return [totals.day.isoformat(), totals.steps, totals.stepGoal, totals.sleep]
+        return {
+            'current': totalsList(self._current) if self._current is not None else None,
+            'history': [totalsList(totals) for totals in self._history],
+        }
+
+    # rebuild the aggregates from asDict() output, for the given windows. Days
+    # beyond what was kept for the previous longest window are not recovered.
+    @classmethod
+    def fromDict(cls, data: dict, windows: tuple[int, ...] = ROLLING_WINDOWS) -> "FiRollingStats":
+        def parseTotals(values: list) -> FiDailyTotals:
+            return FiDailyTotals(datetime.date.fromisoformat(values[0]), *values[1:])
+        stats = cls(windows)
+        for values in data.get('history') or []:
+            stats._complete(parseTotals(values))
+        if data.get('current'):
+            stats._current = parseTotals(data['current'])
+        return stats
@@ -0,0 +1,174 @@
+import contextlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from .const import TELEMETRY_QUERY_CHUNK_SIZE
+
+LOGGER = logging.getLogger(__name__)
+
+TELEMETRY_SCHEMA_VERSION = 1
+
+
+class FiTelemetrySample(NamedTuple):
+    petId: str
+    timestamp: float # seconds since the epoch
+    latitude: float | None
+    longitude: float | None
+    batteryPercent: int | None
+    connectionState: str | None
+    activityType: str | None
+
+
+# Append-only SQLite store of pet telemetry: position, battery, connection
+# state and activity type. Samples are buffered by record() and written in one
+# transaction by flush(), so a poll cycle costs a single commit however many
+# pets it updated. A sample identical to the pet's previous one (apart from its
+# time) is not stored.
+#
+# Rows are keyed and clustered on (petId, timestamp), so range queries for a
+# pet read one contiguous stretch of the table. The database is opened in WAL
+# mode: readers do not block the writer. Safe to share between threads.
+class FiTelemetryStore(object):
+    __slots__ = ('_path', '_connection', '_lock', '_pending', '_last')
+
+    def __init__(self, path: str):
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._pending: list[FiTelemetrySample] = []
+        # petId -> values of the last sample recorded, to drop repeats
+        self._last: dict[str, tuple] = {}
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._createSchema()
+
+    def _createSchema(self):
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= TELEMETRY_SCHEMA_VERSION:
+            return
+        self._connection.executescript(f"""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS telemetry (
+                petId TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                batteryPercent INTEGER,
+                connectionState TEXT,
+                activityType TEXT,
+                PRIMARY KEY (petId, timestamp)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS telemetry_timestamp ON telemetry (timestamp);
+            PRAGMA user_version = {TELEMETRY_SCHEMA_VERSION};
+            COMMIT;
+        """)
+
+    # buffer the pet's current telemetry until the next flush(). Returns
+    # whether a sample was buffered.
+    def record(self, pet, timestamp: float | None = None) -> bool:
+        device = pet.device
+        values = (
+            pet.currLatitude,
+            pet.currLongitude,
+            device.batteryPercent if device is not None else None,
+            device.connectionStateType if device is not None else None,
+            pet.activityType,
+        )
+        with self._lock:
+            if self._last.get(pet.petId) == values:
+                return False
+            self._last[pet.petId] = values
+            self._pending.append(FiTelemetrySample(pet.petId, timestamp if timestamp is not None else time.time(), *values))
+        return True
+
+    # write the buffered samples in one transaction. Returns how many were written.
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            with self._transaction():
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO telemetry VALUES (?, ?, ?, ?, ?, ?, ?)", pending)
+        LOGGER.debug("stored %d telemetry samples", len(pending))
+        return len(pending)
+
+    # samples of a pet from start up to (excluding) end, oldest first
+    def query(self, petId: str, start: float | None = None, end: float | None = None,
+            limit: int | None = None) -> list[FiTelemetrySample]:
+        sql = "SELECT * FROM telemetry WHERE petId = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp"
+        params: list = [petId, start if start is not None else float('-inf'), end if end is not None else float('inf')]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [FiTelemetrySample(*row) for row in rows]
+
+    # the same samples as query(), in chunks of at most chunkSize. Each chunk
+    # is a separate query continuing after the last sample of the previous
+    # one, so a long range is never loaded at once.
+    def iterQuery(self, petId: str, start: float | None = None, end: float | None = None,
+            chunkSize: int = TELEMETRY_QUERY_CHUNK_SIZE) -> Iterator[list[FiTelemetrySample]]:
+        end = end if end is not None else float('inf')
+        chunk = self.query(petId, start, end, chunkSize)
+        while chunk:
+            yield chunk
+            if len(chunk) < chunkSize:
+                return
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT * FROM telemetry WHERE petId = ? AND timestamp > ? AND timestamp < ? ORDER BY timestamp LIMIT ?",
+                    (petId, chunk[-1].timestamp, end, chunkSize)).fetchall()
+            chunk = [FiTelemetrySample(*row) for row in rows]
+
+    def latest(self, petId: str) -> FiTelemetrySample | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM telemetry WHERE petId = ? ORDER BY timestamp DESC LIMIT 1", (petId,)).fetchone()
+        return FiTelemetrySample(*row) if row is not None else None
+
+    # delete every sample older than before. Returns how many were deleted.
+    def purge(self, before: float) -> int:
+        with self._lock, self._transaction():
+            return self._connection.execute("DELETE FROM telemetry WHERE timestamp < ?", (before,)).rowcount
+
+    # thin out samples older than before to the last one of each pet in every
+    # bucket of the given seconds. Running it again over the same range keeps
+    # the same rows. Returns how many samples were deleted.
+    def downsample(self, before: float, bucket: float) -> int:
+        with self._lock, self._transaction():
+            return self._connection.execute("""
+                DELETE FROM telemetry WHERE timestamp < :before AND (petId, timestamp) NOT IN (
+                    SELECT petId, MAX(timestamp) FROM telemetry WHERE timestamp < :before
+                    GROUP BY petId, CAST(timestamp / :bucket AS INTEGER)
+                )""", {"before": before, "bucket": bucket}).rowcount
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._connection.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def pendingCount(self) -> int:
+        return len(self._pending)
+
@@ -0,0 +1,96 @@
+import datetime
+from collections import deque
+from typing import NamedTuple
+
+from .const import WALK_TRACK_MAX_POINTS
+
+
+class FiWalkPoint(NamedTuple):
+    timestamp: datetime.datetime
+    latitude: float
+    longitude: float
+    errorRadius: float | None
+
+
+# Positions of the pet's current walk. The API returns every position of an
+# ongoing walk on each poll; only the ones newer than the last stored point are
+# parsed and kept, up to WALK_TRACK_MAX_POINTS (oldest points are dropped first).
+class FiWalkTrack(object):
+    __slots__ = ('_walkStart', '_points', '_revision')
+
+    def __init__(self, maxPoints: int = WALK_TRACK_MAX_POINTS):
+        self._walkStart = None
+        self._points: deque[FiWalkPoint] = deque(maxlen=maxPoints)
+        # total points ever appended to this walk, so consumers can tell which
+        # points are new even after old ones were dropped from the buffer
+        self._revision = 0
+
+    # merge the positions of an ongoing walk. A walk with a different start
+    # replaces the stored one. Returns the number of points added.
+    def merge(self, walkStart: datetime.datetime, positionsJSON: list) -> int:
+        if walkStart != self._walkStart:
+            self.clear()
+            self._walkStart = walkStart
+        last = self._points[-1] if self._points else None
+
+        # positions are oldest first, so walk back until the stored ones are reached.
+        # Each position's date is parsed about once, so it bypasses the
+        # parse_fi_date cache rather than evicting the timestamps that repeat.
+        new = []
+        for positionJSON in reversed(positionsJSON):
+            timestamp = datetime.datetime.fromisoformat(positionJSON['date'])
+            if last is not None and timestamp <= last.timestamp:
+                break
+            position = positionJSON['position']
+            new.append(FiWalkPoint(
+                timestamp,
+                position['latitude'],
+                position['longitude'],
+                positionJSON.get('errorRadius'),
+            ))
+
+        added = 0
+        previous = last
+        for point in reversed(new):
+            # the collar repeats its position while the pet stands still
+            if previous is not None and (point.latitude, point.longitude) == (previous.latitude, previous.longitude):
+                continue
+            self._points.append(point)
+            previous = point
+            added += 1
+        self._revision += added
+        return added
+
+    def clear(self):
+        self._walkStart = None
+        self._points.clear()
+        self._revision = 0
+
+    def __len__(self):
+        return len(self._points)
+
+    def __str__(self):
+        return f"Walk Track: started {self._walkStart}, {len(self._points)} points"
+
+    @property
+    def walkStart(self) -> datetime.datetime | None:
+        return self._walkStart
+
+    @property
+    def points(self) -> list[FiWalkPoint]:
+        return list(self._points)
+
+    @property
+    def lastPoint(self) -> FiWalkPoint | None:
+        return self._points[-1] if self._points else None
+
+    # the points appended after the given revision that are still buffered
+    def pointsSince(self, revision: int) -> list[FiWalkPoint]:
+        count = min(self._revision - revision, len(self._points))
+        if count <= 0:
+            return []
+        return list(self._points)[-count:]
+
+    @property
+    def revision(self) -> int:
+        return self._revision
@@ -4,6 +4,11 @@ LOGGER = logging.getLogger(__name__)
 
 
 class FiWifiNetwork(object):
+    __slots__ = (
+        '_ssid', '_householdId', '_state', '_addressLabel',
+        '_isHidden', '_latitude', '_longitude', '_rawDetails',
+    )
+
     def __init__(self, ssid, household_id):
         self._ssid = ssid
         self._householdId = household_id
@@ -12,8 +17,12 @@ class FiWifiNetwork(object):
         self._isHidden = False
         self._latitude = None
         self._longitude = None
+        self._rawDetails = None
 
-    def setDetailsJSON(self, networkJSON):
+    # Returns False, without re-parsing, when the details are unchanged
+    def setDetailsJSON(self, networkJSON) -> bool:
+        if networkJSON == self._rawDetails:
+            return False
         self._state = networkJSON.get('state')
         self._addressLabel = networkJSON.get('addressLabel')
         self._isHidden = networkJSON.get('isHidden', False)
@@ -24,6 +33,8 @@ class FiWifiNetwork(object):
         else:
             self._latitude = None
             self._longitude = None
+        self._rawDetails = networkJSON
+        return True
 
     def __str__(self):
         return (
@@ -0,0 +1,73 @@
+"""Rolling averages of TryFi pets' daily steps and sleep."""
+from __future__ import annotations
+
+from datetime import date, datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ROLLING_STORAGE_VERSION, STATISTICS_SAVE_DELAY
+from .pytryfi import PyTryFi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_rolling_windows(value: str) -> tuple[int, ...]:
+    """Return the sorted, distinct window lengths of a "7, 30" style option."""
+    return tuple(sorted({int(days) for days in value.split(",") if days.strip()}))
+
+
+class TryFiRollingStats:
+    """Keep the library's rolling aggregates of daily totals across restarts.
+
+    pytryfi updates the aggregates once per day as it rolls over, so they
+    cost no recorder queries. The days they were built from are stored on
+    disk and replayed on load.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, tryfi: PyTryFi, windows: tuple[int, ...]
+    ) -> None:
+        """Initialize the rolling statistics."""
+        self.hass = hass
+        self.tryfi = tryfi
+        self.windows = windows
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ROLLING_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.rolling"
+        )
+        # Day of each pet's running totals as last scheduled for saving
+        self._saved_days: dict[str, date] = {}
+
+    async def async_load(self) -> None:
+        """Rebuild the aggregates from the days stored by a previous run."""
+        data = await self._store.async_load() or {}
+        self.tryfi.setRollingWindows(self.windows, data.get("pets"))
+
+    async def async_save(self) -> None:
+        """Write the aggregates' days to disk now."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"pets": self.tryfi.rollingStatsState()}
+
+    @callback
+    def async_record(self, pet_id: str, now: datetime | None = None) -> bool:
+        """Record a pet's daily totals, returning whether a day was completed."""
+        if now is None:
+            now = dt_util.utcnow()
+        day = dt_util.as_local(now).date()
+        completed = self.tryfi.recordDailyTotals(pet_id, day)
+        if completed:
+            _LOGGER.debug("Added the last day of pet %s to its rolling averages", pet_id)
+        if self._saved_days.get(pet_id) != day:
+            # Save once per day, when a day is completed or a new one starts.
+            # A save on every poll would keep postponing the delayed write;
+            # the later running totals are written on shutdown.
+            self._saved_days[pet_id] = day
+            self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+        return completed
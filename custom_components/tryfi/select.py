@@ -26,7 +26,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = [
-        TryFiLostModeSelect(coordinator, pet)
+        TryFiLostModeSelect(coordinator.pet_coordinator(pet.petId), pet)
         for pet in coordinator.data.pets
     ]
     
@@ -41,7 +41,7 @@ class TryFiLostModeSelect(CoordinatorEntity, SelectEntity):
     
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the select entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-lost"
         self._attr_name = f"{pet.name} Lost Mode"
@@ -63,7 +63,7 @@ class TryFiLostModeSelect(CoordinatorEntity, SelectEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.pet is not None
+        return super().available and self.pet is not None
     
     @property
     def device_info(self) -> dict[str, Any]:
@@ -104,7 +104,7 @@ class TryFiLostModeSelect(CoordinatorEntity, SelectEntity):
         is_lost = option == "Lost"
         
         try:
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_add_command_job(
                 self.pet.setLostDogMode,
                 self.coordinator.data.session,
                 is_lost
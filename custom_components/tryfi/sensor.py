@@ -23,7 +23,7 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from custom_components.tryfi.pytryfi.fiPet import FiPet
 
 from .const import (
@@ -33,7 +33,15 @@ from .const import (
     SENSOR_STATS_BY_TIME,
     SENSOR_STATS_BY_TYPE,
 )
+from .coordinator import wifi_network_context
 from .pytryfi import PyTryFi
+from .pytryfi.fiRollingStats import ROLLING_METRIC_SLEEP, ROLLING_METRIC_STEPS
+from .pytryfi.fiBehaviorStats import (
+    BehaviorMetric,
+    BehaviorPeriod,
+    BehaviorType,
+    FiBehaviorStats,
+)
 from .pytryfi.fiWifiNetwork import FiWifiNetwork
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,6 +55,16 @@ SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "battery_time_to_empty": SensorEntityDescription(
+        key="battery_time_to_empty",
+        name="Collar Battery Time to Empty",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:battery-clock",
+    ),
     "steps": SensorEntityDescription(
         key="steps",
         name="Steps",
@@ -100,6 +118,20 @@ SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
         name="Current Place Address",
         icon="mdi:home-map-marker",
     ),
+    "nearest_place": SensorEntityDescription(
+        key="nearest_place",
+        name="Nearest Place",
+        icon="mdi:map-marker-radius",
+    ),
+    "nearest_place_distance": SensorEntityDescription(
+        key="nearest_place_distance",
+        name="Nearest Place Distance",
+        native_unit_of_measurement=UnitOfLength.METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        icon="mdi:map-marker-distance",
+    ),
     "connected_to": SensorEntityDescription(
         key="connected_to",
         name="Connected To",
@@ -152,8 +184,56 @@ SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:signal",
     ),
+    "last_update_duration": SensorEntityDescription(
+        key="last_update_duration",
+        name="Last Update Duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    "update_overrun_count": SensorEntityDescription(
+        key="update_overrun_count",
+        name="Update Overrun Count",
+        native_unit_of_measurement="overruns",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-alert-outline",
+    ),
+    "executor_queue_depth": SensorEntityDescription(
+        key="executor_queue_depth",
+        name="Request Queue Depth",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:tray-full",
+    ),
+    "suppressed_event_count": SensorEntityDescription(
+        key="suppressed_event_count",
+        name="Suppressed Events",
+        native_unit_of_measurement="events",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:bell-cancel-outline",
+    ),
+    "update_failure_count": SensorEntityDescription(
+        key="update_failure_count",
+        name="Update Failures",
+        native_unit_of_measurement="failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:alert-circle-outline",
+    ),
 }
 
+ACCOUNT_DIAGNOSTIC_SENSORS: list[str] = [
+    "last_update_duration",
+    "update_overrun_count",
+    "executor_queue_depth",
+    "suppressed_event_count",
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -175,44 +255,60 @@ async def async_setup_entry(
     # Add pet sensors
     for pet in tryfi.pets:
         _LOGGER.debug("Adding sensors for pet: %s", pet.name)
+        pet_coordinator = coordinator.pet_coordinator(pet.petId)
 
         # Battery sensor
-        entities.append(TryFiBatterySensor(coordinator, pet))
+        entities.append(TryFiBatterySensor(pet_coordinator, pet))
+        entities.append(TryFiBatteryTimeToEmptySensor(pet_coordinator, pet))
 
         # Activity stats sensors
         for stat_type in SENSOR_STATS_BY_TYPE:
             for stat_time in SENSOR_STATS_BY_TIME:
-                entities.append(PetStatsSensor(coordinator, pet, stat_type, stat_time))
+                entities.append(PetStatsSensor(pet_coordinator, pet, stat_type, stat_time))
 
         # Generic sensors
         entities.extend(
             [
-                PetGenericSensor(coordinator, pet, "activity_type"),
-                PetGenericSensor(coordinator, pet, "current_place_name"),
-                PetGenericSensor(coordinator, pet, "current_place_address"),
-                PetGenericSensor(coordinator, pet, "connected_to"),
-                PetGenericSensor(coordinator, pet, "home_city_state"),
-                PetGenericSensor(coordinator, pet, "gender"),
-                PetGenericSensor(coordinator, pet, "weight"),
-                PetGenericSensor(coordinator, pet, "age"),
-                PetGenericSensor(coordinator, pet, "connection_state"),
-                PetGenericSensor(coordinator, pet, "led_color"),
-                PetGenericSensor(coordinator, pet, "module_id"),
-                PetGenericSensor(coordinator, pet, "signal_strength"),
+                PetGenericSensor(pet_coordinator, pet, "activity_type"),
+                PetGenericSensor(pet_coordinator, pet, "current_place_name"),
+                PetGenericSensor(pet_coordinator, pet, "current_place_address"),
+                PetGenericSensor(pet_coordinator, pet, "nearest_place"),
+                PetGenericSensor(pet_coordinator, pet, "nearest_place_distance"),
+                PetGenericSensor(pet_coordinator, pet, "connected_to"),
+                PetGenericSensor(pet_coordinator, pet, "home_city_state"),
+                PetGenericSensor(pet_coordinator, pet, "gender"),
+                PetGenericSensor(pet_coordinator, pet, "weight"),
+                PetGenericSensor(pet_coordinator, pet, "age"),
+                PetGenericSensor(pet_coordinator, pet, "connection_state"),
+                PetGenericSensor(pet_coordinator, pet, "led_color"),
+                PetGenericSensor(pet_coordinator, pet, "module_id"),
+                PetGenericSensor(pet_coordinator, pet, "signal_strength"),
+                PetGenericSensor(pet_coordinator, pet, "update_failure_count"),
             ]
         )
 
         # Add sleep quality score sensor
         if hasattr(pet, "device") and pet.device:
-            entities.append(PetSleepQualitySensor(coordinator, pet))
+            entities.append(PetSleepQualitySensor(pet_coordinator, pet))
 
             # Add behavior sensors for Series 3+ collars
             if pet.device.supportsAdvancedBehaviorStats():
                 _LOGGER.debug("Adding behavior sensors for Series 3+ collar: %s", pet.name)
                 for period in ["daily", "weekly", "monthly"]:
                     for behavior in ["barking", "licking", "scratching", "eating", "drinking"]:
-                        entities.append(PetBehaviorSensor(coordinator, pet, behavior, "count", period))
-                        entities.append(PetBehaviorSensor(coordinator, pet, behavior, "duration", period))
+                        entities.append(PetBehaviorSensor(pet_coordinator, pet, behavior, "count", period))
+                        entities.append(PetBehaviorSensor(pet_coordinator, pet, behavior, "duration", period))
+
+        # Rolling averages of the daily totals
+        if coordinator.rolling_stats is not None:
+            for days in coordinator.rolling_stats.windows:
+                entities.extend(
+                    [
+                        PetRollingAverageSensor(pet_coordinator, pet, ROLLING_METRIC_STEPS, days),
+                        PetRollingAverageSensor(pet_coordinator, pet, ROLLING_METRIC_SLEEP, days),
+                        PetGoalCompletionSensor(pet_coordinator, pet, days),
+                    ]
+                )
     
     # Add base sensors
     for base in tryfi.bases:
@@ -234,6 +330,12 @@ async def async_setup_entry(
             TryFiWifiNetworkSensor(coordinator, network, "Address"),
         ])
 
+    # Add account-level diagnostic sensors
+    entities.extend(
+        TryFiAccountDiagnosticSensor(coordinator, config_entry, key)
+        for key in ACCOUNT_DIAGNOSTIC_SENSORS
+    )
+
     async_add_entities(entities)
 
     # Listen for new WiFi networks on coordinator updates
@@ -261,9 +363,10 @@ class TryFiSensorBase(CoordinatorEntity, SensorEntity):
         self,
         coordinator: Any,
         entity_description: SensorEntityDescription | None = None,
+        context: str | None = None,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         if entity_description:
             self.entity_description = entity_description
 
@@ -273,7 +376,7 @@ class TryFiBatterySensor(TryFiSensorBase):
 
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the battery sensor."""
-        super().__init__(coordinator, SENSOR_DESCRIPTIONS["battery"])
+        super().__init__(coordinator, SENSOR_DESCRIPTIONS["battery"], context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-battery"
         self._attr_name = f"{pet.name} Collar Battery Level"
@@ -313,9 +416,40 @@ class TryFiBatterySensor(TryFiSensorBase):
         return icon_for_battery_level(battery_level, charging)
 
 
+class TryFiBatteryTimeToEmptySensor(TryFiBatterySensor):
+    """Representation of the estimated time until a collar's battery is empty."""
+
+    def __init__(self, coordinator: Any, pet: Any) -> None:
+        """Initialize the time to empty sensor."""
+        super().__init__(coordinator, pet)
+        self.entity_description = SENSOR_DESCRIPTIONS["battery_time_to_empty"]
+        self._attr_unique_id = f"{pet.petId}-battery-time-to-empty"
+        self._attr_name = f"{pet.name} Collar Battery Time to Empty"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the estimated hours left, unknown while charging or learning."""
+        if self.coordinator.data is None:
+            return None
+        pet = self.coordinator.data.getPet(self._pet_id)
+        if pet and pet.device:
+            time_to_empty = pet.device.batteryTimeToEmpty
+            if time_to_empty is not None:
+                return round(time_to_empty / 3600, 1)
+        return None
+
+    @property
+    def icon(self) -> str:
+        """Return the icon to use in the frontend."""
+        return self.entity_description.icon
+
+
 class PetStatsSensor(TryFiSensorBase):
     """Representation of a TryFi pet statistics sensor."""
 
+    # The refresh time changes on every stats poll, so keep it out of the recorder
+    _unrecorded_attributes = frozenset({"last_updated"})
+
     def __init__(
         self,
         coordinator: Any,
@@ -324,12 +458,14 @@ class PetStatsSensor(TryFiSensorBase):
         stat_time: str,
     ) -> None:
         """Initialize the statistics sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._stat_type = stat_type.upper()
         self._stat_time = stat_time.upper()
         self._attr_unique_id = f"{pet.petId}-{stat_time.lower()}-{stat_type.lower()}"
         self._attr_name = f"{pet.name} {stat_time.title()} {stat_type.title()}"
+        # Sleep and nap totals are refreshed separately from the step totals
+        self._field = "sleep" if self._stat_type in ("SLEEP", "NAP") else "stats"
 
         # Set attributes from description
         if stat_type.lower() in SENSOR_DESCRIPTIONS:
@@ -377,6 +513,14 @@ class PetStatsSensor(TryFiSensorBase):
 
         return value
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the pet's totals were last refreshed."""
+        pet = self.coordinator.data.getPet(self._pet_id)
+        if not pet:
+            return None
+        return {"last_updated": pet.fieldLastUpdated(self._field)}
+
 
 class PetGenericSensor(TryFiSensorBase):
     """Representation of a generic TryFi pet sensor."""
@@ -384,7 +528,7 @@ class PetGenericSensor(TryFiSensorBase):
     def __init__(self, coordinator: Any, pet: Any, key: str) -> None:
         """Initialize the generic sensor."""
         description = SENSOR_DESCRIPTIONS.get(key)
-        super().__init__(coordinator, description)
+        super().__init__(coordinator, description, context=pet.petId)
         self._pet_id = pet.petId
         self._key = key
         sensor_type = description.name if description else key.replace("_", " ").title()
@@ -453,16 +597,50 @@ class PetGenericSensor(TryFiSensorBase):
             if connected_to and connected_to == "ConnectedToCellular":
                 return pet.device.connectionSignalStrength
             return None
+        elif self._key == "update_failure_count":
+            return getattr(pet, "updateFailureCount", None)
+        elif self._key == "nearest_place":
+            places = self.coordinator.data.petPlaces(self._pet_id)
+            if places and places.nearest:
+                return places.nearest.name
+        elif self._key == "nearest_place_distance":
+            places = self.coordinator.data.petPlaces(self._pet_id)
+            if places and places.nearest:
+                return round(places.distance, 1)
 
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return update health or nearest place details."""
+        if self._key == "nearest_place":
+            places = self.coordinator.data.petPlaces(self._pet_id)
+            if not places or not places.nearest:
+                return None
+            return {
+                "place_id": places.nearest.placeId,
+                "place_type": places.nearest.kind,
+                "distance": round(places.distance, 1),
+                "inside": [place.name for place in places.inside],
+            }
+        if self._key != "update_failure_count":
+            return None
+        pet = self.coordinator.data.getPet(self._pet_id)
+        if not pet:
+            return None
+        return {
+            "update_success_count": getattr(pet, "updateSuccessCount", None),
+            "consecutive_failures": getattr(pet, "consecutiveUpdateFailures", None),
+            "last_error": getattr(pet, "lastUpdateError", None),
+        }
+
 
 class TryFiBaseSensor(TryFiSensorBase):
     """Representation of a TryFi base station sensor."""
 
     def __init__(self, coordinator: Any, base: Any) -> None:
         """Initialize the base sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=base.baseId)
         self._base_id = base.baseId
         self._attr_unique_id = base.baseId
         self._attr_name = base.name
@@ -523,7 +701,7 @@ class TryFiBaseDiagnosticSensor(TryFiSensorBase):
 
     def __init__(self, coordinator: Any, base: Any, sensor_type: str) -> None:
         """Initialize the diagnostic sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=base.baseId)
         self._base_id = base.baseId
         self._key = sensor_type
         self._attr_unique_id = f"{base.baseId}-{sensor_type.replace(' ', '-').lower()}"
@@ -568,12 +746,107 @@ class TryFiBaseDiagnosticSensor(TryFiSensorBase):
         return None
 
 
+class PetRollingAverageSensor(TryFiSensorBase):
+    """Representation of a pet's average daily steps or sleep over a window."""
+
+    def __init__(self, coordinator: Any, pet: Any, metric: str, days: int) -> None:
+        """Initialize the rolling average sensor."""
+        super().__init__(coordinator, context=pet.petId)
+        self._pet_id = pet.petId
+        self._metric = metric
+        self._days = days
+        label = "Steps" if metric == ROLLING_METRIC_STEPS else "Sleep"
+        self._attr_unique_id = f"{pet.petId}-{metric}-{days}-day-average"
+        self._attr_name = f"{pet.name} {label} {days} Day Average"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        if metric == ROLLING_METRIC_STEPS:
+            self._attr_icon = "mdi:paw"
+            self._attr_native_unit_of_measurement = "steps"
+            self._scale = 1
+        else:
+            self._attr_icon = "mdi:sleep"
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_native_unit_of_measurement = UnitOfTime.MINUTES
+            self._scale = 1 / 60
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information."""
+        pet = self.coordinator.data.getPet(self._pet_id)
+        return {
+            "identifiers": {(DOMAIN, pet.petId)},
+            "name": pet.name,
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+        }
+
+    def _window(self) -> Any:
+        """Return the pet's rolling window, if it has seen a full day."""
+        stats = self.coordinator.data.rollingStats(self._pet_id)
+        if stats is None or self._days not in stats.windowDays:
+            return None
+        window = stats.window(self._metric, self._days)
+        return window if window.count else None
+
+    @staticmethod
+    def _round(value: float | None, scale: float) -> float | None:
+        """Scale and round a value, keeping None."""
+        return round(value * scale, 1) if value is not None else None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the average over the days in the window."""
+        window = self._window()
+        return self._round(window.mean, self._scale) if window else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the spread of the days in the window."""
+        window = self._window()
+        if window is None:
+            return {"days": 0}
+        return {
+            "days": window.count,
+            "stddev": self._round(window.stddev, self._scale),
+            "min": self._round(window.min, self._scale),
+            "max": self._round(window.max, self._scale),
+        }
+
+
+class PetGoalCompletionSensor(PetRollingAverageSensor):
+    """Representation of the share of days a pet met its step goal."""
+
+    def __init__(self, coordinator: Any, pet: Any, days: int) -> None:
+        """Initialize the goal completion sensor."""
+        super().__init__(coordinator, pet, ROLLING_METRIC_STEPS, days)
+        self._attr_unique_id = f"{pet.petId}-goal-completion-{days}-day"
+        self._attr_name = f"{pet.name} Goal Completion {days} Day"
+        self._attr_icon = "mdi:flag-checkered"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the percentage of days with a goal on which it was met."""
+        window = self._window()
+        if window is None or window.goalRate is None:
+            return None
+        return round(window.goalRate * 100, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return how many days the rate covers."""
+        window = self._window()
+        return {"days": window.count if window else 0}
+
+
 class PetSleepQualitySensor(TryFiSensorBase):
     """Representation of a TryFi pet sleep quality sensor."""
 
+    _unrecorded_attributes = frozenset({"last_updated"})
+
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the sleep quality sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-sleep-quality"
         self._attr_name = f"{pet.name} Sleep Quality Score"
@@ -637,10 +910,20 @@ class PetSleepQualitySensor(TryFiSensorBase):
 
         return round(score)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the sleep totals were last refreshed."""
+        pet = self.coordinator.data.getPet(self._pet_id)
+        if not pet:
+            return None
+        return {"last_updated": pet.fieldLastUpdated("sleep")}
+
 
 class PetBehaviorSensor(TryFiSensorBase):
     """Behavior tracking sensor for Series 3+ collars."""
 
+    _unrecorded_attributes = frozenset({"last_updated"})
+
     def __init__(
         self,
         coordinator: Any,
@@ -650,11 +933,17 @@ class PetBehaviorSensor(TryFiSensorBase):
         period: str = "daily",
     ) -> None:
         """Initialize the behavior sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._behavior_type = behavior_type
         self._metric_type = metric_type
         self._period = period
+        # Resolve the metric's slot in the pet's behavior table once
+        self._stats_index = FiBehaviorStats.index(
+            BehaviorPeriod[period.upper()],
+            BehaviorType[behavior_type.upper()],
+            BehaviorMetric.COUNT if metric_type == "count" else BehaviorMetric.DURATION,
+        )
 
         # Create unique ID and name
         self._attr_unique_id = (
@@ -693,11 +982,6 @@ class PetBehaviorSensor(TryFiSensorBase):
             model="Series 3+ Collar",
         )
 
-    def _fipet_attr_name(self) -> str:
-        attr_name = f"{self._period}{self._behavior_type.title()}{'Count' if self._metric_type == 'count' else 'Duration'}"
-
-        return attr_name
-
     @property
     def native_value(self) -> StateType:
         """Return the behavior metric value."""
@@ -705,15 +989,19 @@ class PetBehaviorSensor(TryFiSensorBase):
         if not pet:
             return None
 
-        # Build attribute name
-        attr_name = self._fipet_attr_name()
-
-        # Get the value from the pet object
-        value = getattr(pet, attr_name, None)
+        value = pet.behaviorStats.getAt(self._stats_index)
 
         # Return 0 if None
         return value if value is not None else 0
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the behavior metrics were last refreshed."""
+        pet = self.coordinator.data.getPet(self._pet_id)
+        if not pet:
+            return None
+        return {"last_updated": pet.fieldLastUpdated("behavior")}
+
 
 class TryFiWifiNetworkSensor(TryFiSensorBase):
     """Representation of a TryFi WiFi network sensor."""
@@ -722,7 +1010,7 @@ class TryFiWifiNetworkSensor(TryFiSensorBase):
 
     def __init__(self, coordinator: Any, network: FiWifiNetwork, sensor_type: str) -> None:
         """Initialize the WiFi network sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=wifi_network_context(network.ssid))
         self._ssid = network.ssid
         self._sensor_type = sensor_type
         self._attr_unique_id = f"wifi-{network.ssid}-{sensor_type.lower()}"
@@ -762,6 +1050,61 @@ class TryFiWifiNetworkSensor(TryFiSensorBase):
         return None
 
 
+class TryFiAccountDiagnosticSensor(TryFiSensorBase):
+    """Diagnostic sensor describing the integration's update cycle."""
+
+    def __init__(
+        self, coordinator: Any, config_entry: ConfigEntry, key: str
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator, SENSOR_DESCRIPTIONS[key])
+        self._key = key
+        self._attr_unique_id = f"{config_entry.entry_id}-{key.replace('_', '-')}"
+        self._attr_name = f"TryFi {SENSOR_DESCRIPTIONS[key].name}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=f"TryFi {config_entry.title}",
+            manufacturer=MANUFACTURER,
+            model="TryFi Account",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Diagnostics stay available while updates are failing."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        if self._key == "last_update_duration":
+            duration = self.coordinator.last_update_duration
+            return round(duration, 2) if duration is not None else None
+        elif self._key == "update_overrun_count":
+            return self.coordinator.overrun_count
+        elif self._key == "executor_queue_depth":
+            return self.coordinator.executor.queue_depth
+        elif self._key == "suppressed_event_count":
+            return sum(self.coordinator.pet_events.suppressed_counts.values())
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the polling interval, pet update durations or suppressed events."""
+        if self._key == "suppressed_event_count":
+            return dict(self.coordinator.pet_events.suppressed_counts)
+        if self._key != "last_update_duration":
+            return None
+        return {
+            "polling_interval": self.coordinator.update_interval.total_seconds(),
+            "skipped_updates": self.coordinator.skipped_update_count,
+            "pet_update_durations": {
+                pet_id: round(duration, 2)
+                for pet_id, duration in self.coordinator.pet_update_durations.items()
+            },
+        }
+
+
 def icon_for_battery_level(
     battery_level: int | None, charging: bool = False
 ) -> str:
@@ -0,0 +1,260 @@
+"""Long-term statistics for TryFi pet activity."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STATISTICS_SAVE_DELAY, STATISTICS_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .coordinator import TryFiDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDER_DOMAIN = "recorder"
+
+
+@dataclass(frozen=True, slots=True)
+class PetStatistic:
+    """A daily activity total imported as a long-term statistic."""
+
+    key: str
+    name: str
+    attribute: str
+    # the pytryfi history feed holding the statistic's past daily totals
+    feed: str
+    unit: str | None
+    scale: float = 1
+
+
+PET_STATISTICS: tuple[PetStatistic, ...] = (
+    PetStatistic("steps", "Steps", "dailySteps", "activity", "steps"),
+    PetStatistic(
+        "distance",
+        "Distance",
+        "dailyTotalDistance",
+        "activity",
+        UnitOfLength.KILOMETERS,
+        1 / 1000,
+    ),
+    PetStatistic("sleep", "Sleep", "dailySleep", "rest", UnitOfTime.MINUTES, 1 / 60),
+    PetStatistic("nap", "Nap", "dailyNap", "rest", UnitOfTime.MINUTES, 1 / 60),
+)
+
+
+def statistic_id(pet_id: str, statistic: PetStatistic) -> str:
+    """Return the external statistic id of a pet's activity total."""
+    return f"{DOMAIN}:{slugify(pet_id)}_{statistic.key}"
+
+
+class TryFiStatisticsImporter:
+    """Import pets' daily activity totals into long-term statistics.
+
+    The API only reports running totals since midnight, so each statistic
+    keeps a cumulative sum that grows by every increase of the daily total
+    and by the whole total after it resets. Once an hour is over, its last
+    reading is written as that hour's statistic. The sums and the last
+    written hour are stored on disk, so a restart neither rewrites hours
+    nor restarts the sums. Home Assistant aggregates the hourly rows into
+    daily and monthly statistics.
+
+    History from before the first reading can be backfilled from the
+    pets' summary feeds, see async_backfill().
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        # statistic id -> cursor (first and last reading hour, the last
+        # reading and its date, sum and the last hour written)
+        self._cursors: dict[str, dict[str, Any]] = {}
+        # "<pet>_<feed>" -> backfill progress (page cursor, oldest summary
+        # imported and the sum at its start per statistic)
+        self._backfill: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cursors stored by a previous run."""
+        data = await self._store.async_load() or {}
+        self._cursors = data.get("statistics", {})
+        self._backfill = data.get("backfill", {})
+
+    async def async_save(self) -> None:
+        """Write the cursors to disk now."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to store."""
+        return {"statistics": self._cursors, "backfill": self._backfill}
+
+    @callback
+    def async_record(self, pet: Any, now: datetime | None = None) -> int:
+        """Record a pet's daily totals and import the hours that ended.
+
+        Returns the number of statistics rows imported.
+        """
+        if RECORDER_DOMAIN not in self.hass.config.components:
+            return 0
+        if now is None:
+            now = dt_util.utcnow()
+        hour = now.replace(minute=0, second=0, microsecond=0).timestamp()
+        date = dt_util.as_local(now).date().isoformat()
+        imported = 0
+        changed = False
+        for statistic in PET_STATISTICS:
+            value = getattr(pet, statistic.attribute, None)
+            if not isinstance(value, (int, float)):
+                continue
+            value *= statistic.scale
+            stat_id = statistic_id(pet.petId, statistic)
+            cursor = self._cursors.get(stat_id)
+            if cursor is None:
+                # Start counting from the first reading
+                self._cursors[stat_id] = {
+                    "origin": hour,
+                    "hour": hour,
+                    "date": date,
+                    "value": value,
+                    "sum": 0.0,
+                    "written": None,
+                }
+                changed = True
+                continue
+            if hour > cursor["hour"] and cursor["hour"] != cursor["written"]:
+                self._import(
+                    pet.name,
+                    statistic,
+                    stat_id,
+                    [
+                        StatisticData(
+                            start=dt_util.utc_from_timestamp(cursor["hour"]),
+                            state=cursor["value"],
+                            sum=cursor["sum"],
+                        )
+                    ],
+                )
+                cursor["written"] = cursor["hour"]
+                imported += 1
+            if (hour, date, value) == (cursor["hour"], cursor["date"], cursor["value"]):
+                continue
+            if date != cursor["date"] or value < cursor["value"]:
+                # The daily total restarted at midnight
+                cursor["sum"] += value
+            else:
+                cursor["sum"] += value - cursor["value"]
+            cursor.update(hour=hour, date=date, value=value)
+            changed = True
+        if changed or imported:
+            self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+        return imported
+
+    async def async_backfill(
+        self, coordinator: TryFiDataUpdateCoordinator, pet: Any, days: int
+    ) -> int:
+        """Import a pet's daily totals from before its first live reading.
+
+        The summary feeds are walked newest first, one page at a time, back
+        to ``days`` ago. Each day is imported as one row at its start, with
+        sums counting down from where the live statistics began so the two
+        join up. Progress is stored after every page, so an interrupted or
+        repeated backfill carries on where it stopped without importing a
+        day twice. Returns the number of rows imported.
+        """
+        if RECORDER_DOMAIN not in self.hass.config.components:
+            return 0
+        cutoff = dt_util.utcnow() - timedelta(days=days)
+        imported = 0
+        for feed, history in (
+            ("activity", coordinator.tryfi.activityHistory),
+            ("rest", coordinator.tryfi.restHistory),
+        ):
+            statistics = [s for s in PET_STATISTICS if s.feed == feed]
+            progress = self._backfill.setdefault(
+                f"{slugify(pet.petId)}_{feed}",
+                {"cursor": None, "oldest": None, "sums": {}, "done": False},
+            )
+            if progress["done"]:
+                continue
+            pages = history(pet.petId, cursor=progress["cursor"]).pages()
+            reached_cutoff = False
+            while not reached_cutoff and (
+                page := await coordinator.async_add_poll_job(next, pages, None)
+            ) is not None:
+                rows: dict[str, list[StatisticData]] = {}
+                for summary in page.records:
+                    if summary.start < cutoff:
+                        reached_cutoff = True
+                        break
+                    start = summary.start.timestamp()
+                    if progress["oldest"] is not None and start >= progress["oldest"]:
+                        # Imported before the backfill was interrupted
+                        continue
+                    for statistic in statistics:
+                        stat_id = statistic_id(pet.petId, statistic)
+                        value = getattr(summary, statistic.key)
+                        if value is None or summary.end.timestamp() > self._origin(stat_id):
+                            continue
+                        value *= statistic.scale
+                        total = progress["sums"].get(stat_id, 0.0)
+                        rows.setdefault(stat_id, []).append(
+                            StatisticData(
+                                start=dt_util.as_utc(summary.start).replace(
+                                    minute=0, second=0, microsecond=0
+                                ),
+                                state=value,
+                                sum=total,
+                            )
+                        )
+                        progress["sums"][stat_id] = total - value
+                    progress["oldest"] = start
+                for statistic in statistics:
+                    stat_id = statistic_id(pet.petId, statistic)
+                    if stat_id in rows:
+                        self._import(pet.name, statistic, stat_id, rows[stat_id])
+                        imported += len(rows[stat_id])
+                if not reached_cutoff:
+                    # Only a whole page moves the stored cursor on
+                    progress["cursor"] = page.cursor
+                    progress["done"] = page.last
+                self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+        _LOGGER.debug("Backfilled %d statistics rows for %s", imported, pet.name)
+        return imported
+
+    def _origin(self, stat_id: str) -> float:
+        """Return when a statistic's live import began, or today if it has not."""
+        cursor = self._cursors.get(stat_id)
+        if cursor is not None:
+            return cursor["origin"]
+        return dt_util.start_of_local_day().timestamp()
+
+    @callback
+    def _import(
+        self,
+        pet_name: str,
+        statistic: PetStatistic,
+        stat_id: str,
+        rows: list[StatisticData],
+    ) -> None:
+        """Import statistics rows of a pet."""
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{pet_name} {statistic.name}",
+            source=DOMAIN,
+            statistic_id=stat_id,
+            unit_of_measurement=statistic.unit,
+        )
+        _LOGGER.debug("Importing %d %s statistics rows", len(rows), stat_id)
+        async_add_external_statistics(self.hass, metadata, rows)
@@ -28,7 +28,7 @@ async def async_setup_entry(
     # Add pet switches
     for pet in coordinator.data.pets:
         if hasattr(pet, "device") and pet.device:
-            entities.append(TryFiLostModeSwitch(coordinator, pet))
+            entities.append(TryFiLostModeSwitch(coordinator.pet_coordinator(pet.petId), pet))
     
     async_add_entities(entities)
 
@@ -40,7 +40,7 @@ class TryFiLostModeSwitch(CoordinatorEntity, SwitchEntity):
     
     def __init__(self, coordinator: Any, pet: Any) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=pet.petId)
         self._pet_id = pet.petId
         self._attr_unique_id = f"{pet.petId}-lost-mode-switch"
         self._attr_name = f"{pet.name} Lost Mode Switch"
@@ -61,7 +61,7 @@ class TryFiLostModeSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.pet is not None and hasattr(self.pet, "device") and self.pet.device is not None
+        return super().available and self.pet is not None and hasattr(self.pet, "device") and self.pet.device is not None
     
     @property
     def device_info(self) -> dict[str, Any]:
@@ -94,7 +94,7 @@ class TryFiLostModeSwitch(CoordinatorEntity, SwitchEntity):
             _LOGGER.error("Cannot turn on lost mode - pet not found")
             return
         
-        await self.hass.async_add_executor_job(
+        await self.coordinator.async_add_command_job(
             self.pet.setLostDogMode,
             self.coordinator.data.session,
             True
@@ -111,7 +111,7 @@ class TryFiLostModeSwitch(CoordinatorEntity, SwitchEntity):
             _LOGGER.error("Cannot turn off lost mode - pet not found")
             return
         
-        await self.hass.async_add_executor_job(
+        await self.coordinator.async_add_command_job(
             self.pet.setLostDogMode,
             self.coordinator.data.session,
             False
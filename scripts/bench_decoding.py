@@ -0,0 +1,89 @@
+"""Decoding benchmark for large TryFi household payloads.
+
+Times decoding a getHouseHolds-style response with requests' Response.json()
+against each JSON backend available to pytryfi.common.decoding. Run from the
+repository root:
+
+    python scripts/bench_decoding.py [--pets 100] [--bases 20] [--rounds 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.tryfi.pytryfi.common import decoding  # noqa: E402
+from tests.pytryfi.utils import GRAPHQL_BASE, GRAPHQL_PARTIAL_PET  # noqa: E402
+
+
+def _household(pets: int, bases: int) -> bytes:
+    petList = []
+    for i in range(pets):
+        pet = copy.deepcopy(GRAPHQL_PARTIAL_PET)
+        pet["id"] = f"pet-{i}"
+        pet["device"]["id"] = f"device-{i}"
+        petList.append(pet)
+    baseList = [dict(GRAPHQL_BASE, baseId=f"base-{i}") for i in range(bases)]
+    payload = {
+        "data": {
+            "currentUser": {
+                "userHouseholds": [{"household": {"pets": petList, "bases": baseList}}]
+            }
+        }
+    }
+    return json.dumps(payload).encode()
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def _time(label: str, decode, rounds: int, baseline: float | None) -> float:
+    decode()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode()
+    perCall = (time.perf_counter() - start) / rounds
+    speedup = f"  {baseline / perCall:5.1f}x" if baseline else ""
+    print(f"{label:<24} {perCall * 1000:8.3f} ms/decode{speedup}")
+    return perCall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pets", type=int, default=100)
+    parser.add_argument("--bases", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    body = _household(args.pets, args.bases)
+    print(f"{args.pets} pets, {args.bases} bases, {len(body) / 1024:.1f} KiB payload")
+    print(f"active backend: {decoding.JSON_BACKEND}")
+
+    # requests has to guess the encoding when the response does not declare one
+    baseline = _time("requests Response.json", lambda: _response(body).json(), args.rounds, None)
+    _time("json.loads(bytes)", lambda: json.loads(body), args.rounds, baseline)
+    for backend in ("orjson", "msgspec"):
+        try:
+            module = importlib.import_module(backend)
+        except ImportError:
+            print(f"{backend:<24} not installed")
+            continue
+        decode = module.loads if backend == "orjson" else module.json.Decoder().decode
+        _time(f"{backend}", lambda decode=decode: decode(body), args.rounds, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Geofence benchmark for large fleets of collars.
+
+Times locating every pet against the known places three ways: a per-pet
+Python loop over all places, GeoIndex.match() per pet, and the batched
+GeoIndex.matchMany() (vectorised when NumPy is installed). Run from the
+repository root:
+
+    python scripts/bench_geo.py [--pets 10 100 1000] [--places 50] [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.tryfi.pytryfi.common import geo  # noqa: E402
+from custom_components.tryfi.pytryfi.common.geo import (  # noqa: E402
+    GeoIndex,
+    GeoPlace,
+    PlaceMatch,
+    haversine,
+)
+
+
+def _places(rng: random.Random, count: int) -> list[GeoPlace]:
+    return [
+        GeoPlace(
+            f"zone.{i}",
+            f"Zone {i}",
+            "zone",
+            40 + rng.uniform(-0.05, 0.05),
+            -74 + rng.uniform(-0.05, 0.05),
+            rng.uniform(20, 500),
+        )
+        for i in range(count)
+    ]
+
+
+def _bruteForce(places: list[GeoPlace], points: list[tuple[float, float]]) -> list[PlaceMatch]:
+    matches = []
+    for latitude, longitude in points:
+        distances = [(haversine(latitude, longitude, p.latitude, p.longitude), p) for p in places]
+        distance, nearest = min(distances, key=lambda item: item[0])
+        inside = tuple(p for d, p in sorted(distances, key=lambda item: item[0]) if d <= p.radius)
+        matches.append(PlaceMatch(nearest, distance, inside))
+    return matches
+
+
+def _matchEach(index: GeoIndex, points: list[tuple[float, float]]) -> list[PlaceMatch]:
+    return [index.match(latitude, longitude) for latitude, longitude in points]
+
+
+def _time(label: str, locate, rounds: int, baseline: float | None) -> float:
+    locate()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        locate()
+    perCall = (time.perf_counter() - start) / rounds
+    speedup = f"  {baseline / perCall:5.1f}x" if baseline else ""
+    print(f"  {label:<22} {perCall * 1000:8.3f} ms/update{speedup}")
+    return perCall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--places", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    places = _places(rng, args.places)
+    print(f"{args.places} places, batch backend: {geo.GEO_BACKEND}")
+    for pets in args.pets:
+        points = [(40 + rng.uniform(-0.08, 0.08), -74 + rng.uniform(-0.08, 0.08)) for _ in range(pets)]
+        print(f"{pets} pets")
+        baseline = _time("python loop", lambda points=points: _bruteForce(places, points), args.rounds, None)
+        # a fresh index each round, as a change of the places rebuilds it
+        _time("GeoIndex.match", lambda points=points: _matchEach(GeoIndex(places), points), args.rounds, baseline)
+        _time("GeoIndex.matchMany", lambda points=points: GeoIndex(places).matchMany(points), args.rounds, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Memory/allocation benchmark for the pytryfi model classes.
+
+Compares the slotted models, updated in place across polls, against
+dict-backed copies of the same classes that are rebuilt on every poll (the
+previous behaviour). Run from the repository root:
+
+    python scripts/bench_models.py [--pets 100] [--bases 20] [--polls 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.tryfi.pytryfi.fiBase import FiBase  # noqa: E402
+from custom_components.tryfi.pytryfi.fiPet import FiPet  # noqa: E402
+from custom_components.tryfi.pytryfi.fiWifiNetwork import FiWifiNetwork  # noqa: E402
+from tests.pytryfi.utils import GRAPHQL_BASE, GRAPHQL_PARTIAL_PET  # noqa: E402
+
+
+def _unslotted(cls: type) -> type:
+    """Return a dict-backed copy of a slotted model class."""
+    namespace = {
+        name: value
+        for name, value in vars(cls).items()
+        if name != "__slots__" and name not in cls.__slots__
+    }
+    return type(f"Dict{cls.__name__}", (object,), namespace)
+
+
+def _payloads(pets: int, bases: int) -> tuple[list[dict], list[dict]]:
+    petPayloads = []
+    for i in range(pets):
+        pet = copy.deepcopy(GRAPHQL_PARTIAL_PET)
+        pet["id"] = f"pet-{i}"
+        pet["device"]["id"] = f"device-{i}"
+        petPayloads.append(pet)
+    basePayloads = []
+    for i in range(bases):
+        base = dict(GRAPHQL_BASE)
+        base["baseId"] = f"base-{i}"
+        basePayloads.append(base)
+    return petPayloads, basePayloads
+
+
+def _poll(petCls, baseCls, netCls, petPayloads, basePayloads, known, reuse):
+    pets = known.get("pets", {})
+    bases = known.get("bases", {})
+    networks = known.get("networks", {})
+    for payload in petPayloads:
+        # pets were always kept across polls; only bases and networks were rebuilt
+        pet = pets.get(payload["id"])
+        if pet is None:
+            pet = petCls(payload["id"])
+            pets[payload["id"]] = pet
+        pet.setCurrentLocation(payload["ongoingActivity"])
+        pet.setPetDetailsJSON(payload)
+    newBases = {}
+    for payload in basePayloads:
+        base = bases.get(payload["baseId"]) if reuse else None
+        if base is None:
+            base = baseCls(payload["baseId"])
+        base.setBaseDetailsJSON(payload)
+        newBases[payload["baseId"]] = base
+    newNetworks = {}
+    for payload in basePayloads:
+        ssid = payload["networkName"] + payload["baseId"]
+        network = networks.get(ssid) if reuse else None
+        if network is None:
+            network = netCls(ssid, "household")
+        network.setDetailsJSON({"state": "ACTIVE", "position": payload["position"]})
+        newNetworks[ssid] = network
+    known["pets"], known["bases"], known["networks"] = pets, newBases, newNetworks
+
+
+def _run(label, petCls, baseCls, netCls, petPayloads, basePayloads, polls, reuse):
+    known: dict = {}
+    gc.collect()
+    tracemalloc.start()
+    _poll(petCls, baseCls, netCls, petPayloads, basePayloads, known, reuse)
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    allocated = 0
+    start = time.perf_counter()
+    for _ in range(polls):
+        before = tracemalloc.get_traced_memory()[0]
+        _poll(petCls, baseCls, netCls, petPayloads, basePayloads, known, reuse)
+        allocated += max(0, tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.reset_peak()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(
+        f"{label:<24} resident {resident / 1024:8.1f} KiB   "
+        f"peak growth/poll {allocated / polls / 1024:7.1f} KiB   "
+        f"{elapsed / polls * 1000:6.2f} ms/poll"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pets", type=int, default=100)
+    parser.add_argument("--bases", type=int, default=20)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+    # the fixture pets have no photo, which logs a warning per pet per poll
+    logging.disable(logging.WARNING)
+
+    petPayloads, basePayloads = _payloads(args.pets, args.bases)
+    print(f"{args.pets} pets, {args.bases} bases, {args.polls} polls")
+    _run(
+        "dict, rebuilt per poll",
+        _unslotted(FiPet), _unslotted(FiBase), _unslotted(FiWifiNetwork),
+        petPayloads, basePayloads, args.polls, reuse=False,
+    )
+    _run(
+        "slots, reused",
+        FiPet, FiBase, FiWifiNetwork,
+        petPayloads, basePayloads, args.polls, reuse=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import pytest
+
+from custom_components.tryfi.pytryfi.fiBatteryTrend import FiBatteryTrend
+
+HOUR = 3600
+
+
+def test_time_to_empty_from_discharge():
+    trend = FiBatteryTrend()
+    # 1% an hour from 80%
+    for hour in range(3):
+        trend.add(80 - hour, False, hour * HOUR)
+    # the readings do not span long enough yet
+    assert trend.timeToEmpty is None
+    trend.add(77, False, 3 * HOUR)
+
+    assert trend.slope == pytest.approx(-1)
+    assert trend.timeToEmpty == pytest.approx(77 * HOUR)
+
+
+def test_window_slides():
+    trend = FiBatteryTrend(window=10 * HOUR)
+    # a fast drain followed by a slow one; only the slow one stays in the window
+    for hour in range(10):
+        trend.add(100 - 3 * hour, None, hour * HOUR)
+    for hour in range(10, 30):
+        trend.add(73 - (hour - 10) * 0.5, None, hour * HOUR)
+
+    assert trend.sampleCount == 11
+    assert trend.slope == pytest.approx(-0.5)
+    assert trend.timeToEmpty == pytest.approx(63.5 / 0.5 * HOUR)
+
+
+def test_charging_starts_a_new_segment():
+    trend = FiBatteryTrend()
+    for hour in range(5):
+        trend.add(50 - hour, False, hour * HOUR)
+    trend.add(47, True, 5 * HOUR)
+    trend.add(60, True, 6 * HOUR)
+    assert trend.charging
+    assert trend.sampleCount == 2
+    assert trend.timeToEmpty is None
+
+    # collars without isCharging: a jump up means it was charged
+    trend = FiBatteryTrend()
+    for hour in range(5):
+        trend.add(50 - hour, None, hour * HOUR)
+    trend.add(90, None, 6 * HOUR)
+    assert trend.sampleCount == 1
+    assert trend.slope is None
+
+
+def test_flat_and_out_of_order_readings():
+    trend = FiBatteryTrend()
+    for hour in range(5):
+        trend.add(60, False, hour * HOUR)
+    trend.add(20, False, 2 * HOUR)
+    trend.add(None, False, 6 * HOUR)
+
+    assert trend.sampleCount == 5
+    assert trend.slope == 0
+    assert trend.timeToEmpty is None
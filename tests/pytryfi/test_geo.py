@@ -0,0 +1,112 @@
+import math
+import random
+
+import pytest
+
+from custom_components.tryfi.pytryfi.common import geo
+from custom_components.tryfi.pytryfi.common.geo import (
+    GeoIndex,
+    GeoPlace,
+    PathSimplifier,
+    _segmentDistance,
+    decodePolyline,
+    encodePolyline,
+    haversine,
+    simplifyPath,
+)
+
+
+def test_encode_polyline_matches_reference():
+    points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    encoded = encodePolyline(points)
+    assert encoded == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decodePolyline(encoded) == points
+
+
+def test_simplify_path_drops_points_within_tolerance():
+    # about 1 metre of wobble around a straight line, with one 50 metre detour
+    points = [(0.0, i * 0.0001) for i in range(20)]
+    points = [(lat + (0.00001 if i % 2 else 0), lon) for i, (lat, lon) in enumerate(points)]
+    points[10] = (0.00045, points[10][1])
+
+    simplified = simplifyPath(points, 5)
+
+    assert simplified[0] == points[0]
+    assert simplified[-1] == points[-1]
+    assert points[10] in simplified
+    assert len(simplified) < 8
+
+
+def test_path_simplifier_is_incremental_and_within_tolerance():
+    points = [(math.sin(i / 10) * 0.001, i * 0.0001) for i in range(300)]
+    simplifier = PathSimplifier(tolerance=2, chunkSize=32)
+    for start in range(0, len(points), 7):
+        simplifier.extend(points[start:start + 7])
+        frozen = list(simplifier._frozen)
+        # frozen points never change once a chunk is committed
+        simplifier.extend([])
+        assert simplifier._frozen == frozen
+
+    path = simplifier.path
+    assert path[0] == points[0] and path[-1] == points[-1]
+    assert len(path) < len(points) / 3
+    for point in points:
+        assert min(
+            _segmentDistance(point, a, b) for a, b in zip(path, path[1:])
+        ) <= 2 + 1e-6
+
+
+def test_haversine():
+    # one degree of latitude
+    assert round(haversine(0, 0, 1, 0)) == 111195
+
+
+def test_geo_index_matches_brute_force():
+    rng = random.Random(1)
+    places = [
+        GeoPlace(str(i), str(i), "zone", 40 + rng.uniform(-0.2, 0.2), -74 + rng.uniform(-0.2, 0.2), rng.uniform(10, 3000))
+        for i in range(200)
+    ]
+    index = GeoIndex(places)
+    # points near the places and far outside the grid
+    queries = [(40 + rng.uniform(-0.3, 0.3), -74 + rng.uniform(-0.3, 0.3)) for _ in range(200)]
+    queries += [(42.0, -71.0), (-33.9, 151.2)]
+    for lat, lon in queries:
+        distances = {p: haversine(lat, lon, p.latitude, p.longitude) for p in places}
+        nearest, distance = index.nearest(lat, lon)
+        assert math.isclose(distance, min(distances.values()))
+        assert distances[nearest] == distance
+        assert set(index.containing(lat, lon)) == {p for p, d in distances.items() if d <= p.radius}
+
+
+def test_geo_index_empty():
+    index = GeoIndex([])
+    assert index.nearest(0, 0) == (None, None)
+    assert index.match(0, 0).inside == ()
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_geo_index_match_many_matches_match(monkeypatch, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+        # several batches
+        monkeypatch.setattr(geo, "GEO_BATCH_MAX_DISTANCES", 50 * 7)
+    else:
+        monkeypatch.setattr(geo, "np", None)
+    rng = random.Random(2)
+    places = [
+        GeoPlace(str(i), str(i), "zone", 40 + rng.uniform(-0.05, 0.05), -74 + rng.uniform(-0.05, 0.05), rng.uniform(100, 2000))
+        for i in range(50)
+    ]
+    index = GeoIndex(places)
+    points = [(40 + rng.uniform(-0.1, 0.1), -74 + rng.uniform(-0.1, 0.1)) for _ in range(30)]
+
+    matches = index.matchMany(points)
+    assert len(matches) == len(points)
+    for (lat, lon), batched in zip(points, matches):
+        single = index.match(lat, lon)
+        assert batched.nearest == single.nearest
+        assert math.isclose(batched.distance, single.distance)
+        assert batched.inside == single.inside
+    assert GeoIndex([]).matchMany(points[:2]) == [geo.PlaceMatch(None, None, ())] * 2
+    assert index.matchMany([]) == []
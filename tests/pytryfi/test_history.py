@@ -0,0 +1,81 @@
+import datetime
+from itertools import islice
+
+from custom_components.tryfi.pytryfi.fiHistory import FiFeedPaginator, parseActivitySummary, parseRestSummary
+
+
+def _feed(days: int, pageSize: int):
+    # newest first, cursors are the index of the next page's first summary
+    summaries = [
+        {
+            "start": f"2024-05-{31 - i:02d}T00:00:00+00:00",
+            "end": f"2024-05-{31 - i:02d}T23:59:59+00:00",
+            "totalSteps": 1000 + i,
+            "totalDistance": 500.0,
+            "stepGoal": 8000,
+        }
+        for i in range(days)
+    ]
+    calls = []
+
+    def fetchPage(cursor, limit):
+        calls.append((cursor, limit))
+        start = int(cursor or 0)
+        nextStart = start + limit
+        return {
+            "cursor": str(nextStart) if nextStart < len(summaries) else None,
+            "activitySummaries": summaries[start:nextStart],
+        }
+
+    return fetchPage, calls
+
+
+def test_paginator_walks_pages_lazily():
+    fetchPage, calls = _feed(10, 4)
+    paginator = FiFeedPaginator(fetchPage, parseActivitySummary, "activitySummaries", pageSize=4)
+
+    first = list(islice(iter(paginator), 2))
+    assert [s.steps for s in first] == [1000, 1001]
+    # only the first page was fetched
+    assert calls == [(None, 4)]
+    # the cursor moves on once a whole page has been consumed
+    assert paginator.cursor is None
+
+    paginator = FiFeedPaginator(fetchPage, parseActivitySummary, "activitySummaries", pageSize=4)
+    summaries = list(paginator)
+    assert [s.steps for s in summaries] == list(range(1000, 1010))
+    assert summaries[0].start == datetime.datetime(2024, 5, 31, tzinfo=datetime.timezone.utc)
+    assert paginator.exhausted
+    assert paginator.pageCount == 3
+
+
+def test_paginator_resumes_from_cursor():
+    fetchPage, calls = _feed(10, 4)
+    paginator = FiFeedPaginator(fetchPage, parseActivitySummary, "activitySummaries", pageSize=4)
+    pages = paginator.pages()
+    next(pages)
+    page = next(pages)
+    assert [s.steps for s in page.records] == [1004, 1005, 1006, 1007]
+    assert (page.cursor, page.last) == ("8", False)
+    # still the second page, as its records may not have been consumed
+    assert paginator.cursor == "4"
+
+    resumed = FiFeedPaginator(fetchPage, parseActivitySummary, "activitySummaries", page.cursor, pageSize=4)
+    assert [s.steps for s in resumed] == [1008, 1009]
+
+
+def test_paginator_stops_on_empty_page():
+    paginator = FiFeedPaginator(lambda cursor, limit: {"cursor": "same", "restSummaries": []},
+        parseRestSummary, "restSummaries")
+    assert list(paginator) == []
+    assert paginator.exhausted
+
+
+def test_parse_rest_summary():
+    summary = parseRestSummary({
+        "start": "2024-05-01T00:00:00Z",
+        "end": "2024-05-02T00:00:00Z",
+        "data": {"sleepAmounts": [{"type": "SLEEP", "duration": 30000}, {"type": "NAP", "duration": 1800}]},
+    })
+    assert (summary.sleep, summary.nap) == (30000, 1800)
+    assert parseRestSummary({"start": "2024-05-01T00:00:00Z", "end": "2024-05-02T00:00:00Z", "data": {}}).sleep is None
@@ -1,4 +1,6 @@
 from custom_components.tryfi.pytryfi import FiPet, FiDevice
+from custom_components.tryfi.pytryfi.fiWalkTrack import FiWalkTrack
+from custom_components.tryfi.pytryfi.common.query import QUERY_PET_LIVE_DETAILS, REQUEST_FRAGMENTS_PET_LIVE_INFO, VAR_PET_ID
 from .utils import mock_graphql, GRAPHQL_FIXTURE_PET_ALL_INFO, REQ_PET_ALL_INFO
 
 import json
@@ -71,6 +73,54 @@ def test_get_sleep():
     assert pet.dailyNap == 30
 
 
+@responses.activate
+def test_field_last_updated():
+    mock_graphql(
+        query=REQ_PET_ALL_INFO, status=200, response=GRAPHQL_FIXTURE_PET_ALL_INFO
+    )
+
+    pet = FiPet("test-pet")
+    pet._device = FiDevice("device-id")
+    assert pet.fieldLastUpdated('location') is None
+    assert pet.fieldAge('device') is None
+
+    pet.updateCoreDetails(requests.Session())
+
+    for field in ('location', 'device', 'stats', 'sleep'):
+        assert pet.fieldLastUpdated(field).tzinfo is not None
+        assert pet.fieldAge(field) >= 0
+    assert pet.fieldLastUpdated('behavior') is None
+
+
+@responses.activate
+def test_stats_are_fetched_only_when_due():
+    mock_graphql(
+        query=REQ_PET_ALL_INFO, status=200, response=GRAPHQL_FIXTURE_PET_ALL_INFO
+    )
+    mock_graphql(
+        query=QUERY_PET_LIVE_DETAILS.replace(VAR_PET_ID, "test-pet") + REQUEST_FRAGMENTS_PET_LIVE_INFO,
+        status=200,
+        response=GRAPHQL_FIXTURE_PET_ALL_INFO,
+    )
+    pet = FiPet("test-pet")
+    pet._device = FiDevice("device-id")
+    assert pet.statsDue()
+
+    pet.updateCoreDetails(requests.Session())
+    assert not pet.statsDue()
+    assert pet.statsDue(maxAge=0)
+    statsUpdated = pet.fieldLastUpdated('stats')
+
+    pet.updateCoreDetails(requests.Session(), includeStats=False)
+    assert "dailyStepStat" not in urllib.parse.unquote_plus(responses.calls[-1].request.url)
+    assert pet.fieldLastUpdated('stats') == statsUpdated
+    assert pet.dailySteps == 4000
+
+    # a walk starting or ending makes the totals due
+    pet._activityType = "OngoingWalk"
+    assert pet.statsDue()
+
+
 @responses.activate
 def test_update_behavior_stats():
     with open("tests/pytryfi/fixture_petHealthTrends.json", "r") as f:
@@ -118,3 +168,77 @@ def test_update_behavior_stats():
     assert pet.dailyLickingDuration == 6
     assert pet.dailyScratchingCount == 4
     assert pet.dailyScratchingDuration == 1
+
+
+def test_behavior_stats_reset_only_their_period():
+    pet = FiPet("test-pet")
+    trends = [{"id": "barking:DAY", "summaryComponents": {"eventsSummary": "5 events", "durationSummary": "12min"}}]
+    pet.setBehaviorStatsFromTrends(trends, "DAY")
+    pet.setBehaviorStatsFromTrends(trends, "WEEK")
+
+    pet.setBehaviorStatsFromTrends([], "DAY")
+
+    assert pet.dailyBarkingCount == 0
+    assert pet.weeklyBarkingCount == 5
+    assert pet.weeklyBarkingDuration == 12
+
+
+@responses.activate
+def test_unchanged_payload_is_not_reparsed():
+    mock_graphql(
+        query=REQ_PET_ALL_INFO, status=200, response=GRAPHQL_FIXTURE_PET_ALL_INFO
+    )
+
+    pet = FiPet("test-pet")
+    pet._device = FiDevice("device-id")
+    assert pet.updateCoreDetails(requests.Session()) is True
+
+    pet._currLatitude = 0  # would be overwritten by a re-parse
+    assert pet.updateCoreDetails(requests.Session()) is False
+    assert pet.currLatitude == 0
+
+
+def _walk(start: str, points: list[tuple[str, float, float]]) -> dict:
+    return {
+        "__typename": "OngoingWalk",
+        "start": start,
+        "lastReportTimestamp": points[-1][0],
+        "areaName": "Park",
+        "distance": 100,
+        "positions": [
+            {"date": date, "errorRadius": 5, "position": {"latitude": lat, "longitude": lon}}
+            for date, lat, lon in points
+        ],
+        "path": [],
+    }
+
+
+def test_walk_track_appends_only_new_positions():
+    pet = FiPet("test-pet")
+    start = "2024-01-01T10:00:00Z"
+    points = [
+        ("2024-01-01T10:00:00Z", 1.0, 1.0),
+        ("2024-01-01T10:00:10Z", 1.0, 1.0),  # standing still
+        ("2024-01-01T10:00:20Z", 1.1, 1.0),
+    ]
+    pet.setCurrentLocation(_walk(start, points))
+    assert [(p.latitude, p.longitude) for p in pet.walkTrack.points] == [(1.0, 1.0), (1.1, 1.0)]
+    assert pet.walkTrack.revision == 2
+
+    points.append(("2024-01-01T10:00:30Z", 1.2, 1.0))
+    pet.setCurrentLocation(_walk(start, points))
+    assert len(pet.walkTrack) == 3
+    assert pet.walkTrack.lastPoint.latitude == 1.2
+    assert pet.walkTrack.lastPoint.errorRadius == 5
+
+    # a new walk starts a new track
+    pet.setCurrentLocation(_walk("2024-01-01T12:00:00Z", [("2024-01-01T12:00:00Z", 2.0, 2.0)]))
+    assert [(p.latitude, p.longitude) for p in pet.walkTrack.points] == [(2.0, 2.0)]
+
+
+def test_walk_track_is_bounded():
+    track = FiWalkTrack(maxPoints=3)
+    walk = _walk("2024-01-01T10:00:00Z", [(f"2024-01-01T10:00:0{i}Z", float(i), 0.0) for i in range(5)])
+    assert track.merge(None, walk["positions"]) == 5
+    assert [p.latitude for p in track.points] == [2.0, 3.0, 4.0]
+    assert track.revision == 5
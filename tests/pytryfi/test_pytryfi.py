@@ -1,9 +1,16 @@
+from unittest.mock import Mock, patch
+
+import pytest
 import responses
-from custom_components.tryfi.pytryfi import PyTryFi
+from custom_components.tryfi.pytryfi import FiPet, PyTryFi
+from custom_components.tryfi.pytryfi.common.geo import GeoIndex, GeoPlace
 from tests.pytryfi.utils import (
+    GRAPHQL_BASE,
     GRAPHQL_PARTIAL_PET,
+    bare_tryfi,
     mock_household_with_pets,
     mock_login_requests,
+    mock_pet,
 )
 
 
@@ -42,3 +49,177 @@ def test_generic_init():
     assert len(tryfi.pets) == 1
 
     assert tryfi.pets[0].petId == "test-pet"
+
+
+class _StubPet(FiPet):
+    # FiPet is slotted, so stubbing its update methods needs an instance __dict__
+    pass
+
+
+def _pet(petId: str, error: Exception | None = None) -> FiPet:
+    pet = _StubPet(petId)
+    pet._name = petId
+    pet.updateAllDetails = Mock(side_effect=error)
+    pet.updateCoreDetails = Mock(side_effect=error)
+    return pet
+
+
+def test_update_pets_isolates_failures():
+    broken = _pet("broken", KeyError("ongoingActivity"))
+    healthy = _pet("healthy")
+    tryfi = bare_tryfi([broken, healthy])
+
+    tryfi.updatePets()
+
+    healthy.updateAllDetails.assert_called_once()
+    assert healthy.updateSuccessCount == 1
+    assert broken.updateFailureCount == 1
+    assert broken.lastUpdateError == "KeyError: 'ongoingActivity'"
+    assert tryfi.petRetryIn("broken") is not None
+    assert tryfi.petRetryIn("healthy") is None
+
+
+def test_failed_pet_backs_off():
+    broken = _pet("broken", RuntimeError("boom"))
+    tryfi = bare_tryfi([broken])
+    now = [100.0]
+
+    with patch("custom_components.tryfi.pytryfi.time.monotonic", side_effect=lambda: now[0]):
+        tryfi.updatePets()
+        assert tryfi.petRetryIn("broken") == 5
+
+        now[0] += 5
+        assert tryfi.petRetryIn("broken") == 0
+        tryfi.updatePets()
+        # the delay doubles with each consecutive failure
+        assert tryfi.petRetryIn("broken") == 10
+
+        broken.updateAllDetails.side_effect = None
+        now[0] += 10
+        tryfi.updatePets()
+
+    assert tryfi.petRetryIn("broken") is None
+    assert broken.consecutiveUpdateFailures == 0
+    assert broken.updateFailureCount == 2
+    assert broken.updateSuccessCount == 1
+
+
+def test_update_bases_reuses_known_bases():
+    tryfi = bare_tryfi([])
+    tryfi._bases = []
+    del tryfi.updateBases
+    renamed = dict(GRAPHQL_BASE, name="Kitchen Base")
+
+    with patch("custom_components.tryfi.pytryfi.getBaseList") as getBaseList:
+        getBaseList.return_value = [{"household": {"bases": [GRAPHQL_BASE]}}]
+        tryfi.updateBases()
+        base = tryfi.bases[0]
+
+        getBaseList.return_value = [{"household": {"bases": [renamed]}}]
+        tryfi.updateBases()
+
+    assert tryfi.bases == [base]
+    assert base.name == "Kitchen Base"
+
+
+def test_pet_places_follow_bases_and_extra_places():
+    pet = FiPet("pet")
+    pet._currLatitude, pet._currLongitude = 80.0002, -47.0
+    tryfi = bare_tryfi([pet])
+    tryfi._bases = []
+    tryfi._wifiNetworks = []
+    del tryfi.updateBases
+
+    with patch("custom_components.tryfi.pytryfi.getBaseList") as getBaseList:
+        getBaseList.return_value = [{"household": {"bases": [GRAPHQL_BASE]}}]
+        tryfi.updateBases()
+
+    places = tryfi.petPlaces("pet")
+    assert places.nearest.placeId == "BASEID-LR"
+    assert places.nearest.kind == "base"
+    assert round(places.distance) == 22
+    assert [p.placeId for p in places.inside] == ["BASEID-LR"]
+    # cached until the pet moves or the places change
+    assert tryfi.petPlaces("pet") is places
+
+    tryfi.setExtraPlaces([GeoPlace("zone.park", "Park", "zone", 80.0002, -47.0, 10)])
+    places = tryfi.petPlaces("pet")
+    assert places.nearest.placeId == "zone.park"
+    assert {p.placeId for p in places.inside} == {"zone.park", "BASEID-LR"}
+
+    pet._currLatitude = None
+    assert tryfi.petPlaces("pet") is None
+
+
+def test_locate_pets_batches_stale_pets():
+    pets = [FiPet("a"), FiPet("b"), FiPet("c")]
+    for i, pet in enumerate(pets):
+        pet._currLatitude, pet._currLongitude = 10.0 + i * 0.001, 20.0
+    pets[2]._currLatitude = None
+    tryfi = bare_tryfi(pets)
+    tryfi._bases = []
+    tryfi._wifiNetworks = []
+    tryfi.setExtraPlaces([GeoPlace("zone.yard", "Yard", "zone", 10.0, 20.0, 50)])
+
+    with patch.object(GeoIndex, "matchMany", autospec=True, side_effect=GeoIndex.matchMany) as matchMany:
+        assert [p.placeId for p in tryfi.petPlaces("a").inside] == ["zone.yard"]
+        # the other pet was located in the same batch
+        assert tryfi.petPlaces("b").inside == ()
+        assert tryfi.petPlaces("c") is None
+        assert matchMany.call_count == 1
+        assert matchMany.call_args.args[1] == [(10.0, 20.0), (10.001, 20.0)]
+
+        pets[1]._currLatitude = 10.0
+        tryfi.petPlaces("b")
+        assert matchMany.call_args.args[1] == [(10.0, 20.0)]
+
+
+def test_stats_refresh_on_request():
+    pet = mock_pet("pet")
+    pet.statsDue.return_value = False
+    tryfi = bare_tryfi([pet])
+
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_once_with(tryfi.session, includeStats=False)
+
+    tryfi.requestStatsRefresh()
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_with(tryfi.session)
+    # the request is used up
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_with(tryfi.session, includeStats=False)
+
+
+def test_stats_request_during_update_is_kept():
+    pet = mock_pet("pet")
+    pet.statsDue.return_value = False
+    tryfi = bare_tryfi([pet])
+
+    def _update(session):
+        # the midnight trigger fires while the request is in flight
+        tryfi.requestStatsRefresh("pet")
+
+    pet.updateCoreDetails.side_effect = _update
+    tryfi.requestStatsRefresh("pet")
+    tryfi.updatePet("pet")
+
+    pet.updateCoreDetails.side_effect = None
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_with(tryfi.session)
+
+
+def test_stats_request_survives_failed_update():
+    pet = mock_pet("pet")
+    pet.statsDue.return_value = False
+    pet.updateCoreDetails.side_effect = RuntimeError("boom")
+    tryfi = bare_tryfi([pet])
+
+    tryfi.requestStatsRefresh("pet")
+    with pytest.raises(RuntimeError):
+        tryfi.updatePet("pet")
+
+    pet.updateCoreDetails.side_effect = None
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_with(tryfi.session)
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_with(tryfi.session, includeStats=False)
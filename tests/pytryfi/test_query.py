@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from unittest.mock import Mock
+import importlib
+from unittest.mock import Mock, patch
 
 import pytest
 import responses
@@ -8,6 +9,7 @@ import requests
 import json
 
 from custom_components.tryfi.pytryfi.exceptions import RemoteApiError
+from custom_components.tryfi.pytryfi.common import decoding
 from custom_components.tryfi.pytryfi.common.query import query
 from tests.pytryfi.utils import mock_graphql, mock_response
 
@@ -43,8 +45,8 @@ def test_query_json_parsing():
     """Test query JSON parsing error handling."""
     session = Mock()
     response = mock_response(200)
-    response.text = "valid"
-    response.json.side_effect = json.JSONDecodeError("Invalid JSON", "doc", 0)
+    response.text = "{invalid"
+    response.content = b"{invalid"
     session.get.return_value = response
 
     with pytest.raises(RemoteApiError) as exc_info:
@@ -67,3 +69,18 @@ def test_query_graphql_errors():
 
     assert "GraphQL error" in str(exc_info.value)
     assert "Invalid query" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_decoding_backends_raise_json_decode_error(backend):
+    """Every decoding backend reports invalid JSON as json.JSONDecodeError."""
+    pytest.importorskip(backend)
+    module = importlib.import_module(backend)
+    with patch.object(decoding, "_decode", module.loads), patch.object(
+        decoding, "_DecodeError", module.JSONDecodeError
+    ):
+        assert decoding.loads(b'{"data": {"pet": [1, 2]}}') == {"data": {"pet": [1, 2]}}
+        with pytest.raises(json.JSONDecodeError):
+            decoding.loads(b"{invalid")
+        with pytest.raises(json.JSONDecodeError):
+            decoding.loads(b"\xff\xfe")
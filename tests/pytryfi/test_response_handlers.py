@@ -0,0 +1,20 @@
+import datetime
+
+from custom_components.tryfi.pytryfi.common.response_handlers import parse_fi_date
+
+
+def test_parse_fi_date_handles_utc_suffix():
+    parsed = parse_fi_date("2025-06-17T01:30:00.000Z")
+
+    assert parsed == datetime.datetime(2025, 6, 17, 1, 30, tzinfo=datetime.timezone.utc)
+    assert parse_fi_date("2025-06-17T03:30:00+02:00") == parsed
+
+
+def test_parse_fi_date_reuses_parsed_values():
+    parse_fi_date.cache_clear()
+
+    first = parse_fi_date("2025-06-17T01:00:00.000Z")
+    second = parse_fi_date("2025-06-17T01:00:00.000Z")
+
+    assert first is second
+    assert parse_fi_date.cache_info().hits == 1
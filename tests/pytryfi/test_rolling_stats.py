@@ -0,0 +1,79 @@
+import datetime
+import statistics
+
+import pytest
+
+from custom_components.tryfi.pytryfi.fiRollingStats import FiDailyTotals, FiRollingStats, FiRollingWindow
+
+from tests.pytryfi.utils import bare_tryfi, mock_pet
+
+DAY = datetime.date(2024, 5, 1)
+
+
+def _day(offset: int) -> datetime.date:
+    return DAY + datetime.timedelta(days=offset)
+
+
+def test_window_matches_recomputation():
+    values = [5000, 7000, 3000, 9000, 4000, 6000, 8000, 2000, 10000, 5500]
+    window = FiRollingWindow(4)
+    for offset, value in enumerate(values):
+        window.add(_day(offset), value, value >= 6000)
+        recent = values[max(0, offset - 3):offset + 1]
+        assert window.count == len(recent)
+        assert window.mean == pytest.approx(statistics.mean(recent))
+        if len(recent) > 1:
+            assert window.stddev == pytest.approx(statistics.stdev(recent))
+        assert (window.min, window.max) == (min(recent), max(recent))
+        assert window.goalRate == sum(v >= 6000 for v in recent) / len(recent)
+
+
+def test_window_skips_gaps_and_repeats():
+    window = FiRollingWindow(7)
+    window.add(_day(0), 100)
+    window.add(_day(0), 999)
+    window.add(_day(3), None)
+    window.add(_day(6), 300)
+    assert (window.count, window.mean, window.goalRate) == (2, 200, None)
+    # a week after the first day it has left the window
+    window.add(_day(7), 500)
+    assert (window.count, window.min, window.max) == (2, 300, 500)
+    assert window.stddev == pytest.approx(statistics.stdev([300, 500]))
+
+
+def test_days_complete_on_rollover_and_survive_a_restart():
+    stats = FiRollingStats((2, 7))
+    assert not stats.observe(FiDailyTotals(_day(0), 1000, 5000, 3600))
+    assert not stats.observe(FiDailyTotals(_day(0), 6000, 5000, 7200))
+    assert stats.window('steps', 7).count == 0
+    assert stats.observe(FiDailyTotals(_day(1), 10, 5000, 0))
+    assert stats.window('steps', 7).mean == 6000
+    assert stats.window('steps', 7).goalRate == 1
+    assert stats.window('sleep', 7).mean == 7200
+    # the clock going back is ignored
+    assert not stats.observe(FiDailyTotals(_day(0), 0, 5000, 0))
+
+    for offset in range(2, 5):
+        stats.observe(FiDailyTotals(_day(offset), 2000 * offset, 5000, 0))
+    restored = FiRollingStats.fromDict(stats.asDict(), (2, 7))
+    for days in (2, 7):
+        assert restored.window('steps', days).mean == stats.window('steps', days).mean
+        assert restored.window('steps', days).goalRate == stats.window('steps', days).goalRate
+    assert restored.window('steps', 2).count == 2
+    assert restored.observe(FiDailyTotals(_day(5), 0, 5000, 0))
+    assert restored.window('steps', 7).max == 8000
+
+
+def test_client_records_daily_totals():
+    pet = mock_pet("pet")
+    pet.dailySteps, pet.dailyGoal, pet.dailySleep = 4000, 5000, 600
+    tryfi = bare_tryfi([pet])
+    tryfi.setRollingWindows((7,))
+
+    assert not tryfi.recordDailyTotals("pet", _day(0))
+    assert tryfi.recordDailyTotals("pet", _day(1))
+    assert not tryfi.recordDailyTotals("nobody", _day(1))
+    assert tryfi.rollingStats("pet").window('steps', 7).goalRate == 0
+
+    tryfi.setRollingWindows((7, 30), tryfi.rollingStatsState())
+    assert tryfi.rollingStats("pet").window('sleep', 30).mean == 600
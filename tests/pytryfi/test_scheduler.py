@@ -0,0 +1,195 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from custom_components.tryfi.pytryfi.common.scheduler import RequestScheduler, schedulerFor
+from custom_components.tryfi.pytryfi.exceptions import RequestCancelledError
+from tests.pytryfi.utils import bare_tryfi, mock_pet
+
+
+def test_scheduler_is_shared_per_session():
+    session = requests.Session()
+    assert schedulerFor(session) is schedulerFor(session)
+    assert schedulerFor(session) is not schedulerFor(requests.Session())
+
+
+def test_checkpoint_waits_for_interactive_requests():
+    scheduler = RequestScheduler()
+    batch = scheduler.startBatch()
+    entered = threading.Event()
+    release = threading.Event()
+    resumed = threading.Event()
+
+    def _command():
+        with scheduler.interactive():
+            entered.set()
+            release.wait(timeout=5)
+
+    def _poll():
+        scheduler.checkpoint(batch)
+        resumed.set()
+
+    command = threading.Thread(target=_command)
+    command.start()
+    entered.wait(timeout=5)
+    poll = threading.Thread(target=_poll)
+    poll.start()
+
+    assert not resumed.wait(timeout=0.1)
+    release.set()
+    assert resumed.wait(timeout=5)
+    command.join()
+    poll.join()
+
+
+def test_cancelling_interactive_request_ends_batch():
+    scheduler = RequestScheduler()
+    batch = scheduler.startBatch()
+
+    with scheduler.interactive(cancelBackground=True):
+        pass
+
+    with pytest.raises(RequestCancelledError):
+        scheduler.checkpoint(batch)
+    # batches started afterwards are unaffected
+    scheduler.checkpoint(scheduler.startBatch())
+
+
+def test_update_stops_remaining_pets_when_cancelled():
+    first = mock_pet("first")
+    second = mock_pet("second")
+    tryfi = bare_tryfi([first, second])
+
+    def _lostMode(session):
+        with tryfi._scheduler.interactive(cancelBackground=True):
+            pass
+
+    first.updateCoreDetails = Mock(side_effect=_lostMode)
+
+    tryfi.update()
+
+    first.updateCoreDetails.assert_called_once()
+    second.updateCoreDetails.assert_not_called()
+    assert tryfi.pendingUpdateItems[0] == ("pet", "second")
+
+
+def test_update_carries_unfinished_items_past_budget():
+    first = mock_pet("first")
+    second = mock_pet("second")
+    second.device.supportsAdvancedBehaviorStats.return_value = True
+    tryfi = bare_tryfi([first, second])
+    clock = iter([0, 0, 5, 5, 5])
+
+    with patch("custom_components.tryfi.pytryfi.time.monotonic", side_effect=lambda: next(clock)):
+        tryfi.update(budget=2)
+
+    first.updateCoreDetails.assert_called_once()
+    second.updateCoreDetails.assert_not_called()
+    assert tryfi.pendingUpdateItems == [
+        ("pet", "second"), ("bases", None), ("behavior", "second"), ("wifi", None)
+    ]
+
+    # carried items run first on the next update, without duplicates
+    order = []
+    first.updateCoreDetails.side_effect = lambda session: order.append("first")
+    second.updateCoreDetails.side_effect = lambda session: order.append("second")
+    tryfi.update()
+
+    assert order == ["second", "first"]
+    second.updateBehaviorStats.assert_called_once()
+    tryfi.updateBases.assert_called_once()
+    tryfi.updateWifiNetworks.assert_called_once()
+    assert tryfi.pendingUpdateItems == []
+
+
+def test_update_failure_does_not_stop_other_items():
+    first = mock_pet("first")
+    first.updateCoreDetails.side_effect = RuntimeError("boom")
+    second = mock_pet("second")
+    tryfi = bare_tryfi([first, second])
+
+    tryfi.update()
+
+    second.updateCoreDetails.assert_called_once()
+    tryfi.updateBases.assert_called_once()
+    tryfi.updateWifiNetworks.assert_called_once()
+
+
+def test_update_can_leave_pets_to_their_own_schedule():
+    pet = mock_pet("pet")
+    tryfi = bare_tryfi([pet])
+
+    tryfi.update(includePets=False)
+
+    pet.updateCoreDetails.assert_not_called()
+    tryfi.updateBases.assert_called_once()
+    tryfi.updateWifiNetworks.assert_called_once()
+
+
+def test_update_pet_raises_and_defers_behavior_past_budget():
+    pet = mock_pet("pet")
+    pet.device.supportsAdvancedBehaviorStats.return_value = True
+    pet.updateCoreDetails.return_value = True
+    pet.updateBehaviorStats.return_value = False
+    tryfi = bare_tryfi([pet])
+    clock = iter([0, 5, 10])
+
+    with patch("custom_components.tryfi.pytryfi.time.monotonic", side_effect=lambda: next(clock)):
+        assert tryfi.updatePet("pet", budget=2)
+
+    pet.updateBehaviorStats.assert_not_called()
+
+    # the deferred behavior trends are fetched first on the next update
+    order = []
+    pet.updateBehaviorStats.side_effect = lambda session, checkpoint: order.append("behavior")
+    pet.updateCoreDetails.side_effect = lambda session: order.append("core")
+    tryfi.updatePet("pet")
+    assert order == ["behavior", "core"]
+
+    pet.updateCoreDetails.side_effect = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        tryfi.updatePet("pet")
+    pet.recordUpdateFailure.assert_called_once()
+    assert tryfi.petRetryIn("pet") is not None
+
+
+def test_update_pet_checks_batch_before_each_request():
+    pet = mock_pet("pet")
+    tryfi = bare_tryfi([pet])
+    batch = tryfi._scheduler.startBatch()
+    with tryfi._scheduler.interactive(cancelBackground=True):
+        pass
+
+    with pytest.raises(RequestCancelledError):
+        tryfi.updatePet("pet", batch=batch)
+    pet.updateCoreDetails.assert_not_called()
+    # a new batch is started when none is given
+    tryfi.updatePet("pet")
+    pet.updateCoreDetails.assert_called_once()
+
+
+def test_update_pet_defers_behavior_when_cancelled():
+    pet = mock_pet("pet")
+    pet.device.supportsAdvancedBehaviorStats.return_value = True
+    pet.updateCoreDetails.return_value = True
+    tryfi = bare_tryfi([pet])
+
+    def _cancelled(session, checkpoint):
+        # lost mode turned on while the behavior trends are fetched
+        with tryfi._scheduler.interactive(cancelBackground=True):
+            pass
+        checkpoint()
+
+    pet.updateBehaviorStats.side_effect = _cancelled
+    assert tryfi.updatePet("pet")
+    assert "pet" in tryfi._deferredBehavior
+
+    # the deferred trends are fetched first on the next update
+    order = []
+    pet.updateBehaviorStats.side_effect = lambda session, checkpoint: order.append("behavior")
+    pet.updateCoreDetails.side_effect = lambda session: order.append("core")
+    tryfi.updatePet("pet")
+    assert order == ["behavior", "core"]
+    assert "pet" not in tryfi._deferredBehavior
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.tryfi.pytryfi.fiDevice import FiDevice
+from custom_components.tryfi.pytryfi.fiPet import FiPet
+from custom_components.tryfi.pytryfi.fiTelemetryStore import FiTelemetrySample, FiTelemetryStore
+
+from tests.pytryfi.utils import bare_tryfi
+
+
+def _pet(petId: str = "pet", latitude: float = 40.0, battery: int = 80) -> FiPet:
+    pet = FiPet(petId)
+    pet._currLatitude, pet._currLongitude = latitude, -74.0
+    pet._device = FiDevice("device")
+    pet._device._batteryPercent = battery
+    pet._device._connectionStateType = "ConnectedToBase"
+    return pet
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FiTelemetryStore(str(tmp_path / "telemetry.db"))
+    yield store
+    store.close()
+
+
+def test_samples_are_batched_and_repeats_dropped(store):
+    pet = _pet()
+    assert store.record(pet, 100)
+    # nothing changed since the last sample
+    assert not store.record(pet, 160)
+    pet._currLatitude = 40.001
+    assert store.record(pet, 220)
+    assert store.query("pet") == []
+    assert store.pendingCount == 2
+
+    assert store.flush() == 2
+    assert store.flush() == 0
+    assert store.query("pet") == [
+        FiTelemetrySample("pet", 100, 40.0, -74.0, 80, "ConnectedToBase", None),
+        FiTelemetrySample("pet", 220, 40.001, -74.0, 80, "ConnectedToBase", None),
+    ]
+    assert store._connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_range_queries(store):
+    for i in range(10):
+        store.record(_pet("a", 40 + i), i * 10)
+        store.record(_pet("b", 50 + i), i * 10)
+    store.flush()
+
+    assert [s.timestamp for s in store.query("a", 20, 50)] == [20, 30, 40]
+    assert [s.latitude for s in store.query("b", 80)] == [58, 59]
+    assert len(store.query("a", limit=3)) == 3
+    assert store.latest("a").latitude == 49
+    assert store.latest("nobody") is None
+
+
+def test_purge_and_downsample(store):
+    # one sample a minute for an hour
+    for i in range(60):
+        store.record(_pet(latitude=40 + i / 1000), i * 60)
+    store.flush()
+
+    # keep the last sample of every 10 minutes before minute 30
+    assert store.downsample(1800, 600) == 27
+    assert [s.timestamp for s in store.query("pet", end=1800)] == [540, 1140, 1740]
+    assert store.downsample(1800, 600) == 0
+
+    assert store.purge(1200) == 2
+    assert store.query("pet")[0].timestamp == 1740
+
+
+def test_pet_updates_are_recorded_and_written_per_update(store):
+    pet = _pet()
+    tryfi = bare_tryfi([pet])
+    tryfi.setTelemetryStore(store)
+
+    with patch.object(FiPet, "updateCoreDetails", return_value=True), \
+            patch.object(FiDevice, "supportsAdvancedBehaviorStats", return_value=False):
+        tryfi.updatePet("pet")
+        assert store.pendingCount == 1
+        tryfi.update(includePets=False)
+
+    assert store.pendingCount == 0
+    assert [s.latitude for s in store.query("pet")] == [40.0]
+
+
+def test_iter_query_chunks(store):
+    for i in range(10):
+        store.record(_pet(latitude=40 + i), i)
+    store.flush()
+
+    chunks = list(store.iterQuery("pet", 1, 9, chunkSize=3))
+    assert [[s.timestamp for s in chunk] for chunk in chunks] == [[1, 2, 3], [4, 5, 6], [7, 8]]
+    assert list(store.iterQuery("pet", 0, 6, chunkSize=3))[-1][-1].timestamp == 5
+    assert list(store.iterQuery("nobody")) == []
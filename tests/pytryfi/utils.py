@@ -1,8 +1,12 @@
+import threading
 from unittest.mock import Mock
 
+import requests
 import responses
 import urllib.parse
 
+from custom_components.tryfi.pytryfi import PyTryFi
+from custom_components.tryfi.pytryfi.common.scheduler import schedulerFor
 from custom_components.tryfi.pytryfi.common.query import (
     QUERY_PET_ACTIVE_DETAILS,
     REQUEST_FRAGMENTS_PET_ALL_INFO,
@@ -25,6 +29,38 @@ def mock_response(status_code: int) -> Mock:
     return response
 
 
+def bare_tryfi(pets: list) -> PyTryFi:
+    """A logged-in client without network setup, bases and wifi updates mocked."""
+    tryfi = PyTryFi.__new__(PyTryFi)
+    tryfi._session = requests.Session()
+    tryfi._scheduler = schedulerFor(tryfi._session)
+    tryfi._householdIds = []
+    tryfi._pendingUpdateItems = []
+    tryfi._petRetryAt = {}
+    tryfi._deferredBehavior = set()
+    tryfi._statsRequested = set()
+    tryfi._statsLock = threading.Lock()
+    tryfi._extraPlaces = ()
+    tryfi._placeIndex = None
+    tryfi._petPlaces = {}
+    tryfi._telemetry = None
+    tryfi._rollingWindows = (7, 30)
+    tryfi._rollingStats = {}
+    tryfi._resetChanges()
+    tryfi.updateBases = Mock()
+    tryfi.updateWifiNetworks = Mock()
+    tryfi._pets = pets
+    return tryfi
+
+
+def mock_pet(petId: str) -> Mock:
+    pet = Mock()
+    pet.petId = petId
+    pet.consecutiveUpdateFailures = 1
+    pet.device.supportsAdvancedBehaviorStats.return_value = False
+    return pet
+
+
 def mock_graphql(query: str, status: int, response: dict | None):
     url = f"https://api.tryfi.com/graphql?query={urllib.parse.quote_plus(query)}"
     responses.add(method=responses.GET, url=url, status=status, json={"data": response})
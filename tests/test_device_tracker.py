@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from unittest.mock import Mock
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -11,6 +12,8 @@ from homeassistant.core import HomeAssistant
 
 from custom_components.tryfi.const import DOMAIN
 from custom_components.tryfi.device_tracker import TryFiPetTracker
+from custom_components.tryfi.pytryfi.common.geo import decodePolyline
+from custom_components.tryfi.pytryfi.fiWalkTrack import FiWalkTrack
 
 
 @pytest.fixture
@@ -125,3 +128,58 @@ async def test_tracker_partial_device_data(
     # Add device without battery
     mock_pet_location.device = Mock(spec=[])
     assert tracker.battery_level is None
+
+
+async def test_tracker_walk_path(
+    hass: HomeAssistant, mock_coordinator_tracker, mock_pet_location
+) -> None:
+    """Test that the walk path is simplified as positions arrive."""
+    track = FiWalkTrack()
+    mock_pet_location.walkTrack = track
+    tracker = TryFiPetTracker(mock_coordinator_tracker, mock_pet_location, 5)
+
+    def _positions(count: int) -> list[dict]:
+        return [
+            {
+                "date": f"2024-01-01T10:{i // 60:02d}:{i % 60:02d}Z",
+                "position": {"latitude": 40.0, "longitude": -74.0 + i * 0.0001},
+            }
+            for i in range(count)
+        ]
+
+    start = datetime(2024, 1, 1, 10)
+    track.merge(start, _positions(10))
+    with patch.object(tracker, "async_write_ha_state"):
+        tracker._handle_coordinator_update()
+    # a straight line simplifies to its two ends
+    assert decodePolyline(tracker.extra_state_attributes["walk_path"]) == [
+        (40.0, -74.0),
+        (40.0, -73.9991),
+    ]
+
+    track.merge(start, _positions(10) + [
+        {"date": "2024-01-01T10:00:10Z", "position": {"latitude": 40.001, "longitude": -73.999}}
+    ])
+    with patch.object(tracker, "async_write_ha_state"):
+        tracker._handle_coordinator_update()
+    assert tracker.extra_state_attributes["walk_path_points"] == 3
+    assert "walk_path" in tracker._unrecorded_attributes
+
+    mock_pet_location.walkTrack = None
+    with patch.object(tracker, "async_write_ha_state"):
+        tracker._handle_coordinator_update()
+    assert "walk_path" not in tracker.extra_state_attributes
+
+
+async def test_tracker_location_last_updated(
+    hass: HomeAssistant, mock_coordinator_tracker, mock_pet_location
+) -> None:
+    """Test that the tracker reports when the location was last refreshed."""
+    updated = datetime(2024, 1, 1, 10, 5, tzinfo=UTC)
+    mock_pet_location.walkTrack = None
+    mock_pet_location.fieldLastUpdated = Mock(return_value=updated)
+    tracker = TryFiPetTracker(mock_coordinator_tracker, mock_pet_location)
+
+    assert tracker.extra_state_attributes == {"location_last_updated": updated}
+    mock_pet_location.fieldLastUpdated.assert_called_with("location")
+    assert "location_last_updated" in tracker._unrecorded_attributes
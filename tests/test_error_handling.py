@@ -27,6 +27,8 @@ async def test_coordinator_update_failure(hass: HomeAssistant) -> None:
 
     assert "API Error" in str(exc_info.value)
 
+    await coordinator.async_shutdown()
+
 
 async def test_sensor_missing_stats(hass: HomeAssistant) -> None:
     """Test sensor with missing statistics data."""
@@ -79,6 +81,9 @@ async def test_select_entity_errors(hass: HomeAssistant) -> None:
     coordinator.data = Mock()
     coordinator.data.session = Mock()
     coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_add_command_job = AsyncMock(
+        side_effect=lambda target, *args: target(*args)
+    )
 
     pet = Mock()
     pet.petId = "test_pet"
@@ -0,0 +1,181 @@
+"""Test the TryFi state change events."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tryfi.pytryfi.common.geo import GeoPlace
+from custom_components.tryfi.events import (
+    StateChangeEngine,
+    ThresholdRule,
+    WatchedField,
+    pet_event_engine,
+)
+
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+
+def _pet(**attributes) -> Mock:
+    pet = Mock()
+    pet.currPlaceName = attributes.get("place", "Home")
+    pet.isLost = attributes.get("lost", False)
+    pet.device.batteryPercent = attributes.get("battery", 80)
+    pet.device.connectionStateType = attributes.get("connection", "ConnectedToBase")
+    return pet
+
+
+async def test_pet_events_keep_their_payloads(hass: HomeAssistant) -> None:
+    """Test that each pet event fires with the documented payload."""
+    engine = pet_event_engine(dwell_time=0)
+    location = async_capture_events(hass, "tryfi_pet_location_changed")
+    battery = async_capture_events(hass, "tryfi_low_battery")
+    lost = async_capture_events(hass, "tryfi_lost_mode_changed")
+    connection = async_capture_events(hass, "tryfi_connection_state_changed")
+
+    engine.evaluate("pet1", "Rex", _pet())
+    assert engine.async_fire(hass) == 0
+
+    engine.evaluate(
+        "pet1",
+        "Rex",
+        _pet(place="Park", battery=15, lost=True, connection="ConnectedToCellular"),
+    )
+    assert engine.async_fire(hass) == 4
+    await hass.async_block_till_done()
+
+    assert location[0].data == {
+        "pet_id": "pet1",
+        "pet_name": "Rex",
+        "old_location": "Home",
+        "new_location": "Park",
+    }
+    assert battery[0].data == {"pet_id": "pet1", "pet_name": "Rex", "battery_level": 15}
+    assert lost[0].data == {"pet_id": "pet1", "pet_name": "Rex", "is_lost": True}
+    assert connection[0].data == {
+        "pet_id": "pet1",
+        "pet_name": "Rex",
+        "old_state": "ConnectedToBase",
+        "new_state": "ConnectedToCellular",
+        "is_connected": True,
+    }
+
+
+async def test_lost_mode_fires_on_first_reading(hass: HomeAssistant) -> None:
+    """Test that a pet already lost when first seen fires the lost mode event."""
+    engine = pet_event_engine(dwell_time=0)
+    engine.evaluate("pet1", "Rex", _pet(lost=True))
+    assert engine.async_fire(hass) == 1
+
+
+def test_threshold_rule_rearms_with_hysteresis() -> None:
+    """Test that a threshold rule fires once until the value recovers."""
+    rule = ThresholdRule("battery", "low_battery", Mock(), threshold=20, rearm_at=30)
+    assert rule.changed("pet1", None, 25, 0) is None
+    assert rule.changed("pet1", 25, 19, 0) == (25, 19)
+    assert rule.changed("pet1", 19, 21, 0) is None
+    assert rule.changed("pet1", 21, 18, 0) is None
+    assert rule.changed("pet1", 18, 30, 0) is None
+    assert rule.changed("pet1", 30, 10, 0) == (30, 10)
+
+
+async def test_flapping_connection_is_suppressed(hass: HomeAssistant) -> None:
+    """Test that a state flipping back within the dwell time fires nothing."""
+    engine = pet_event_engine(dwell_time=60)
+    events = async_capture_events(hass, "tryfi_connection_state_changed")
+
+    engine.evaluate("pet1", "Rex", _pet(), now=0)
+    engine.evaluate("pet1", "Rex", _pet(connection="ConnectedToCellular"), now=10)
+    assert engine.has_pending("pet1")
+    engine.evaluate("pet1", "Rex", _pet(), now=20)
+    engine.evaluate("pet1", "Rex", _pet(connection="ConnectedToCellular"), now=30)
+    engine.evaluate("pet1", "Rex", _pet(), now=40)
+    assert engine.async_fire(hass) == 0
+    assert not engine.has_pending("pet1")
+    assert engine.suppressed_counts["connection_state_changed"] == 2
+
+    # a change that holds for the dwell time fires once, from the last
+    # reported state
+    engine.evaluate("pet1", "Rex", _pet(connection="ConnectedToCellular"), now=50)
+    engine.evaluate("pet1", "Rex", _pet(connection="ConnectedToCellular"), now=80)
+    assert engine.async_fire(hass) == 0
+    engine.evaluate("pet1", "Rex", _pet(connection="ConnectedToCellular"), now=110)
+    assert engine.async_fire(hass) == 1
+    await hass.async_block_till_done()
+
+    assert events[0].data["old_state"] == "ConnectedToBase"
+    assert events[0].data["new_state"] == "ConnectedToCellular"
+    assert not engine.has_pending("pet1")
+
+
+class _RecordingRule:
+    """Rule that records the changes it is asked about."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.event_type = f"{field}_changed"
+        self.payload = Mock(return_value={})
+        self.suppressed = 0
+        self.calls: list[tuple] = []
+
+    def is_pending(self, key) -> bool:
+        return False
+
+    def changed(self, key, old, new, now):
+        self.calls.append((key, old, new))
+        return None
+
+    def unchanged(self, key, value, now):
+        return None
+
+
+def test_engine_only_runs_rules_of_changed_fields() -> None:
+    """Test that rules are skipped for fields that did not change."""
+    watched = _RecordingRule("watched")
+    other = _RecordingRule("other")
+    engine = StateChangeEngine(
+        [
+            WatchedField("watched", lambda subject: subject["watched"]),
+            WatchedField("other", lambda subject: subject["other"]),
+        ],
+        [watched, other],
+    )
+
+    engine.evaluate("a", "A", {"watched": 1, "other": 1})
+    watched.calls.clear()
+    other.calls.clear()
+
+    engine.evaluate("a", "A", {"watched": 2, "other": 1})
+    engine.evaluate("a", "A", {"watched": 2, "other": 1})
+
+    assert watched.calls == [("a", 1, 2)]
+    assert other.calls == []
+    assert engine.tracks("a")
+
+
+async def test_place_events_fire_per_place(hass: HomeAssistant) -> None:
+    """Test that entering and leaving places fires one event per place."""
+    home = GeoPlace("zone.home", "Home", "zone", 40.0, -74.0, 100)
+    base = GeoPlace("base1", "Living Room Base", "base", 40.0, -74.0, 50)
+    inside: dict[str, frozenset] = {"pet1": frozenset({home})}
+    engine = pet_event_engine(dwell_time=0, places=lambda pet: inside["pet1"])
+    entered = async_capture_events(hass, "tryfi_place_entered")
+    left = async_capture_events(hass, "tryfi_place_left")
+
+    engine.evaluate("pet1", "Rex", _pet())
+    assert engine.async_fire(hass) == 0
+
+    inside["pet1"] = frozenset({base})
+    engine.evaluate("pet1", "Rex", _pet())
+    assert engine.async_fire(hass) == 2
+    await hass.async_block_till_done()
+
+    assert entered[0].data == {
+        "pet_id": "pet1",
+        "pet_name": "Rex",
+        "place_id": "base1",
+        "place_name": "Living Room Base",
+        "place_type": "base",
+    }
+    assert left[0].data["place_id"] == "zone.home"
@@ -0,0 +1,74 @@
+"""Test the TryFi executor."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from custom_components.tryfi.const import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from custom_components.tryfi.executor import TryFiExecutor
+
+
+def test_interactive_jobs_run_before_queued_polls() -> None:
+    """Test that a command queued behind polls is started first."""
+    executor = TryFiExecutor("tryfi_test", max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+    order: list[str] = []
+
+    def _block() -> None:
+        started.set()
+        release.wait()
+
+    blocker = executor.submit(PRIORITY_BACKGROUND, _block)
+    started.wait(timeout=5)
+    polls = [
+        executor.submit(PRIORITY_BACKGROUND, order.append, f"poll{i}") for i in range(3)
+    ]
+    command = executor.submit(PRIORITY_INTERACTIVE, order.append, "command")
+    assert executor.queue_depth == 4
+
+    release.set()
+    for future in [blocker, *polls, command]:
+        future.result(timeout=5)
+
+    assert order == ["command", "poll0", "poll1", "poll2"]
+    assert executor.queue_depth == 0
+    executor.shutdown()
+
+
+def test_shutdown_cancels_queued_jobs() -> None:
+    """Test that shutdown cancels work that has not started."""
+    executor = TryFiExecutor("tryfi_test", max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def _block() -> None:
+        started.set()
+        release.wait()
+
+    running = executor.submit(PRIORITY_BACKGROUND, _block)
+    queued = executor.submit(PRIORITY_BACKGROUND, lambda: None)
+    started.wait(timeout=5)
+
+    release.set()
+    executor.shutdown()
+
+    running.result(timeout=5)
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(PRIORITY_BACKGROUND, lambda: None)
+
+
+async def test_async_submit_propagates_errors() -> None:
+    """Test that exceptions raised in the executor reach the caller."""
+    executor = TryFiExecutor("tryfi_test")
+
+    def _fail() -> None:
+        raise ValueError("boom")
+
+    assert await executor.async_submit(PRIORITY_BACKGROUND, lambda: 42) == 42
+    with pytest.raises(ValueError, match="boom"):
+        await executor.async_submit(PRIORITY_INTERACTIVE, _fail)
+    executor.shutdown()
@@ -0,0 +1,260 @@
+"""Test the TryFi history export."""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.tryfi import (
+    TryFiDataUpdateCoordinator,
+    async_setup_services,
+)
+from custom_components.tryfi.const import DOMAIN, EXPORT_DIR
+from custom_components.tryfi.export import (
+    EXPORT_COLUMNS,
+    feed_chunks,
+    telemetry_chunks,
+    write_export,
+)
+from custom_components.tryfi.pytryfi.fiHistory import (
+    FiFeedPaginator,
+    parseActivitySummary,
+)
+from custom_components.tryfi.pytryfi.fiTelemetryStore import (
+    FiTelemetrySample,
+    FiTelemetryStore,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+START = datetime(2024, 5, 1, tzinfo=dt_util.UTC)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Return a telemetry store holding a sample a minute for ten minutes."""
+    store = FiTelemetryStore(str(tmp_path / "telemetry.db"))
+    store._pending = [
+        FiTelemetrySample(
+            "Pet-1", START.timestamp() + i * 60, 40 + i, -74.0, 80, "ConnectedToBase", None
+        )
+        for i in range(10)
+    ]
+    store.flush()
+    yield store
+    store.close()
+
+
+def _chunked(store: FiTelemetryStore, size: int) -> SimpleNamespace:
+    """Return a TryFi client reading the store in chunks of the given size."""
+    return SimpleNamespace(
+        telemetryStore=SimpleNamespace(
+            iterQuery=lambda *args: store.iterQuery(*args, chunkSize=size)
+        )
+    )
+
+
+def _feed(days: int) -> SimpleNamespace:
+    """Return a TryFi client whose activity feed has a summary per day."""
+    summaries = [
+        {
+            "start": (START - timedelta(days=i)).isoformat(),
+            "end": (START - timedelta(days=i - 1)).isoformat(),
+            "totalSteps": 1000 + i,
+            "totalDistance": 500.0,
+            "stepGoal": 8000,
+        }
+        for i in range(days)
+    ]
+    fetches = []
+
+    def fetch_page(cursor, limit):
+        fetches.append(cursor)
+        first = int(cursor or 0)
+        return {
+            "cursor": str(first + limit),
+            "activitySummaries": summaries[first : first + limit],
+        }
+
+    def activity_history(pet_id):
+        return FiFeedPaginator(
+            fetch_page, parseActivitySummary, "activitySummaries", pageSize=3
+        )
+
+    return SimpleNamespace(activityHistory=activity_history, fetches=fetches)
+
+
+def test_telemetry_is_written_in_chunks(tmp_path, store) -> None:
+    """Test telemetry streams to CSV one chunk at a time."""
+    path = str(tmp_path / "out" / "telemetry.csv")
+    progress = []
+
+    rows = write_export(
+        telemetry_chunks(
+            _chunked(store, 4),
+            "Pet-1",
+            START + timedelta(minutes=1),
+            START + timedelta(hours=1),
+        ),
+        EXPORT_COLUMNS["telemetry"],
+        path,
+        "csv",
+        progress.append,
+    )
+
+    assert rows == 9
+    assert progress == [4, 8, 9]
+    with open(path, newline="", encoding="utf-8") as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == [name for name, _ in EXPORT_COLUMNS["telemetry"]]
+    assert lines[1] == [
+        "2024-05-01T00:01:00+00:00",
+        "41.0",
+        "-74.0",
+        "80",
+        "ConnectedToBase",
+        "",
+    ]
+    assert len(lines) == 10
+
+
+def test_telemetry_needs_a_store(tmp_path) -> None:
+    """Test exporting telemetry fails cleanly without a store."""
+    path = tmp_path / "telemetry.csv"
+    with pytest.raises(HomeAssistantError):
+        write_export(
+            telemetry_chunks(
+                SimpleNamespace(telemetryStore=None), "Pet-1", START, START
+            ),
+            EXPORT_COLUMNS["telemetry"],
+            str(path),
+            "csv",
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_feed_stops_before_start(tmp_path) -> None:
+    """Test a feed export stops paging once it is past the requested range."""
+    tryfi = _feed(30)
+    path = str(tmp_path / "activity.csv")
+
+    rows = write_export(
+        feed_chunks(tryfi, "activity", "Pet-1", START - timedelta(days=4)),
+        EXPORT_COLUMNS["activity"],
+        path,
+        "csv",
+    )
+
+    assert rows == 5
+    assert tryfi.fetches == [None, "3"]
+    with open(path, newline="", encoding="utf-8") as file:
+        assert [line[2] for line in csv.reader(file)][1:] == [
+            "1000",
+            "1001",
+            "1002",
+            "1003",
+            "1004",
+        ]
+
+
+def test_parquet_row_groups(tmp_path, store) -> None:
+    """Test a Parquet export writes a row group per chunk."""
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "telemetry.parquet")
+
+    rows = write_export(
+        telemetry_chunks(
+            _chunked(store, 4),
+            "Pet-1",
+            START,
+            START + timedelta(hours=1),
+        ),
+        EXPORT_COLUMNS["telemetry"],
+        path,
+        "parquet",
+    )
+
+    assert rows == 10
+    file = parquet.ParquetFile(path)
+    assert file.metadata.num_row_groups == 3
+    assert file.read().column("latitude").to_pylist()[-1] == 49
+
+
+async def test_export_history_service(hass, tmp_path, store) -> None:
+    """Test the service exports a pet's telemetry and reports the row count."""
+    tryfi = SimpleNamespace(
+        pets=[SimpleNamespace(petId="Pet-1", name="Rex")], telemetryStore=store
+    )
+    coordinator = TryFiDataUpdateCoordinator(hass, tryfi, 30)
+    coordinator.data = tryfi
+    hass.data[DOMAIN] = {"entry": coordinator}
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    await async_setup_services(hass)
+    progress = []
+    hass.bus.async_listen(f"{DOMAIN}_export_progress", progress.append)
+    path = str(tmp_path / "rex.csv")
+
+    with patch(
+        "custom_components.tryfi.dt_util.utcnow",
+        return_value=START + timedelta(hours=1),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {"pet": "Rex", "days": 1, "path": path},
+            blocking=True,
+            return_response=True,
+        )
+    await hass.async_block_till_done()
+
+    assert response == {"path": path, "rows": 10}
+    assert progress[-1].data["rows"] == 10
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {"pet": "Rex", "path": "/etc/rex.csv"},
+            blocking=True,
+            return_response=True,
+        )
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, "export_history", {"pet": "Fido"}, blocking=True
+        )
+    await coordinator.async_shutdown()
+
+
+async def test_export_history_default_path(hass, tmp_path, store) -> None:
+    """Test the default export directory needs no allowlisting."""
+    tryfi = SimpleNamespace(
+        pets=[SimpleNamespace(petId="Pet-1", name="Rex")], telemetryStore=store
+    )
+    coordinator = TryFiDataUpdateCoordinator(hass, tryfi, 30)
+    coordinator.data = tryfi
+    hass.data[DOMAIN] = {"entry": coordinator}
+    hass.config.config_dir = str(tmp_path)
+    hass.config.allowlist_external_dirs = set()
+    await async_setup_services(hass)
+
+    with patch(
+        "custom_components.tryfi.dt_util.utcnow",
+        return_value=START + timedelta(hours=1),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {"pet": "Rex", "days": 1},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response == {
+        "path": str(tmp_path / EXPORT_DIR / "Pet-1_telemetry_20240501010000.csv"),
+        "rows": 10,
+    }
+    await coordinator.async_shutdown()
@@ -2,20 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 import pytest
+import responses
 
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
 
 from custom_components.tryfi import (
     TryFiDataUpdateCoordinator,
+    async_remove_config_entry_device,
     async_setup_entry,
 )
 from custom_components.tryfi.const import DOMAIN
+from custom_components.tryfi.coordinator import wifi_network_context
+from custom_components.tryfi.pytryfi.exceptions import RequestCancelledError
+from custom_components.tryfi.sensor import PetGenericSensor
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from .pytryfi.utils import (
+    GRAPHQL_BASE,
+    GRAPHQL_PARTIAL_PET,
+    bare_tryfi,
+    mock_household_with_pets,
+    mock_login_requests,
+    mock_pet,
+)
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    MockEntityPlatform,
+    async_fire_time_changed,
+)
 
 
 @pytest.fixture
@@ -74,8 +99,11 @@ async def test_coordinator_update_success(hass: HomeAssistant, mock_pytryfi) ->
     result = await coordinator._async_update_data()
 
     assert result == mock_pytryfi
+    mock_pytryfi.update.assert_called_once_with(24.0, False)
     mock_pytryfi.update.assert_called_once()
 
+    await coordinator.async_shutdown()
+
 
 async def test_coordinator_update_failure(hass: HomeAssistant, mock_pytryfi) -> None:
     """Test coordinator update failure."""
@@ -85,3 +113,493 @@ async def test_coordinator_update_failure(hass: HomeAssistant, mock_pytryfi) ->
 
     with pytest.raises(Exception, match="API Error"):
         await coordinator._async_update_data()
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_stretches_interval_on_overrun(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that sustained overruns are counted and stretch the interval."""
+    now = [0.0]
+    update_duration = [20.0]
+
+    def _slow_update(budget=None, include_pets=True) -> None:
+        now[0] += update_duration[0]
+
+    mock_pytryfi.update.side_effect = _slow_update
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 10)
+
+    with patch(
+        "custom_components.tryfi.coordinator.monotonic", side_effect=lambda: now[0]
+    ):
+        # Each update takes 20s against a 10s polling interval
+        for _ in range(3):
+            now[0] += 1000
+            await coordinator._async_update_data()
+
+        assert coordinator.last_update_duration == 20
+        assert coordinator.overrun_count == 3
+        assert coordinator.update_interval.total_seconds() == 30
+
+        # A fast update steps the interval back towards the configured rate
+        update_duration[0] = 1
+        now[0] += 1000
+        await coordinator._async_update_data()
+
+    assert coordinator.overrun_count == 3
+    assert coordinator.update_interval.total_seconds() == 15
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_skips_tick_after_overrun(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that a refresh right after an overrunning cycle is skipped."""
+    now = [0.0]
+
+    def _slow_update(budget=None, include_pets=True) -> None:
+        now[0] += 20
+
+    mock_pytryfi.update.side_effect = _slow_update
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 10)
+
+    with patch(
+        "custom_components.tryfi.coordinator.monotonic", side_effect=lambda: now[0]
+    ):
+        await coordinator._async_update_data()
+        now[0] += 5
+        await coordinator._async_update_data()
+        now[0] += 30
+        await coordinator._async_update_data()
+
+    assert mock_pytryfi.update.call_count == 2
+    assert coordinator.skipped_update_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_merges_concurrent_refreshes(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that a refresh requested during an update shares its result."""
+    release = threading.Event()
+    mock_pytryfi.update.side_effect = lambda budget=None, include_pets=True: release.wait(timeout=5)
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+
+    first = hass.async_create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    second = hass.async_create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first is mock_pytryfi
+    assert await second is mock_pytryfi
+    mock_pytryfi.update.assert_called_once()
+
+    await coordinator.async_shutdown()
+
+
+async def test_pet_coordinator_failure_is_isolated(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that a failing pet backs off without affecting other pets."""
+    mock_pytryfi.pets = [Mock(petId="pet1"), Mock(petId="pet2")]
+
+    def _update_pet(pet_id, budget=None):
+        if pet_id == "pet1":
+            raise Exception("collar offline")
+        return True
+
+    mock_pytryfi.updatePet = Mock(side_effect=_update_pet)
+    mock_pytryfi.petRetryIn = Mock(return_value=5.0)
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    with patch.object(coordinator, "check_pet_state_changes") as check:
+        await coordinator.async_refresh_pets()
+
+        failing = coordinator.pet_coordinator("pet1")
+        healthy = coordinator.pet_coordinator("pet2")
+        assert not failing.last_update_success
+        assert failing.update_interval == timedelta(seconds=5)
+        assert healthy.last_update_success
+        assert healthy.update_interval == timedelta(seconds=30)
+        mock_pytryfi.updatePet.assert_any_call("pet2", 24.0)
+        check.assert_called_once_with(mock_pytryfi.getPet.return_value)
+
+        # a successful update restores the configured interval
+        mock_pytryfi.updatePet.side_effect = None
+        mock_pytryfi.updatePet.return_value = False
+        await failing.async_refresh()
+        assert failing.last_update_success
+        assert failing.update_interval == timedelta(seconds=30)
+
+    await coordinator.async_shutdown()
+
+
+async def test_pet_coordinator_merges_refreshes_and_reports_duration(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that pet refreshes share a running update and count as overruns."""
+    release = threading.Event()
+    mock_pytryfi.getPet.return_value = None
+    mock_pytryfi.updatePet = Mock(
+        side_effect=lambda pet_id, budget=None: release.wait(timeout=5)
+    )
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+
+    with patch(
+        "custom_components.tryfi.coordinator.monotonic", side_effect=[0, 45]
+    ):
+        first = hass.async_create_task(pet_coordinator._async_update_data())
+        await asyncio.sleep(0)
+        second = hass.async_create_task(pet_coordinator._async_update_data())
+        await asyncio.sleep(0)
+        release.set()
+        assert await first is mock_pytryfi
+        assert await second is mock_pytryfi
+
+    mock_pytryfi.updatePet.assert_called_once()
+    assert coordinator.pet_update_durations == {"pet1": 45}
+    assert coordinator.overrun_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_pet_coordinator_keeps_data_when_cancelled(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that a poll cancelled by a command is not reported as a failure."""
+    mock_pytryfi.getPet.return_value = None
+    mock_pytryfi.updatePet = Mock(side_effect=RequestCancelledError("lost mode"))
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+    listener = Mock()
+    pet_coordinator.async_add_listener(listener)
+
+    await pet_coordinator.async_refresh()
+
+    assert pet_coordinator.last_update_success
+    assert listener.call_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_pet_coordinator_notifies_only_on_changes(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that pet entities are only woken when their pet changed."""
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+    assert coordinator.pet_coordinator("pet1") is pet_coordinator
+    listener = Mock()
+    pet_coordinator.async_add_listener(listener)
+
+    mock_pytryfi.getPet.return_value = None
+    mock_pytryfi.updatePet = Mock(return_value=True)
+    await pet_coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    mock_pytryfi.updatePet.return_value = False
+    await pet_coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    await pet_coordinator.async_add_command_job(lambda: None)
+    await pet_coordinator.async_refresh()
+    assert listener.call_count == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_only_on_changes(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that listeners are skipped when PyTryFi reports no changes."""
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    # a steady update duration leaves the account diagnostics unchanged
+    with patch("custom_components.tryfi.coordinator.monotonic", return_value=0):
+        mock_pytryfi.hasChanges = True
+        await coordinator.async_refresh()
+        assert listener.call_count == 1
+
+        mock_pytryfi.hasChanges = False
+        await coordinator.async_refresh()
+        assert listener.call_count == 1
+
+    # commands change pets in place, so the following refresh always notifies
+    await coordinator.async_add_command_job(lambda: None)
+    await coordinator.async_refresh()
+    assert listener.call_count == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_diagnostics_on_change(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that account-wide listeners follow the diagnostics of unchanged data."""
+    mock_pytryfi.hasChanges = False
+    mock_pytryfi.changedPetIds = set()
+    mock_pytryfi.changedBaseIds = set()
+    mock_pytryfi.changedWifiSsids = set()
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    account_listener = Mock()
+    pet_listener = Mock()
+    coordinator.async_add_listener(account_listener)
+    coordinator.async_add_listener(pet_listener, "pet1")
+
+    with patch(
+        "custom_components.tryfi.coordinator.monotonic", side_effect=[0, 1, 0, 1, 0, 2]
+    ):
+        await coordinator.async_refresh()
+        account_listener.reset_mock()
+        pet_listener.reset_mock()
+
+        # same duration, nothing to show
+        await coordinator.async_refresh()
+        account_listener.assert_not_called()
+
+        # a new duration reaches the diagnostic sensors, not the pets
+        await coordinator.async_refresh()
+        account_listener.assert_called_once()
+        pet_listener.assert_not_called()
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_only_changed_contexts(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that only entities of changed pets, bases and networks are woken."""
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    listeners = {
+        context: Mock()
+        for context in ("pet1", "pet2", "base1", wifi_network_context("home"), None)
+    }
+    for context, listener in listeners.items():
+        coordinator.async_add_listener(listener, context)
+
+    mock_pytryfi.hasChanges = True
+    mock_pytryfi.changedPetIds = {"pet1"}
+    mock_pytryfi.changedBaseIds = set()
+    mock_pytryfi.changedWifiSsids = {"home"}
+    await coordinator.async_refresh()  # first refresh notifies everyone
+    for listener in listeners.values():
+        listener.reset_mock()
+
+    await coordinator.async_refresh()
+
+    assert listeners["pet1"].called
+    assert listeners[wifi_network_context("home")].called
+    assert listeners[None].called
+    assert not listeners["pet2"].called
+    assert not listeners["base1"].called
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_tracks_zones(hass: HomeAssistant, mock_pytryfi) -> None:
+    """Test that Home Assistant zones are passed to PyTryFi as extra places."""
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    hass.states.async_set(
+        "zone.park", "0", {"latitude": 40.0, "longitude": -74.0, "radius": 150}
+    )
+    unsub = coordinator.async_track_zones()
+    places = mock_pytryfi.setExtraPlaces.call_args[0][0]
+    assert [(p.placeId, p.kind, p.radius) for p in places] == [("zone.park", "zone", 150)]
+
+    hass.states.async_set(
+        "zone.vet", "0", {"latitude": 40.1, "longitude": -74.1, "radius": 50}
+    )
+    await hass.async_block_till_done()
+    places = mock_pytryfi.setExtraPlaces.call_args[0][0]
+    assert {p.placeId for p in places} == {"zone.park", "zone.vet"}
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_zone_change_updates_nearest_place(hass: HomeAssistant) -> None:
+    """Test that a zone change re-locates the pets and updates their sensors."""
+    pet = mock_pet("pet1")
+    pet.name = "Rex"
+    pet.currLatitude = 40.0
+    pet.currLongitude = -74.0
+    tryfi = bare_tryfi([pet])
+    tryfi._bases = []
+    tryfi._wifiNetworks = []
+    coordinator = TryFiDataUpdateCoordinator(hass, tryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+    hass.states.async_set(
+        "zone.park", "0", {"latitude": 40.0, "longitude": -74.0, "radius": 150, "friendly_name": "Park"}
+    )
+    unsub = coordinator.async_track_zones()
+
+    sensor = PetGenericSensor(pet_coordinator, pet, "nearest_place")
+    sensor.hass = hass
+    sensor.platform = MockEntityPlatform(hass)
+    sensor.entity_id = "sensor.rex_nearest_place"
+    await sensor.async_added_to_hass()
+    sensor.async_write_ha_state()
+    assert hass.states.get("sensor.rex_nearest_place").state == "Park"
+
+    hass.states.async_set(
+        "zone.vet", "0", {"latitude": 40.0, "longitude": -74.0001, "radius": 50, "friendly_name": "Vet"}
+    )
+    hass.states.async_set(
+        "zone.park", "0", {"latitude": 41.0, "longitude": -74.0, "radius": 150, "friendly_name": "Park"}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.rex_nearest_place").state == "Vet"
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_maintains_telemetry(hass: HomeAssistant, mock_pytryfi) -> None:
+    """Test that the telemetry store is attached and trimmed on an interval."""
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    store = Mock()
+    store.purge.return_value = 0
+    store.downsample.return_value = 0
+    unsub = coordinator.async_track_telemetry(store, 7)
+    mock_pytryfi.setTelemetryStore.assert_called_once_with(store)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1, seconds=1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    before = store.purge.call_args[0][0]
+    assert before == pytest.approx(time.time() - 7 * 86400, abs=5)
+    store.downsample.assert_called_once()
+
+    unsub()
+    store.close.assert_not_called()
+
+    # the store stays attached until every update has finished
+    calls = []
+    mock_pytryfi.setTelemetryStore.side_effect = lambda store: calls.append("detach")
+    store.close.side_effect = lambda: calls.append("close")
+    shutdown = coordinator.executor.shutdown
+
+    def _shutdown() -> None:
+        shutdown()
+        calls.append("executor")
+
+    with patch.object(coordinator.executor, "shutdown", side_effect=_shutdown):
+        await coordinator.async_shutdown()
+    assert calls == ["executor", "detach", "close"]
+
+
+async def test_pet_coordinator_slows_down_for_resting_pet(
+    hass: HomeAssistant, mock_pytryfi
+) -> None:
+    """Test that a resting pet with ample battery is polled less often."""
+    pet = Mock(petId="pet1", activityType="OngoingRest", isLost=False)
+    pet.device.batteryPercent = 80
+    pet.device.batteryTimeToEmpty = None
+    mock_pytryfi.getPet.return_value = pet
+    mock_pytryfi.updatePet = Mock(return_value=False)
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+
+    with patch.object(coordinator, "check_pet_state_changes"):
+        await pet_coordinator.async_refresh()
+        assert pet_coordinator.update_interval == timedelta(seconds=120)
+
+        # the collar is expected to run out within a day
+        pet.device.batteryTimeToEmpty = 20 * 3600
+        await pet_coordinator.async_refresh()
+        assert pet_coordinator.update_interval == timedelta(seconds=30)
+
+        pet.device.batteryTimeToEmpty = 5 * 86400
+        pet.activityType = "OngoingWalk"
+        await pet_coordinator.async_refresh()
+        assert pet_coordinator.update_interval == timedelta(seconds=30)
+
+        pet.activityType = "OngoingRest"
+        pet.device.batteryPercent = 30
+        await pet_coordinator.async_refresh()
+        assert pet_coordinator.update_interval == timedelta(seconds=30)
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_refreshes_totals_around_midnight(
+    hass: HomeAssistant, mock_pytryfi, freezer
+) -> None:
+    """Test that pet totals are requested just before and after local midnight."""
+    # Away from midnight, so today's triggers are not due while firing tomorrow's
+    freezer.move_to(dt_util.start_of_local_day() + timedelta(hours=12))
+    mock_pytryfi.updatePet = Mock(return_value=False)
+    mock_pytryfi.getPet.return_value = None
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    pet_coordinator = coordinator.pet_coordinator("pet1")
+    unsub = coordinator.async_track_period_rollover()
+    midnight = dt_util.start_of_local_day() + timedelta(days=1)
+
+    async_fire_time_changed(hass, midnight - timedelta(seconds=30))
+    await hass.async_block_till_done()
+    mock_pytryfi.requestStatsRefresh.assert_called_once_with()
+
+    with patch.object(pet_coordinator, "async_request_refresh") as refresh:
+        async_fire_time_changed(hass, midnight + timedelta(seconds=30))
+        await hass.async_block_till_done()
+        refresh.assert_called_once()
+    assert mock_pytryfi.requestStatsRefresh.call_count == 2
+
+    unsub()
+    async_fire_time_changed(hass, midnight + timedelta(days=1, seconds=30))
+    await hass.async_block_till_done()
+    assert mock_pytryfi.requestStatsRefresh.call_count == 2
+    await coordinator.async_shutdown()
+
+
+async def test_account_device_cannot_be_removed(
+    hass: HomeAssistant, mock_pytryfi, mock_config_entry
+) -> None:
+    """Test that the account device is kept while stale pet devices can go."""
+    mock_pytryfi.wifiNetworks = []
+    coordinator = TryFiDataUpdateCoordinator(hass, mock_pytryfi, 30)
+    coordinator.data = mock_pytryfi
+    hass.data[DOMAIN] = {mock_config_entry.entry_id: coordinator}
+
+    account = Mock(identifiers={(DOMAIN, mock_config_entry.entry_id)}, model="TryFi")
+    account.name = "TryFi Account"
+    stale = Mock(identifiers={(DOMAIN, "gone-pet")}, model="TryFi")
+    stale.name = "Rex"
+    assert not await async_remove_config_entry_device(hass, mock_config_entry, account)
+    assert await async_remove_config_entry_device(hass, mock_config_entry, stale)
+    await coordinator.async_shutdown()
+
+
+@responses.activate
+async def test_pet_failing_first_refresh_starts_unavailable(
+    hass: HomeAssistant, mock_config_entry, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that a pet whose first poll fails still gets its entities."""
+    mock_login_requests()
+    mock_household_with_pets(pets=[GRAPHQL_PARTIAL_PET], bases=[GRAPHQL_BASE])
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.tryfi.pytryfi.PyTryFi.updatePet",
+        side_effect=Exception("collar offline"),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert "Error adding entity" not in caplog.text
+    assert hass.states.get("device_tracker.buddy_tracker").state == STATE_UNAVAILABLE
+    assert hass.states.get("sensor.buddy_daily_steps").state == STATE_UNAVAILABLE
+    assert hass.states.get("select.buddy_lost_mode").state == STATE_UNAVAILABLE
+
+    # the pet's entities come back once its poll succeeds
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    await coordinator.pet_coordinator("test-pet").async_refresh()
+    assert hass.states.get("sensor.buddy_daily_steps").state != STATE_UNAVAILABLE
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
@@ -85,6 +85,9 @@ def mock_coordinator_with_light(mock_pet_with_light):
     coordinator.data.getPet = Mock(return_value=mock_pet_with_light)
     coordinator.data.session = Mock()
     coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_add_command_job = AsyncMock(
+        side_effect=lambda target, *args: target(*args)
+    )
     return coordinator
 
 
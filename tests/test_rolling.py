@@ -0,0 +1,61 @@
+"""Test the TryFi rolling averages."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.tryfi.rolling import TryFiRollingStats, parse_rolling_windows
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from tests.pytryfi.utils import bare_tryfi, mock_pet
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=dt_util.UTC)
+
+
+def test_parse_rolling_windows() -> None:
+    """Test the windows option is parsed into sorted distinct days."""
+    assert parse_rolling_windows("30, 7,7") == (7, 30)
+    assert parse_rolling_windows("14,") == (14,)
+
+
+async def test_aggregates_survive_a_restart(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the stored days rebuild the aggregates after a restart."""
+    pet = mock_pet("pet")
+    pet.dailySteps, pet.dailyGoal, pet.dailySleep = 6000, 5000, 36000
+    rolling = TryFiRollingStats(hass, "entry", bare_tryfi([pet]), (7,))
+    await rolling.async_load()
+
+    assert not rolling.async_record("pet", NOW)
+    assert rolling.async_record("pet", NOW + timedelta(days=1))
+    await rolling.async_save()
+    assert hass_storage["tryfi.entry.rolling"]["data"]["pets"]["pet"]["history"] == [
+        [dt_util.as_local(NOW).date().isoformat(), 6000, 5000, 36000]
+    ]
+
+    tryfi = bare_tryfi([pet])
+    restarted = TryFiRollingStats(hass, "entry", tryfi, (7,))
+    await restarted.async_load()
+    window = tryfi.rollingStats("pet").window("steps", 7)
+    assert (window.count, window.mean, window.goalRate) == (1, 6000, 1)
+
+
+async def test_saves_once_per_day(hass: HomeAssistant) -> None:
+    """Test the store is only scheduled when a pet's day changes."""
+    pet = mock_pet("pet")
+    pet.dailySteps, pet.dailyGoal, pet.dailySleep = 6000, 5000, 36000
+    rolling = TryFiRollingStats(hass, "entry", bare_tryfi([pet]), (7,))
+    await rolling.async_load()
+
+    with patch.object(rolling._store, "async_delay_save") as delay_save:
+        rolling.async_record("pet", NOW)
+        rolling.async_record("pet", NOW + timedelta(minutes=1))
+        rolling.async_record("pet", NOW + timedelta(minutes=2))
+        assert delay_save.call_count == 1
+
+        assert rolling.async_record("pet", NOW + timedelta(days=1))
+        assert delay_save.call_count == 2
@@ -34,6 +34,9 @@ def mock_coordinator_select(mock_pet_lost_mode):
     coordinator.data.getPet = Mock(return_value=mock_pet_lost_mode)
     coordinator.data.session = Mock()
     coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_add_command_job = AsyncMock(
+        side_effect=lambda target, *args: target(*args)
+    )
     return coordinator
 
 
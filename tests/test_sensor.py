@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import UTC, date, datetime
 from unittest.mock import Mock
 
 import pytest
@@ -13,11 +14,24 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 
 from custom_components.tryfi.const import DOMAIN
+from custom_components.tryfi.pytryfi.fiRollingStats import (
+    FiDailyTotals,
+    FiRollingStats,
+)
+from custom_components.tryfi.pytryfi.fiBehaviorStats import (
+    BehaviorPeriod,
+    BehaviorType,
+    FiBehaviorStats,
+)
 from custom_components.tryfi.sensor import (
+    PetBehaviorSensor,
+    PetGoalCompletionSensor,
     PetGenericSensor,
+    PetRollingAverageSensor,
     PetSleepQualitySensor,
     PetStatsSensor,
     TryFiBatterySensor,
+    TryFiBatteryTimeToEmptySensor,
     TryFiBaseSensor,
 )
 
@@ -76,6 +90,59 @@ async def test_battery_sensor(
     assert sensor.icon == "mdi:battery-alert"
 
 
+async def test_battery_time_to_empty_sensor(
+    hass: HomeAssistant, mock_coordinator, mock_pet_with_stats
+) -> None:
+    """Test the collar battery time to empty sensor."""
+    mock_coordinator.data.getPet.return_value = mock_pet_with_stats
+    mock_pet_with_stats.device.batteryTimeToEmpty = 90000
+
+    sensor = TryFiBatteryTimeToEmptySensor(mock_coordinator, mock_pet_with_stats)
+
+    assert sensor.unique_id == "test_pet_123-battery-time-to-empty"
+    assert sensor.name == "Fido Collar Battery Time to Empty"
+    assert sensor.native_value == 25
+    assert sensor.native_unit_of_measurement == UnitOfTime.HOURS
+    assert sensor.icon == "mdi:battery-clock"
+
+    # unknown while charging or still learning the discharge rate
+    mock_pet_with_stats.device.batteryTimeToEmpty = None
+    assert sensor.native_value is None
+
+
+async def test_rolling_average_sensors(
+    hass: HomeAssistant, mock_coordinator, mock_pet_with_stats
+) -> None:
+    """Test the rolling step, sleep and goal completion sensors."""
+    stats = FiRollingStats((7,))
+    for day, steps in enumerate((4000, 6000, 8000, 0)):
+        stats.observe(FiDailyTotals(date(2024, 5, day + 1), steps, 5000, 36000))
+    mock_coordinator.data.getPet.return_value = mock_pet_with_stats
+    mock_coordinator.data.rollingStats.return_value = None
+
+    steps = PetRollingAverageSensor(mock_coordinator, mock_pet_with_stats, "steps", 7)
+    sleep = PetRollingAverageSensor(mock_coordinator, mock_pet_with_stats, "sleep", 7)
+    goal = PetGoalCompletionSensor(mock_coordinator, mock_pet_with_stats, 7)
+    assert steps.unique_id == "test_pet_123-steps-7-day-average"
+    assert steps.name == "Fido Steps 7 Day Average"
+    assert goal.name == "Fido Goal Completion 7 Day"
+    # no day has been completed yet
+    assert steps.native_value is None
+    assert steps.extra_state_attributes == {"days": 0}
+
+    mock_coordinator.data.rollingStats.return_value = stats
+    assert steps.native_value == 6000
+    assert steps.extra_state_attributes == {
+        "days": 3,
+        "stddev": 2000,
+        "min": 4000,
+        "max": 8000,
+    }
+    assert sleep.native_value == 600
+    assert sleep.native_unit_of_measurement == UnitOfTime.MINUTES
+    assert goal.native_value == 66.7
+
+
 async def test_stats_sensor(
     hass: HomeAssistant, mock_coordinator, mock_pet_with_stats
 ) -> None:
@@ -201,3 +268,49 @@ async def test_sleep_quality_sensor_with_none_values(
     assert sensor.name == "Fido Sleep Quality Score"
     assert sensor.native_value == 0
     assert sensor.icon == "mdi:sleep"
+
+
+async def test_behavior_sensor(
+    hass: HomeAssistant, mock_coordinator, mock_pet_with_stats
+) -> None:
+    """Test behavior sensors read their slot of the pet's behavior table."""
+    stats = FiBehaviorStats()
+    stats.set(BehaviorPeriod.WEEKLY, BehaviorType.LICKING, 12, 30)
+    mock_pet_with_stats.behaviorStats = stats
+    mock_coordinator.data.getPet.return_value = mock_pet_with_stats
+
+    count = PetBehaviorSensor(mock_coordinator, mock_pet_with_stats, "licking", "count", "weekly")
+    duration = PetBehaviorSensor(mock_coordinator, mock_pet_with_stats, "licking", "duration", "weekly")
+    daily = PetBehaviorSensor(mock_coordinator, mock_pet_with_stats, "licking", "count", "daily")
+
+    assert count.unique_id == "tryfi-pet-test_pet_123-weekly-licking-count"
+    assert count.native_value == 12
+    assert duration.native_value == 30
+    assert daily.native_value == 0
+
+
+async def test_pet_sensor_last_updated(
+    hass: HomeAssistant, mock_coordinator, mock_pet_with_stats
+) -> None:
+    """Test pet sensors report when their group of fields was last refreshed."""
+    updated = {
+        "stats": datetime(2024, 1, 1, 10, tzinfo=UTC),
+        "sleep": datetime(2024, 1, 1, 9, tzinfo=UTC),
+        "behavior": datetime(2024, 1, 1, 8, tzinfo=UTC),
+    }
+    mock_pet_with_stats.fieldLastUpdated = Mock(side_effect=updated.get)
+    mock_pet_with_stats.behaviorStats = FiBehaviorStats()
+    mock_coordinator.data.getPet.return_value = mock_pet_with_stats
+
+    steps = PetStatsSensor(mock_coordinator, mock_pet_with_stats, "STEPS", "DAILY")
+    nap = PetStatsSensor(mock_coordinator, mock_pet_with_stats, "NAP", "WEEKLY")
+    quality = PetSleepQualitySensor(mock_coordinator, mock_pet_with_stats)
+    behavior = PetBehaviorSensor(mock_coordinator, mock_pet_with_stats, "licking", "count")
+
+    assert steps.extra_state_attributes == {"last_updated": updated["stats"]}
+    assert nap.extra_state_attributes == {"last_updated": updated["sleep"]}
+    assert quality.extra_state_attributes == {"last_updated": updated["sleep"]}
+    assert behavior.extra_state_attributes == {"last_updated": updated["behavior"]}
+
+    mock_coordinator.data.getPet.return_value = None
+    assert steps.extra_state_attributes is None
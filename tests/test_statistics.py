@@ -0,0 +1,189 @@
+"""Test the TryFi long-term statistics import."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.tryfi.pytryfi.fiHistory import (
+    FiFeedPaginator,
+    parseActivitySummary,
+    parseRestSummary,
+)
+from custom_components.tryfi.statistics import TryFiStatisticsImporter
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+START = datetime(2024, 5, 1, 15, 10, tzinfo=dt_util.UTC)
+
+
+def _pet(steps: int, distance: float = 0) -> SimpleNamespace:
+    return SimpleNamespace(
+        petId="Pet-1",
+        name="Rex",
+        dailySteps=steps,
+        dailyTotalDistance=distance,
+        dailySleep=None,
+        dailyNap=None,
+    )
+
+
+def _rows(add_statistics, statistic_id: str) -> list[dict]:
+    return [
+        row
+        for call in add_statistics.call_args_list
+        if call.args[1]["statistic_id"] == statistic_id
+        for row in call.args[2]
+    ]
+
+
+async def test_hourly_rows_follow_daily_totals(hass: HomeAssistant) -> None:
+    """Test ended hours are imported once with a sum that survives resets."""
+    hass.config.components.add("recorder")
+    importer = TryFiStatisticsImporter(hass, "entry")
+    await importer.async_load()
+
+    with patch(
+        "custom_components.tryfi.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        assert importer.async_record(_pet(100, 500), START) == 0
+        assert importer.async_record(_pet(250, 800), START + timedelta(minutes=30)) == 0
+        # the hour ended, so its last reading is imported
+        assert importer.async_record(_pet(300, 800), START + timedelta(hours=1)) == 2
+        assert importer.async_record(_pet(300, 800), START + timedelta(hours=1, minutes=5)) == 0
+        # the daily total restarted
+        assert importer.async_record(_pet(40, 0), START + timedelta(hours=10)) == 2
+        assert importer.async_record(_pet(90, 0), START + timedelta(hours=11)) == 2
+
+    steps = _rows(add_statistics, "tryfi:pet_1_steps")
+    assert [(row["start"], row["state"], row["sum"]) for row in steps] == [
+        (datetime(2024, 5, 1, 15, tzinfo=dt_util.UTC), 250, 150),
+        (datetime(2024, 5, 1, 16, tzinfo=dt_util.UTC), 300, 200),
+        (datetime(2024, 5, 2, 1, tzinfo=dt_util.UTC), 40, 240),
+    ]
+    metadata = add_statistics.call_args_list[0].args[1]
+    assert metadata["source"] == "tryfi"
+    assert metadata["has_sum"] is True
+    assert metadata["name"] == "Rex Steps"
+    distance = _rows(add_statistics, "tryfi:pet_1_distance")
+    assert [row["sum"] for row in distance] == pytest.approx([0.3, 0.3, 0.3])
+    assert not _rows(add_statistics, "tryfi:pet_1_sleep")
+
+
+async def test_cursor_survives_restart(hass: HomeAssistant) -> None:
+    """Test a reloaded importer continues the sums without rewriting hours."""
+    hass.config.components.add("recorder")
+    importer = TryFiStatisticsImporter(hass, "entry")
+    await importer.async_load()
+    with patch("custom_components.tryfi.statistics.async_add_external_statistics"):
+        importer.async_record(_pet(100), START)
+        importer.async_record(_pet(200), START + timedelta(hours=1))
+    await importer.async_save()
+
+    reloaded = TryFiStatisticsImporter(hass, "entry")
+    await reloaded.async_load()
+    with patch(
+        "custom_components.tryfi.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        assert reloaded.async_record(_pet(200), START + timedelta(hours=1, minutes=30)) == 0
+        reloaded.async_record(_pet(260), START + timedelta(hours=2))
+
+    steps = _rows(add_statistics, "tryfi:pet_1_steps")
+    assert [(row["start"].hour, row["sum"]) for row in steps] == [(16, 100)]
+
+
+async def test_nothing_imported_without_recorder(hass: HomeAssistant) -> None:
+    """Test the importer is idle when the recorder is not loaded."""
+    importer = TryFiStatisticsImporter(hass, "entry")
+    with patch(
+        "custom_components.tryfi.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        importer.async_record(_pet(100), START)
+        assert importer.async_record(_pet(200), START + timedelta(hours=1)) == 0
+    add_statistics.assert_not_called()
+
+
+def _history(days: int, page_size: int = 3):
+    """Return activity and rest history factories ending yesterday, newest first."""
+    today = dt_util.start_of_local_day()
+    activity = [
+        {
+            "start": (today - timedelta(days=i + 1)).isoformat(),
+            "end": (today - timedelta(days=i)).isoformat(),
+            "totalSteps": 1000 * (i + 1),
+            "totalDistance": 2000.0,
+        }
+        for i in range(days)
+    ]
+    fetches = []
+
+    def fetch_page(cursor, limit):
+        fetches.append(cursor)
+        start = int(cursor or 0)
+        return {
+            "cursor": str(start + limit) if start + limit < days else None,
+            "activitySummaries": activity[start : start + limit],
+        }
+
+    def activity_history(pet_id, cursor=None):
+        return FiFeedPaginator(
+            fetch_page, parseActivitySummary, "activitySummaries", cursor, page_size
+        )
+
+    def rest_history(pet_id, cursor=None):
+        return FiFeedPaginator(
+            lambda cursor, limit: {"cursor": None, "restSummaries": []},
+            parseRestSummary,
+            "restSummaries",
+            cursor,
+        )
+
+    coordinator = SimpleNamespace(
+        tryfi=SimpleNamespace(activityHistory=activity_history, restHistory=rest_history)
+    )
+
+    async def async_add_poll_job(target, *args):
+        return target(*args)
+
+    coordinator.async_add_poll_job = async_add_poll_job
+    return coordinator, fetches
+
+
+async def test_backfill_imports_days_before_live_statistics(hass: HomeAssistant) -> None:
+    """Test backfilled sums count down to where the live statistics began."""
+    hass.config.components.add("recorder")
+    importer = TryFiStatisticsImporter(hass, "entry")
+    coordinator, fetches = _history(7)
+
+    with patch(
+        "custom_components.tryfi.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        assert await importer.async_backfill(coordinator, _pet(0), days=4) == 6
+        # resuming skips the days already imported
+        assert await importer.async_backfill(coordinator, _pet(0), days=7) == 6
+        assert await importer.async_backfill(coordinator, _pet(0), days=30) == 2
+        # the feed is exhausted
+        assert await importer.async_backfill(coordinator, _pet(0), days=30) == 0
+
+    steps = _rows(add_statistics, "tryfi:pet_1_steps")
+    assert [(row["state"], row["sum"]) for row in steps] == [
+        (1000, 0),
+        (2000, -1000),
+        (3000, -3000),
+        (4000, -6000),
+        (5000, -10000),
+        (6000, -15000),
+        (7000, -21000),
+    ]
+    assert [row["start"] for row in steps] == sorted(
+        (row["start"] for row in steps), reverse=True
+    )
+    assert steps[0]["start"] == dt_util.as_utc(
+        dt_util.start_of_local_day() - timedelta(days=1)
+    )
+    assert _rows(add_statistics, "tryfi:pet_1_distance")[1]["sum"] == pytest.approx(-2)
+    # each run resumed from the page the previous one stopped in
+    assert fetches == [None, "3", "3", "6", "6"]